@@ -0,0 +1,217 @@
+"""Benchmark the stages of the metrics pipeline on synthetic event files.
+
+Generates a synthetic logs directory (see ``synthetic_event_files.py``), then times
+``find_event_files``, ``extract_metrics`` (both readers), ``aggregate_metrics_by_model``,
+``compute_ci_by_model`` and ``save_metrics_to_csv``. For every stage the best wall time of
+several repeats, the throughput in records/s and MB/s, and the peak memory allocated by
+Python (measured in a separate run with ``tracemalloc``) are reported.
+
+Results can be saved as a baseline and later runs compared against it; the script exits
+with status 1 if a stage got slower than the baseline by more than the tolerance. Absolute
+timings are only comparable on the same machine, so a baseline is only used if it was
+recorded with the same synthetic data on the same host, CPU and Python version.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # compare against benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline       # record a new baseline
+    python benchmarks/run_benchmarks.py --models 8 --steps 5000 --noise-every 10
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from synthetic_event_files import generate_logs
+from tb_to_csv.core.aggregation import aggregate_metrics_by_model, build_csv_tables, compute_ci_by_model
+from tb_to_csv.core.csv_writer import save_metrics_to_csv
+from tb_to_csv.core.event_file_utils import extract_metrics, find_event_files
+from tb_to_csv.core.event_reader import iter_records
+from tb_to_csv.core.metric_processing import build_tag_filter
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PREFIX_MAPPING = ["test", "shift", "ood"]
+# Slowdowns below this many seconds are timer noise and never count as regressions
+NOISE_FLOOR_SECONDS = 0.005
+
+
+def measure(stage: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time a stage and measure its peak Python memory.
+
+    Args:
+        stage (Callable[[], Any]): The stage to run.
+        repeat (int): Number of timed runs. The fastest one is reported.
+
+    Returns:
+        Dict[str, float]: Best wall time in seconds and peak memory in MiB.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured separately since tracemalloc slows down allocations
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_mib": peak / 2**20}
+
+
+def machine_info() -> Dict[str, Any]:
+    """Describe the machine the benchmark runs on: host, CPU model and count, OS and Python version."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo", "r") as file:
+            cpu = next((line.split(":", 1)[1].strip() for line in file if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {
+        "host": platform.node(),
+        "cpu": cpu,
+        "cpus": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+    }
+
+
+def load_baseline(path: str, config: Dict[str, Any], machine: Dict[str, Any]) -> Optional[Dict[str, Dict[str, float]]]:
+    """Load the results of a baseline recorded with the same configuration on the same machine.
+
+    Args:
+        path (str): Path to the baseline file.
+        config (Dict[str, Any]): Configuration of the synthetic logs of this run.
+        machine (Dict[str, Any]): ``machine_info`` of this run.
+
+    Returns:
+        Optional[Dict[str, Dict[str, float]]]: Results per stage, or None if there is no comparable baseline.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        saved = json.load(file)
+    if saved.get("config") != config:
+        print(f"⚠️  Baseline {path} was recorded with a different configuration {saved.get('config')}. Not comparing.")
+        return None
+    if saved.get("machine") != machine:
+        print(
+            f"⚠️  Baseline {path} was recorded on a different machine {saved.get('machine')}. Absolute timings are not "
+            "comparable, so not comparing. Record a baseline on this machine with --save-baseline."
+        )
+        return None
+    return saved["results"]
+
+
+def count_records(event_files: List[str]) -> int:
+    """Count the TFRecord records of the event files."""
+    records = 0
+    for event_file in event_files:
+        with open(event_file, "rb") as file:
+            records += sum(1 for _ in iter_records(file))
+    return records
+
+
+def run_benchmarks(logs_dir: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Run every stage on a logs directory.
+
+    Args:
+        logs_dir (str): Logs directory with a 'model/seed/' tree of event files.
+        repeat (int): Number of timed runs per stage.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results per stage.
+    """
+    event_files = find_event_files(logs_dir)
+    records = count_records(event_files)
+    megabytes = sum(os.path.getsize(event_file) for event_file in event_files) / 1e6
+    tag_filter = build_tag_filter(PREFIX_MAPPING)
+
+    model_metrics = aggregate_metrics_by_model(event_files, PREFIX_MAPPING)
+    ci_metrics = compute_ci_by_model(model_metrics)
+    csv_tables = build_csv_tables(ci_metrics, PREFIX_MAPPING)
+    output_dir = tempfile.mkdtemp(prefix="tb_to_csv_bench_out_")
+
+    def save_csvs():
+        for file_name, table in csv_tables.items():
+            save_metrics_to_csv(table, os.path.join(output_dir, file_name))
+
+    stages = {
+        "find_event_files": (lambda: find_event_files(logs_dir), False),
+        "extract_metrics[native]": (lambda: [extract_metrics(event_file, "native", tag_filter) for event_file in event_files], True),
+        "extract_metrics[accumulator]": (lambda: [extract_metrics(event_file, "accumulator", tag_filter) for event_file in event_files], True),
+        "aggregate_metrics_by_model": (lambda: aggregate_metrics_by_model(event_files, PREFIX_MAPPING), True),
+        "compute_ci_by_model": (lambda: compute_ci_by_model(model_metrics), False),
+        "save_metrics_to_csv": (save_csvs, False),
+    }
+
+    results = {}
+    for name, (stage, reads_files) in stages.items():
+        result = measure(stage, repeat)
+        if reads_files:
+            result["records_per_second"] = records / result["seconds"]
+            result["mb_per_second"] = megabytes / result["seconds"]
+        results[name] = result
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'stage':<30} {'seconds':>10} {'records/s':>12} {'MB/s':>9} {'peak MiB':>9} {'vs baseline':>12}")
+    for name, result in results.items():
+        records = f"{result['records_per_second']:,.0f}" if "records_per_second" in result else "-"
+        throughput = f"{result['mb_per_second']:.1f}" if "mb_per_second" in result else "-"
+        ratio = f"{result['seconds'] / baseline[name]['seconds']:.2f}x" if name in baseline else "-"
+        print(f"{name:<30} {result['seconds']:>10.4f} {records:>12} {throughput:>9} {result['peak_mib']:>9.1f} {ratio:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tb_to_csv pipeline on synthetic event files.")
+    parser.add_argument("--models", type=int, default=4, help="Number of models. Default: 4.")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of runs per model. Default: 5.")
+    parser.add_argument("--tags", type=int, default=50, help="Number of scalar tags per run. Default: 50.")
+    parser.add_argument("--steps", type=int, default=500, help="Number of steps per run. Default: 500.")
+    parser.add_argument("--noise-every", type=int, default=10, help="Log image and histogram noise every N steps (0 to disable). Default: 10.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per stage. Default: 3.")
+    parser.add_argument("--logs-dir", type=str, help="Use (or generate into) this directory instead of a temporary one.")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE, help="Baseline file. Default: benchmarks/baseline.json.")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown relative to the baseline. Default: 0.25 (25%%).")
+    args = parser.parse_args()
+
+    config = {"models": args.models, "seeds": args.seeds, "tags": args.tags, "steps": args.steps, "noise_every": args.noise_every}
+    logs_dir = args.logs_dir or tempfile.mkdtemp(prefix="tb_to_csv_bench_")
+    if not find_event_files(logs_dir):
+        paths = generate_logs(logs_dir, args.models, args.seeds, args.tags, args.steps, args.noise_every)
+        print(f"✅ Generated {len(paths)} event files in {logs_dir}.")
+
+    results = run_benchmarks(logs_dir, args.repeat)
+
+    machine = machine_info()
+    baseline = None if args.save_baseline else load_baseline(args.baseline, config, machine)
+    print_results(results, baseline or {})
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({"config": config, "machine": machine, "results": results}, file, indent=2)
+        print(f"✅ Saved baseline {args.baseline}.")
+        return
+
+    baseline = baseline or {}
+    regressions = [
+        name for name, result in results.items()
+        if name in baseline
+        and result["seconds"] > baseline[name]["seconds"] * (1 + args.tolerance)
+        and result["seconds"] - baseline[name]["seconds"] > NOISE_FLOOR_SECONDS
+    ]
+    if regressions:
+        print(f"❌ Slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Generate realistic TensorBoard event files for benchmarks.
+
+Writes a 'logs_dir/model/seed/events.out.tfevents.*' tree of TFRecord files containing scalar
+summaries under several prefixes, tensor-encoded scalars, and optionally image and histogram
+summaries as noise that readers have to skip.
+
+Usage:
+    python benchmarks/synthetic_event_files.py /tmp/bench_logs --models 4 --seeds 5 --tags 50 --steps 1000
+"""
+import argparse
+import os
+import struct
+import time
+from typing import List
+import numpy as np
+from tensorboard.compat.proto import event_pb2, summary_pb2
+from tensorboard.util import tensor_util
+from tb_to_csv.core.event_reader import masked_crc32c
+
+PREFIXES = ("test", "shift", "ood", "train")
+_LENGTH = struct.Struct("<Q")
+_CRC = struct.Struct("<I")
+
+
+def encode_record(data: bytes) -> bytes:
+    """Frame a serialized event as a TFRecord (length, masked CRC of the length, data, masked CRC of the data)."""
+    length = _LENGTH.pack(len(data))
+    return length + _CRC.pack(masked_crc32c(length)) + data + _CRC.pack(masked_crc32c(data))
+
+
+def tag_names(tags: int) -> List[str]:
+    """Tag names spread over the benchmark prefixes, e.g. 'test/metric_0', 'shift/metric_1'."""
+    return [f"{PREFIXES[index % len(PREFIXES)]}/metric_{index}" for index in range(tags)]
+
+
+def write_synthetic_event_file(
+    run_dir: str,
+    tags: int = 20,
+    steps: int = 100,
+    noise_every: int = 0,
+    tensor_tags: int = 2,
+    seed: int = 0,
+) -> str:
+    """Write one synthetic event file.
+
+    Args:
+        run_dir (str): Directory of the run. Created if needed.
+        tags (int): Number of scalar tags logged with ``simple_value`` at every step.
+        steps (int): Number of steps.
+        noise_every (int): Log a 32x32 image and a 64-bucket histogram every this many steps. Disabled if 0.
+        tensor_tags (int): Number of additional scalar tags logged as tensors with scalars plugin metadata.
+        seed (int): Seed of the random values.
+
+    Returns:
+        str: Path to the event file.
+    """
+    os.makedirs(run_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    path = os.path.join(run_dir, f"events.out.tfevents.{int(time.time())}.bench.{seed}")
+    names = tag_names(tags)
+    scalar_metadata = summary_pb2.SummaryMetadata(plugin_data=summary_pb2.SummaryMetadata.PluginData(plugin_name="scalars"))
+
+    with open(path, "wb") as file:
+        file.write(encode_record(event_pb2.Event(wall_time=0.0, file_version="brain.Event:2").SerializeToString()))
+        for step in range(steps):
+            wall_time = 1_000.0 + step
+            values = rng.random(tags)
+            summary = summary_pb2.Summary(value=[
+                summary_pb2.Summary.Value(tag=name, simple_value=float(value)) for name, value in zip(names, values)
+            ])
+            for index in range(tensor_tags):
+                summary.value.add(tag=f"test/tensor_{index}", tensor=tensor_util.make_tensor_proto(np.float64(rng.random())), metadata=scalar_metadata)
+            file.write(encode_record(event_pb2.Event(wall_time=wall_time, step=step, summary=summary).SerializeToString()))
+
+            if noise_every and step % noise_every == 0:
+                counts = rng.integers(0, 100, 64).astype(float)
+                noise = summary_pb2.Summary(value=[
+                    summary_pb2.Summary.Value(tag="train/images", image=summary_pb2.Summary.Image(
+                        height=32, width=32, colorspace=3, encoded_image_string=rng.bytes(32 * 32 * 3),
+                    )),
+                    summary_pb2.Summary.Value(tag="train/weights", histo=summary_pb2.HistogramProto(
+                        min=0.0, max=1.0, num=float(counts.sum()), bucket_limit=list(np.linspace(0, 1, 64)), bucket=list(counts),
+                    )),
+                ])
+                file.write(encode_record(event_pb2.Event(wall_time=wall_time, step=step, summary=noise).SerializeToString()))
+    return path
+
+
+def generate_logs(
+    logs_dir: str,
+    models: int = 4,
+    seeds: int = 5,
+    tags: int = 20,
+    steps: int = 100,
+    noise_every: int = 0,
+    seed: int = 0,
+) -> List[str]:
+    """Write a 'logs_dir/model_<i>/seed_<j>/' tree of synthetic event files.
+
+    Args:
+        logs_dir (str): Root of the generated tree.
+        models (int): Number of model directories.
+        seeds (int): Number of runs per model.
+        tags (int): Number of scalar tags per run.
+        steps (int): Number of steps per run.
+        noise_every (int): Log image and histogram noise every this many steps. Disabled if 0.
+        seed (int): Base seed of the random values.
+
+    Returns:
+        List[str]: Paths to the generated event files.
+    """
+    paths = []
+    for model in range(models):
+        for run in range(seeds):
+            run_dir = os.path.join(logs_dir, f"model_{model}", f"seed_{run}")
+            paths.append(write_synthetic_event_file(run_dir, tags, steps, noise_every, seed=seed + model * seeds + run))
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic TensorBoard event files for benchmarks.")
+    parser.add_argument("logs_dir", type=str, help="Directory to write the 'model/seed/' tree to.")
+    parser.add_argument("--models", type=int, default=4, help="Number of models. Default: 4.")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of runs per model. Default: 5.")
+    parser.add_argument("--tags", type=int, default=20, help="Number of scalar tags per run. Default: 20.")
+    parser.add_argument("--steps", type=int, default=100, help="Number of steps per run. Default: 100.")
+    parser.add_argument("--noise-every", type=int, default=0, help="Log image and histogram noise every N steps. Default: disabled.")
+    args = parser.parse_args()
+
+    paths = generate_logs(args.logs_dir, args.models, args.seeds, args.tags, args.steps, args.noise_every)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"✅ Wrote {len(paths)} event files ({size / 2**20:.1f} MiB) to {args.logs_dir}.")
+
+
+if __name__ == "__main__":
+    main()
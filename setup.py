@@ -12,7 +12,13 @@ setup(
         "numpy",
         "scipy",
         "tensorboard",
+        "google-crc32c",
     ],
+    extras_require={
+        "watch": ["inotify_simple"],
+        "parquet": ["pyarrow"],
+        "pandas": ["pandas"],
+    },
     entry_points={
         "console_scripts": [
             "tensorboard_to_csv=cli:main",
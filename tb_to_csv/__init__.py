@@ -0,0 +1,4 @@
+from tb_to_csv.core.metric_store import ReportTable
+from tb_to_csv.core.report import MetricsReport, collect_metrics
+
+__all__ = ["MetricsReport", "ReportTable", "collect_metrics"]
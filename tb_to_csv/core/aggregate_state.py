@@ -0,0 +1,213 @@
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from tb_to_csv.core.confidence_intervals import critical_value
+from tb_to_csv.core.metric_store import ReportTable
+
+STATE_VERSION = 2
+
+
+class AggregateState:
+    """Mergeable running statistics of every (model, category, metric) across runs.
+
+    Each cell keeps the run count, mean, sum of squared deviations (M2), minimum and maximum,
+    updated with Welford's algorithm as runs are added. States built from disjoint sets of
+    runs (e.g. shards of a sweep processed by separate jobs) can be merged and give the same
+    statistics as a single state built from all runs, up to floating-point rounding.
+
+    NaN values are treated as missing, as in ``MetricStore``.
+
+    Args:
+        settings (Optional[Dict[str, Any]]): Extraction settings the runs were processed with
+            (e.g. the prefix mapping and reader). Only states with equal settings can be merged
+            by ``load_partial_states``.
+        shard (Optional[Tuple[int, int]]): Shard ``index`` of ``count`` the runs were taken from.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, shard: Optional[Tuple[int, int]] = None):
+        self.settings = settings or {}
+        self.shard = tuple(shard) if shard is not None else None
+        self.models: List[str] = []
+        self.columns: List[Tuple[str, str]] = []
+        # (model, category, metric) -> [count, mean, M2, min, max]
+        self.cells: Dict[Tuple[str, str, str], List[float]] = {}
+        self._model_set = set()
+        self._column_set = set()
+
+    def _add_column(self, column: Tuple[str, str]) -> None:
+        if column not in self._column_set:
+            self._column_set.add(column)
+            self.columns.append(column)
+
+    def add_model(self, model_key: str) -> None:
+        """Register a model, even if it has no runs yet."""
+        if model_key not in self._model_set:
+            self._model_set.add(model_key)
+            self.models.append(model_key)
+
+    def add_run(self, model_key: str, categorized_metrics: Dict[str, Dict[str, float]]) -> None:
+        """Add the categorized metrics of one run.
+
+        Args:
+            model_key (str): Name of the model the run belongs to.
+            categorized_metrics (Dict[str, Dict[str, float]]): Metric values per category.
+        """
+        self.add_model(model_key)
+        for category, metrics in categorized_metrics.items():
+            for metric_key, value in metrics.items():
+                self._add_column((category, metric_key))
+                if math.isnan(value):
+                    continue
+                cell = self.cells.get((model_key, category, metric_key))
+                if cell is None:
+                    self.cells[(model_key, category, metric_key)] = [1, value, 0.0, value, value]
+                    continue
+                cell[0] += 1
+                delta = value - cell[1]
+                cell[1] += delta / cell[0]
+                cell[2] += delta * (value - cell[1])
+                cell[3] = min(cell[3], value)
+                cell[4] = max(cell[4], value)
+
+    def merge(self, other: "AggregateState") -> "AggregateState":
+        """Merge the statistics of another state (built from different runs) into this one.
+
+        Args:
+            other (AggregateState): The state to merge.
+
+        Returns:
+            AggregateState: This state.
+        """
+        for model_key in other.models:
+            self.add_model(model_key)
+        for column in other.columns:
+            self._add_column(column)
+        for (model_key, category, metric_key), (count_b, mean_b, m2_b, min_b, max_b) in other.cells.items():
+            self.add_model(model_key)
+            self._add_column((category, metric_key))
+            cell = self.cells.get((model_key, category, metric_key))
+            if cell is None:
+                self.cells[(model_key, category, metric_key)] = [count_b, mean_b, m2_b, min_b, max_b]
+                continue
+            count_a, mean_a, m2_a = cell[:3]
+            count = count_a + count_b
+            delta = mean_b - mean_a
+            cell[0] = count
+            cell[1] = mean_a + delta * count_b / count
+            cell[2] = m2_a + m2_b + delta * delta * count_a * count_b / count
+            cell[3] = min(cell[3], min_b)
+            cell[4] = max(cell[4], max_b)
+        return self
+
+    @classmethod
+    def merged(cls, states: Iterable["AggregateState"]) -> "AggregateState":
+        """Merge any number of states into a new one."""
+        result = cls()
+        for state in states:
+            result.merge(state)
+        return result
+
+    def to_report_table(self, confidence: float = 0.95) -> ReportTable:
+        """Compute the mean and parametric confidence interval of every metric of every model.
+
+        The margin is the same t/z interval as ``compute_confidence_interval`` computed from
+        the running statistics instead of the individual run values.
+
+        Args:
+            confidence (float): Confidence level for intervals.
+
+        Returns:
+            ReportTable: One row per model with the mean and margin of every metric.
+
+        Raises:
+            ValueError: If the confidence level is not between 0 and 1.
+        """
+        if not (0 < confidence < 1):
+            raise ValueError("Confidence level must be between 0 and 1.")
+
+        model_index = {model_key: index for index, model_key in enumerate(self.models)}
+        column_index = {column: index for index, column in enumerate(self.columns)}
+        means = np.full((len(self.models), len(self.columns)), np.nan)
+        margins = np.full_like(means, np.nan)
+        for (model_key, category, metric_key), (count, mean, m2, _, _) in self.cells.items():
+            row, column = model_index[model_key], column_index[(category, metric_key)]
+            means[row, column] = mean
+            if count > 1:
+                stderr = math.sqrt(m2 / (count - 1)) / math.sqrt(count)
+                margins[row, column] = stderr * critical_value(confidence, int(count))
+        return ReportTable(self.models, self.columns, means, margins)
+
+    def save(self, path: str) -> None:
+        """Write the state to a JSON file."""
+        cells = [[model_key, category, metric_key, *cell] for (model_key, category, metric_key), cell in self.cells.items()]
+        data = {
+            "version": STATE_VERSION,
+            "settings": self.settings,
+            "shard": self.shard,
+            "models": self.models,
+            "columns": self.columns,
+            "cells": cells,
+        }
+        with open(path, "w") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path: str) -> "AggregateState":
+        """Read a state written by ``save``.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        with open(path, "r") as file:
+            data = json.load(file)
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"❌ {path} is not a partial state file of version {STATE_VERSION}.")
+
+        state = cls(data["settings"], data["shard"])
+        for model_key in data["models"]:
+            state.add_model(model_key)
+        for category, metric_key in data["columns"]:
+            state._add_column((category, metric_key))
+        for model_key, category, metric_key, *cell in data["cells"]:
+            state.cells[(model_key, category, metric_key)] = cell
+        return state
+
+
+def load_partial_states(paths: List[str]) -> List[AggregateState]:
+    """Load partial state files to be merged and check that they belong together.
+
+    Args:
+        paths (List[str]): Paths to the partial state files.
+
+    Returns:
+        List[AggregateState]: The loaded states, in the order of ``paths``.
+
+    Raises:
+        ValueError: If a file is given twice, the files were written with different settings,
+            or they come from different shardings or the same shard, all of which would merge
+            runs twice or mix incompatible metrics.
+    """
+    real_paths = [os.path.realpath(path) for path in paths]
+    duplicates = sorted({path for path, real_path in zip(paths, real_paths) if real_paths.count(real_path) > 1})
+    if duplicates:
+        raise ValueError(f"❌ Partial states given more than once: {', '.join(duplicates)}.")
+
+    states = [AggregateState.load(path) for path in paths]
+    for path, state in zip(paths[1:], states[1:]):
+        differing = sorted(key for key in set(state.settings) | set(states[0].settings) if state.settings.get(key) != states[0].settings.get(key))
+        if differing:
+            raise ValueError(f"❌ {path} was written with different settings than {paths[0]}: {', '.join(differing)}.")
+
+    shards = {}
+    for path, state in zip(paths, states):
+        if state.shard is None:
+            continue
+        if shards and state.shard[1] != next(iter(shards))[1]:
+            raise ValueError(f"❌ {path} is shard {state.shard[0]} of {state.shard[1]}, but the other partial states were split into {next(iter(shards))[1]} shards.")
+        if state.shard in shards:
+            raise ValueError(f"❌ {path} and {shards[state.shard]} are both shard {state.shard[0]} of {state.shard[1]}.")
+        shards[state.shard] = path
+    return states
+
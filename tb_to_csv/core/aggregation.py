@@ -1,66 +1,389 @@
 from typing import Dict, List
 import os
-from typing import Optional, Union
-from tb_to_csv.core.event_file_utils import extract_metrics, find_event_files
-from tb_to_csv.core.metric_processing import categorize_metrics
+import zlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, Optional, Tuple, Union
+from tb_to_csv.core.event_file_utils import check_timing_reader, extract_metrics_incremental, find_event_files, resolve_jobs
+from tb_to_csv.core.event_reader import ReadState
+from tb_to_csv.core.metric_processing import build_tag_filter, categorize_run, has_metrics
 from tb_to_csv.core.csv_writer import save_metrics_to_csv
-from tb_to_csv.core.confidence_intervals import compute_confidence_interval
+from tb_to_csv.core.confidence_intervals import CI_METHODS, bootstrap_confidence_intervals, compute_confidence_intervals
+from tb_to_csv.core.extraction_cache import ExtractionCache, file_identity
+from tb_to_csv.core.aggregate_state import AggregateState, load_partial_states
+from tb_to_csv.core.metric_store import MetricStore, ReportTable
+from tb_to_csv.core.output_formats import save_report
+from tb_to_csv.core.profiling import Profiler, profile_extraction, profile_run, profile_stage
 
 
-def aggregate_metrics_by_model(event_files, prefix_mapping):
-    """Aggregate metrics across runs for each model."""
-    model_metrics = {}
+def extract_metrics_in_order(
+    event_files: List[str],
+    reader: str = "native",
+    jobs: int = 1,
+    cache: Optional[ExtractionCache] = None,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    profiler: Optional[Profiler] = None,
+    timing: bool = False,
+) -> Iterator[Tuple[Dict[str, Any], Optional[int]]]:
+    """Extract metrics from event files, optionally in parallel worker processes.
 
-    for event_file in event_files:
-        # Extract model_name and run_name from the directory structure
-        relative_path = os.path.relpath(event_file)
-        model_key, run_name = relative_path.split(os.sep)[-3:-1]
+    Files are parsed concurrently and results arrive in completion order, but they are
+    yielded in the order of ``event_files`` so downstream output is identical to the
+    serial path. Files that are unchanged since they were cached are not read at all, and
+    files that were appended to are only read from where the previous read stopped.
 
-        metrics, _ = extract_metrics(event_file)
-        if not metrics:
+    Args:
+        event_files (List[str]): Paths to the TensorBoard event files.
+        reader (str): Backend used to read event files.
+        jobs (int): Number of worker processes. 1 extracts serially, 0 uses one process per CPU.
+        cache (Optional[ExtractionCache]): Cache of previous extraction results.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to extract.
+        bounded_memory (bool): Limit the accumulator's reservoirs to a single item per tag.
+        report_memory (bool): Print the peak memory allocated while reading each file.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value.
+        profiler (Optional[Profiler]): Records the measurements of every file if given.
+        timing (bool): Also record the first and last wall time and step of each file.
+
+    Yields:
+        Tuple[Dict[str, Any], Optional[int]]: The result of ``extract_metrics`` for each file.
+    """
+    if cache is None:
+        for state in extract_states_in_order(event_files, [None] * len(event_files), reader, jobs, tag_filter, bounded_memory, report_memory, reductions, profiler, timing):
+            yield state.metrics, state.last_step
+        return
+
+    identities = [file_identity(event_file) for event_file in event_files]
+    cached = [cache.get(event_file, reader, identity, tag_filter, reductions, timing) for event_file, identity in zip(event_files, identities)]
+    misses = [(event_file, identity) for event_file, identity, result in zip(event_files, identities, cached) if result is None]
+    resume_states = [cache.get_resume_state(event_file, reader, identity, tag_filter, reductions, timing) for event_file, identity in misses]
+    extracted = extract_states_in_order([event_file for event_file, _ in misses], resume_states, reader, jobs, tag_filter, bounded_memory, report_memory, reductions, profiler, timing)
+    for event_file, identity, result in zip(event_files, identities, cached):
+        if result is None:
+            state = next(extracted)
+            cache.put(event_file, reader, identity, state.metrics, state.last_step, state.offset, state.head, tag_filter, reductions, timing)
+            result = state.metrics, state.last_step
+        elif profiler is not None:
+            profiler.add_file(event_file, skipped="cached")
+        yield result
+
+
+def extract_states_in_order(
+    event_files: List[str],
+    states: List[Optional[ReadState]],
+    reader: str = "native",
+    jobs: int = 1,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    profiler: Optional[Profiler] = None,
+    timing: bool = False,
+) -> Iterator[ReadState]:
+    """Extract event files, resuming from previous read states, and yield the new states in input order.
+
+    Args:
+        event_files (List[str]): Paths to the TensorBoard event files.
+        states (List[Optional[ReadState]]): Previous read state of each file, or None to read it in full.
+        reader (str): Backend used to read event files.
+        jobs (int): Number of worker processes. 1 extracts serially, 0 uses one process per CPU.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to extract.
+            Must be picklable when ``jobs`` is not 1.
+        bounded_memory (bool): Limit the accumulator's reservoirs to a single item per tag.
+        report_memory (bool): Print the peak memory allocated while reading each file.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value.
+        profiler (Optional[Profiler]): Records the measurements of every file if given.
+        timing (bool): Also record the first and last wall time and step of each file.
+
+    Yields:
+        ReadState: The read state of each file after extraction.
+    """
+    jobs = resolve_jobs(jobs)
+    # Profiled extraction also returns the measurements of the file, taken in the process that read it
+    extract = extract_metrics_incremental if profiler is None else profile_extraction
+    if jobs == 1 or len(event_files) <= 1:
+        for event_file, state in zip(event_files, states):
+            yield _record_file(profiler, event_file, extract(event_file, reader, state, tag_filter, bounded_memory, report_memory, reductions, timing))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(event_files))) as executor:
+        futures = {
+            executor.submit(extract, event_file, reader, state, tag_filter, bounded_memory, report_memory, reductions, timing): index
+            for index, (event_file, state) in enumerate(zip(event_files, states))
+        }
+        # Buffer out-of-order results until all earlier files are done
+        pending = {}
+        next_index = 0
+        for future in as_completed(futures):
+            pending[futures[future]] = future.result()
+            while next_index in pending:
+                yield _record_file(profiler, event_files[next_index], pending.pop(next_index))
+                next_index += 1
+
+
+def _record_file(profiler: Optional[Profiler], event_file: str, result) -> ReadState:
+    if profiler is None:
+        return result
+    state, stats = result
+    profiler.add_file(event_file, stats)
+    return state
+
+
+def get_run_key(event_file: str) -> Tuple[str, str]:
+    """Extract the model and run name from the directory structure of an event file."""
+    relative_path = os.path.relpath(event_file)
+    model_key, run_name = relative_path.split(os.sep)[-3:-1]
+    return model_key, run_name
+
+
+def iter_runs(event_files, tag_filter=None, reader="native", jobs=1, cache=None, bounded_memory=False, report_memory=False, reductions=None, profiler=None, timing=False):
+    """Extract the metrics of each run, in the order of ``event_files``.
+
+    Files without any (matching) metrics are skipped with a warning.
+
+    Args:
+        event_files (List[str]): Paths to the TensorBoard event files.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to extract.
+        reader (str): Backend used to read event files.
+        jobs (int): Number of worker processes used to extract event files (0 for one per CPU).
+        cache (Optional[ExtractionCache]): Cache of previous extraction results.
+        bounded_memory (bool): Limit the accumulator's reservoirs to a single item per tag.
+        report_memory (bool): Print the peak memory allocated while reading each file.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value.
+        profiler (Optional[Profiler]): Records the measurements of every file if given.
+        timing (bool): Also extract the first and last wall time and step of each run.
+
+    Yields:
+        Tuple[str, str, Dict[str, float]]: Model name, run name and metrics of each run.
+    """
+    for event_file, (metrics, _) in zip(event_files, extract_metrics_in_order(event_files, reader, jobs, cache, tag_filter, bounded_memory, report_memory, reductions, profiler, timing)):
+        if not has_metrics(metrics):
             print(f"⚠️ No metrics extracted from {event_file}. Skipping...")
+            if profiler is not None:
+                profiler.skip_file(event_file, "no metrics")
             continue
+        model_key, run_name = get_run_key(event_file)
+        yield model_key, run_name, metrics
 
-        # Initialize the model's metrics dictionary if not already present
-        if model_key not in model_metrics:
-            if isinstance(prefix_mapping, list):
-                model_metrics[model_key] = {prefix: {} for prefix in prefix_mapping}
-            elif isinstance(prefix_mapping, dict):
-                model_metrics[model_key] = {category: {} for category in prefix_mapping.values()}
-            else:
-                raise ValueError("prefix_mapping must be a list or a dictionary.")
-
-        # Categorize metrics into the appropriate categories
-        categorized_metrics = categorize_metrics(metrics, prefix_mapping)
-
-        # Aggregate metrics for each category
-        for category, category_metrics in categorized_metrics.items():
-            for metric_key, value in category_metrics.items():
-                if metric_key not in model_metrics[model_key][category]:
-                    model_metrics[model_key][category][metric_key] = {}
-                model_metrics[model_key][category][metric_key][run_name] = value
-        
-    return model_metrics
+
+def iter_categorized_runs(event_files, prefix_mapping, reader="native", jobs=1, cache=None, bounded_memory=False, report_memory=False, reductions=None, profiler=None, timing=False):
+    """Extract the metrics of each run and categorize them by prefix, in the order of ``event_files``.
+
+    Only tags matching a prefix of ``prefix_mapping`` are extracted from the event files.
+    Files without any matching metrics are skipped with a warning.
+
+    Args:
+        event_files (List[str]): Paths to the TensorBoard event files.
+        prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
+        reader (str): Backend used to read event files.
+        jobs (int): Number of worker processes used to extract event files (0 for one per CPU).
+        cache (Optional[ExtractionCache]): Cache of previous extraction results.
+        bounded_memory (bool): Limit the accumulator's reservoirs to a single item per tag.
+        report_memory (bool): Print the peak memory allocated while reading each file.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value.
+        profiler (Optional[Profiler]): Records the measurements of every file if given.
+        timing (bool): Also extract the first and last wall time and step of each run.
+
+    Yields:
+        Tuple[str, str, Dict[str, Dict[str, float]]]: Model name, run name and categorized metrics of each run.
+    """
+    if not isinstance(prefix_mapping, (list, dict)):
+        raise ValueError("prefix_mapping must be a list or a dictionary.")
+
+    tag_filter = build_tag_filter(prefix_mapping)
+    for model_key, run_name, metrics in iter_runs(event_files, tag_filter, reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing):
+        yield model_key, run_name, categorize_run(metrics, prefix_mapping)
+
+
+def build_metric_store(event_files, prefix_mapping, reader="native", jobs=1, cache=None, bounded_memory=False, report_memory=False, reductions=None, profiler=None, timing=False):
+    """Extract and categorize the metrics of all runs into a columnar store.
+
+    Takes the same arguments as ``iter_categorized_runs``.
+
+    Returns:
+        MetricStore: Metric values of every run.
+    """
+    store = MetricStore()
+    for model_key, run_name, categorized_metrics in iter_categorized_runs(event_files, prefix_mapping, reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing):
+        store.add_run(model_key, run_name, categorized_metrics)
+    return store
+
+
+def build_aggregate_state(event_files, prefix_mapping, reader="native", jobs=1, cache=None, bounded_memory=False, report_memory=False, reductions=None, profiler=None, timing=False):
+    """Extract and categorize the metrics of all runs into mergeable running statistics.
+
+    Unlike ``build_metric_store`` the individual run values are not kept. Takes the same
+    arguments as ``iter_categorized_runs``.
+
+    Returns:
+        AggregateState: Running statistics of every metric of every model.
+    """
+    state = AggregateState()
+    for model_key, _, categorized_metrics in iter_categorized_runs(event_files, prefix_mapping, reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing):
+        state.add_run(model_key, categorized_metrics)
+    return state
+
+
+def aggregate_metrics_by_model(event_files, prefix_mapping, reader="native", jobs=1, cache=None, bounded_memory=False, report_memory=False, reductions=None):
+    """Aggregate metrics across runs for each model into nested ``model -> category -> metric -> run`` dictionaries."""
+    return build_metric_store(event_files, prefix_mapping, reader, jobs, cache, bounded_memory, report_memory, reductions).to_model_metrics()
+
+
+def compute_ci_table(store, confidence=0.95):
+    """Compute confidence intervals for every metric across the runs of each model.
+
+    Args:
+        store (MetricStore): Metric values of every run.
+        confidence (float): Confidence level for intervals.
+
+    Returns:
+        ReportTable: One row per model with the mean and margin of every metric.
+    """
+    model_rows = store.model_rows()
+    max_runs = max((len(rows) for rows in model_rows), default=0)
+
+    # Lay out every (model, metric) pair as one group of runs, padded with NaN
+    grouped = np.full((len(store.models), len(store.columns), max_runs), np.nan)
+    for model, rows in enumerate(model_rows):
+        grouped[model, :, :len(rows)] = store.values[rows].T
+
+    means, margins = compute_confidence_intervals(grouped.reshape(len(store.models) * len(store.columns), max_runs), confidence)
+    means = means.reshape(len(store.models), len(store.columns))
+    margins = margins.reshape(len(store.models), len(store.columns))
+    return ReportTable(store.models, store.columns, means, margins)
+
+
+def compute_bootstrap_table(store, confidence=0.95, method="percentile", n_resamples=10_000, seed=0, jobs=1):
+    """Compute bootstrap confidence intervals for every metric across the runs of each model.
+
+    All metrics of a model are resampled at once. Each model draws from its own generator,
+    seeded with ``seed`` and the model name, so the intervals of a model do not depend on
+    the other models or on the number of worker processes.
+
+    Args:
+        store (MetricStore): Metric values of every run.
+        confidence (float): Confidence level for intervals.
+        method (str): "percentile" or "bca".
+        n_resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the random generators.
+        jobs (int): Number of worker processes the models are distributed over (0 for one per CPU).
+
+    Returns:
+        ReportTable: One row per model with the mean and the interval bounds of every metric.
+    """
+    jobs = resolve_jobs(jobs)
+    model_values = [store.values[rows].T for rows in store.model_rows()]
+    model_seeds = [(seed, zlib.crc32(model_key.encode())) for model_key in store.models]
+    arguments = (model_values, [confidence] * len(model_values), [method] * len(model_values), [n_resamples] * len(model_values), model_seeds)
+
+    if jobs == 1 or len(model_values) <= 1:
+        results = list(map(bootstrap_confidence_intervals, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(model_values))) as executor:
+            results = list(executor.map(bootstrap_confidence_intervals, *arguments))
+
+    shape = (len(store.models), len(store.columns))
+    means, lower, upper = (np.array([result[index] for result in results]).reshape(shape) for index in range(3))
+    return ReportTable(store.models, store.columns, means, lower=lower, upper=upper)
 
 
 def compute_ci_by_model(model_metrics, confidence=0.95, combine_columns=True):
     """Compute confidence intervals for metrics across runs for each model."""
-    ci_model_metrics = {}
+    table = compute_ci_table(MetricStore.from_model_metrics(model_metrics), confidence)
+    return table.to_model_metrics(combine_columns)
+
+
+def finalize_metric_store(store, model_sort_order=None, compute_ci=False, confidence=0.95, combine_columns=True, ci_method="parametric", bootstrap_resamples=10_000, seed=0, jobs=1):
+    """Aggregate runs into confidence intervals (or keep them separate) and apply the model sort order.
+
+    Args:
+        store (MetricStore): Metric values of every run.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models.
+        compute_ci (bool): Whether to aggregate runs into confidence intervals or keep one row per run.
+        confidence (float): Confidence level for intervals.
+        combine_columns (bool): Whether to combine mean and CI into one column.
+        ci_method (str): "parametric" (t/z interval), or "percentile"/"bca" bootstrap intervals.
+        bootstrap_resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the bootstrap resampling.
+        jobs (int): Number of worker processes used for bootstrapping (0 for one per CPU).
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, Any]]]: Formatted metrics per row (model or 'model/run') and category.
+    """
+    table = finalize_report_table(store, compute_ci, confidence, ci_method, bootstrap_resamples, seed, jobs)
+    return sort_models(table.to_model_metrics(combine_columns), model_sort_order)
 
-    for model_name, categories in model_metrics.items():
-        ci_model_metrics[model_name] = {}
-        for category, metrics in categories.items():
-            ci_metrics = {}
-            for metric_key, run_results in metrics.items():
-                mean, margin = compute_confidence_interval(list(run_results.values()), confidence)
-                if combine_columns:
-                    ci_metrics[metric_key] = f"{mean:.3f} ±{margin:.3f}"
-                else:
-                    ci_metrics[f"{metric_key} Mean"] = f"{mean:.3f}"
-                    ci_metrics[f"{metric_key} ± CI"] = f"{margin:.3f}"
-            ci_model_metrics[model_name][category] = ci_metrics
 
-    return ci_model_metrics
+def finalize_report_table(store, compute_ci=False, confidence=0.95, ci_method="parametric", bootstrap_resamples=10_000, seed=0, jobs=1):
+    """Aggregate runs into confidence intervals or keep one row per run, without formatting the values.
+
+    Args:
+        store (MetricStore): Metric values of every run.
+        compute_ci (bool): Whether to aggregate runs into confidence intervals or keep one row per run.
+        confidence (float): Confidence level for intervals.
+        ci_method (str): "parametric" (t/z interval), or "percentile"/"bca" bootstrap intervals.
+        bootstrap_resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the bootstrap resampling.
+        jobs (int): Number of worker processes used for bootstrapping (0 for one per CPU).
+
+    Returns:
+        ReportTable: One row per model, or one row per run named 'model/run'.
+
+    Raises:
+        ValueError: If the CI method is unknown.
+    """
+    if not compute_ci:
+        return store.run_table()
+    if ci_method == "parametric":
+        return compute_ci_table(store, confidence)
+    if ci_method not in CI_METHODS:
+        raise ValueError(f"Unknown CI method '{ci_method}'. Must be one of {CI_METHODS}.")
+    return compute_bootstrap_table(store, confidence, ci_method, bootstrap_resamples, seed, jobs)
+
+
+def sort_models(model_metrics, model_sort_order=None):
+    """Keep only the models in the custom sort order, in that order, if one is provided."""
+    if model_sort_order:
+        ci_model_metrics_sorted = {
+            model_key: model_metrics[model_key]
+            for model_key in model_sort_order
+            if model_key in model_metrics
+        }
+        model_metrics = ci_model_metrics_sorted
+
+    return model_metrics
+
+
+def build_csv_tables(model_metrics, prefix_file_mapping):
+    """Split the finalized model metrics into one table per output CSV file.
+
+    Args:
+        model_metrics (Dict[str, Dict[str, Dict[str, str]]]): Finalized metrics per model and category.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Mapping of prefixes to file names or a list of prefixes.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, str]]]: Metrics per model for each output file name.
+    """
+    if not prefix_file_mapping:
+        all_metrics = {
+            model_name: {key: value for category_metrics in metrics.values() for key, value in category_metrics.items()}
+            for model_name, metrics in model_metrics.items()
+        }
+        return {"all_metrics.csv": all_metrics}
+
+    if isinstance(prefix_file_mapping, list):
+        # Categories are the prefixes themselves
+        category_files = {prefix: f"{prefix}_metrics.csv" for prefix in prefix_file_mapping}
+    else:
+        # Categories are the file names the prefixes map to
+        category_files = {file_name: file_name for file_name in prefix_file_mapping.values()}
+
+    return {
+        file_name: {model_name: metrics.get(category, {}) for model_name, metrics in model_metrics.items()}
+        for category, file_name in category_files.items()
+    }
 
 
 def process_and_save_metrics(
@@ -74,6 +397,26 @@ def process_and_save_metrics(
     confidence: float,
     combine_columns: bool,
     include_step: bool,
+    reader: str = "native",
+    jobs: int = 1,
+    cache_path: Optional[str] = None,
+    cache_max_entries: int = 100_000,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    discovery_threads: int = 1,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    output_format: str = "csv",
+    compression: Optional[str] = None,
+    reductions: Optional[List[str]] = None,
+    ci_method: str = "parametric",
+    bootstrap_resamples: int = 10_000,
+    seed: int = 0,
+    partial_state_path: Optional[str] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    profile_path: Optional[str] = None,
+    cprofile_path: Optional[str] = None,
+    timing: bool = False,
 ) -> None:
     """Process metrics, compute confidence intervals, and save to CSV files.
 
@@ -88,57 +431,149 @@ def process_and_save_metrics(
         confidence (float): Confidence level for intervals.
         combine_columns (bool): Whether to combine mean and CI into one column.
         include_step (bool): Whether to include the "Step" key in the CSV.
+        reader (str): Backend used to read event files ("native" or "accumulator").
+        jobs (int): Number of worker processes used to extract event files (0 for one per CPU).
+        cache_path (Optional[str]): Path to the extraction cache file. Caching is disabled if None.
+        cache_max_entries (int): Maximum number of event files kept in the extraction cache.
+        max_depth (Optional[int]): Maximum number of directory levels below logs_dir searched for event files.
+        exclude (Optional[List[str]]): Glob patterns of directories to skip when searching for event files.
+        discovery_threads (int): Number of threads used to search for event files.
+        bounded_memory (bool): Limit the EventAccumulator's reservoirs to a single item per tag and plugin.
+        report_memory (bool): Print the peak memory allocated while reading each event file.
+        output_format (str): "csv", or "parquet"/"feather" for typed columnar files (requires pyarrow).
+        compression (Optional[str]): Compression codec of columnar files. Uses the pyarrow default if None.
+        reductions (Optional[List[str]]): Reductions to compute per metric instead of the last value
+            (e.g. ["last", "max", "step:1000", "mean_last:5", "at_best:val/loss:min"]).
+        ci_method (str): "parametric" (t/z interval), or "percentile"/"bca" bootstrap intervals.
+        bootstrap_resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the bootstrap resampling.
+        partial_state_path (Optional[str]): Instead of the output files, write the mergeable running
+            statistics of the processed runs to this file (see ``merge_and_save_metrics``).
+        shard (Optional[Tuple[int, int]]): Only process shard ``index`` of ``count`` (every count-th
+            event file, starting at index), to split a sweep across jobs.
+        profile_path (Optional[str]): Write the wall time, CPU time, bytes read, records decoded,
+            files skipped and peak RSS of every stage (discovery, extraction, aggregation, writing)
+            and every event file to this JSON file.
+        cprofile_path (Optional[str]): Write a cProfile dump of the main process to this file.
+        timing (bool): Add the 'duration' (seconds between the first and last summary event),
+            'steps' and 'steps_per_second' of each run to every category, read in the same pass
+            as the metrics. Requires the native reader.
     """
-    # Find all event files
-    event_files = find_event_files(logs_dir)
-    if not event_files:
-        raise FileNotFoundError(f"❌ No event files found in logs directory {logs_dir}")
-
-    # Aggregate metrics by model
-    model_metrics = aggregate_metrics_by_model(event_files, prefix_file_mapping)
-
-    if compute_ci:
-        # Compute confidence intervals for each model
-        model_metrics = compute_ci_by_model(model_metrics, confidence, combine_columns)
-    else: 
-        # Flatten the model_metrics dictionary by remapping to "model_key/run_name" format
-        model_metrics = {
-            f"{model_key}/{run_name}": {
-                category: run_metrics
-            }
-            for model_key, categories in model_metrics.items()
-            for category, runs in categories.items()
-            for run_name, run_metrics in runs.items()
-        }
+    check_timing_reader(reader, timing)
+    jobs = resolve_jobs(jobs)
+    with profile_run(profile_path, cprofile_path) as profiler:
+        # Find all event files
+        with profile_stage(profiler, "discovery"):
+            event_files = find_event_files(logs_dir, max_depth, exclude, discovery_threads)
+            if shard is not None:
+                index, count = shard
+                event_files = event_files[index::count]
+        if not event_files:
+            raise FileNotFoundError(f"❌ No event files found in logs directory {logs_dir}")
 
-    # Sort models if a custom sort order is provided
-    if model_sort_order:
-        ci_model_metrics_sorted = {
-            model_key: model_metrics[model_key]
-            for model_key in model_sort_order
-            if model_key in model_metrics
-        }
-        model_metrics = ci_model_metrics_sorted
+        cache = ExtractionCache(cache_path, cache_max_entries) if cache_path else None
+        if partial_state_path is not None:
+            with profile_stage(profiler, "extraction"):
+                state = build_aggregate_state(event_files, prefix_file_mapping, reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing)
+                # Recorded so that merging refuses partial states that do not belong together
+                state.settings = {"prefix_file_mapping": prefix_file_mapping, "reader": reader, "reductions": reductions, "timing": timing}
+                state.shard = tuple(shard) if shard is not None else None
+                if cache is not None:
+                    cache.save()
+            with profile_stage(profiler, "writing"):
+                state.save(partial_state_path)
+            print(f"✅ Saved partial state {partial_state_path} with {len(state.models)} models from {len(event_files)} event files.")
+            return
+
+        # Aggregate metrics by model
+        with profile_stage(profiler, "extraction"):
+            store = build_metric_store(event_files, prefix_file_mapping, reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing)
+            if cache is not None:
+                cache.save()
+                print(f"✅ Extraction cache {cache_path}: {cache.hits} hits, {cache.misses} misses.")
+
+        with profile_stage(profiler, "aggregation"):
+            table = finalize_report_table(store, compute_ci, confidence, ci_method, bootstrap_resamples, seed, jobs)
+        with profile_stage(profiler, "writing"):
+            save_report_table(table, logs_dir, prefix_file_mapping, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, combine_columns, include_step, output_format, compression)
+
+
+def save_report_table(
+    table: ReportTable,
+    output_dir: str,
+    prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]],
+    model_name_mapping: Dict[str, str],
+    model_sort_order: Optional[List[str]],
+    metric_name_mapping: Dict[str, str],
+    metric_sort_order: Optional[List[str]],
+    combine_columns: bool,
+    include_step: bool,
+    output_format: str = "csv",
+    compression: Optional[str] = None,
+) -> None:
+    """Save a finalized report as CSV files, or as columnar files (see ``save_report``).
+
+    Args:
+        table (ReportTable): The finalized report.
+        output_dir (str): Directory the files are written to.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Mapping of prefixes to file names or a list of prefixes.
+        model_name_mapping (Dict[str, str]): Mapping of model directory names to display names.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models in the CSV.
+        metric_name_mapping (Dict[str, str]): Mapping of metric keys to display names.
+        metric_sort_order (Optional[List[str]]): Custom sorting order for metrics in the CSV.
+        combine_columns (bool): Whether to combine mean and CI into one column.
+        include_step (bool): Whether to include the "Step" key in the CSV.
+        output_format (str): "csv", or "parquet"/"feather" for typed columnar files (requires pyarrow).
+        compression (Optional[str]): Compression codec of columnar files. Uses the pyarrow default if None.
+    """
+    if output_format != "csv":
+        save_report(table, output_dir, prefix_file_mapping, output_format, compression, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order)
+        return
+
+    model_metrics = sort_models(table.to_model_metrics(combine_columns), model_sort_order)
 
     # Save metrics to CSV files
-    if prefix_file_mapping:
-        if isinstance(prefix_file_mapping, list):
-            prefix_file_mapping = {prefix: f"{prefix}_metrics.csv" for prefix in prefix_file_mapping}
-
-        for prefix, file_name in prefix_file_mapping.items():
-            category_metrics = {}
-            category_metrics = {
-                model_name: metrics.get(prefix, {})
-                for model_name, metrics in model_metrics.items()
-            }
-            csv_path = os.path.join(logs_dir, file_name)
-            save_metrics_to_csv(category_metrics, csv_path, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, include_step=include_step)
-            print(f"✅ Saved {csv_path} with {len(category_metrics)} models.")
-    else:
-        all_metrics = {
-            model_name: {key: value for category_metrics in metrics.values() for key, value in category_metrics.items()}
-            for model_name, metrics in model_metrics.items()
-        }
-        csv_path = os.path.join(logs_dir, "all_metrics.csv")
-        save_metrics_to_csv(all_metrics, csv_path, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, include_step=include_step)
-        print(f"✅ Saved {csv_path} with {len(all_metrics)} models.")
\ No newline at end of file
+    for file_name, csv_table in build_csv_tables(model_metrics, prefix_file_mapping).items():
+        csv_path = os.path.join(output_dir, file_name)
+        save_metrics_to_csv(csv_table, csv_path, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, include_step=include_step)
+        print(f"✅ Saved {csv_path} with {len(csv_table)} models.")
+
+
+def merge_and_save_metrics(
+    partial_state_paths: List[str],
+    output_dir: str,
+    prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]],
+    model_name_mapping: Dict[str, str],
+    model_sort_order: Optional[List[str]],
+    metric_name_mapping: Dict[str, str],
+    metric_sort_order: Optional[List[str]],
+    confidence: float,
+    combine_columns: bool,
+    include_step: bool,
+    output_format: str = "csv",
+    compression: Optional[str] = None,
+) -> None:
+    """Merge partial state files written by ``process_and_save_metrics`` and save the final report.
+
+    The partial states must come from disjoint sets of runs. Files given twice, written with
+    different settings or covering the same shard are rejected (see ``load_partial_states``).
+    Intervals are parametric (t/z), since bootstrapping needs the individual run values.
+
+    Args:
+        partial_state_paths (List[str]): Paths to the partial state files.
+        output_dir (str): Directory the output files are written to.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Mapping of prefixes to file names or a list of prefixes.
+        model_name_mapping (Dict[str, str]): Mapping of model directory names to display names.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models in the CSV.
+        metric_name_mapping (Dict[str, str]): Mapping of metric keys to display names.
+        metric_sort_order (Optional[List[str]]): Custom sorting order for metrics in the CSV.
+        confidence (float): Confidence level for intervals.
+        combine_columns (bool): Whether to combine mean and CI into one column.
+        include_step (bool): Whether to include the "Step" key in the CSV.
+        output_format (str): "csv", or "parquet"/"feather" for typed columnar files (requires pyarrow).
+        compression (Optional[str]): Compression codec of columnar files. Uses the pyarrow default if None.
+    """
+    state = AggregateState.merged(load_partial_states(partial_state_paths))
+    print(f"✅ Merged {len(partial_state_paths)} partial states with {len(state.models)} models.")
+    table = state.to_report_table(confidence)
+    save_report_table(table, output_dir, prefix_file_mapping, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, combine_columns, include_step, output_format, compression)
@@ -1,6 +1,8 @@
 import numpy as np
-from scipy.stats import t, norm
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import List, Sequence, Tuple, Optional, Union
+
+CI_METHODS = ("parametric", "percentile", "bca")
 
 def compute_confidence_interval(data: List[float], confidence: float = 0.95) -> Optional[Tuple[float, float]]:
     """
@@ -28,14 +30,165 @@ def compute_confidence_interval(data: List[float], confidence: float = 0.95) ->
 
     mean = np.mean(data)
     stderr = np.std(data, ddof=1) / np.sqrt(len(data))
+    margin = stderr * critical_value(confidence, len(data))
+
+    return mean, margin
 
-    if len(data) > 30:
+
+@lru_cache(maxsize=None)
+def critical_value(confidence: float, sample_size: int) -> float:
+    """
+    Critical value of the two-sided interval for a given confidence level and sample size.
+
+    Uses the z-distribution for sample sizes above 30 and the t-distribution with
+    ``sample_size - 1`` degrees of freedom otherwise. Results are memoized.
+
+    Args:
+        confidence (float): The confidence level for the interval.
+        sample_size (int): Number of values in the sample.
+
+    Returns:
+        float: The critical value.
+    """
+    # scipy is slow to import, so it is only loaded once intervals are computed
+    from scipy.stats import norm, t
+
+    if sample_size > 30:
         # Use z-distribution for large sample sizes
-        z_score = norm.ppf((1 + confidence) / 2)
-        margin = stderr * z_score
-    else:
-        # Use t-distribution for small sample sizes
-        t_critical = t.ppf((1 + confidence) / 2, df=len(data) - 1)
-        margin = stderr * t_critical
-
-    return mean, margin
\ No newline at end of file
+        return norm.ppf((1 + confidence) / 2)
+    # Use t-distribution for small sample sizes
+    return t.ppf((1 + confidence) / 2, df=sample_size - 1)
+
+
+def compute_confidence_intervals(data: np.ndarray, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute confidence intervals for many groups of values at once.
+
+    Each row of ``data`` is one group (e.g. a metric of a model) and each column one run,
+    with NaN marking missing values. Rows with the same number of values are processed
+    together, so the results are identical to calling ``compute_confidence_interval`` on
+    the non-missing values of each row.
+
+    Args:
+        data (np.ndarray): A (groups × runs) array of values with NaN for missing values.
+        confidence (float): The confidence level for the intervals (default is 0.95).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The mean and the margin of error of each group.
+        Both are NaN for groups without any values.
+
+    Raises:
+        ValueError: If the confidence level is not between 0 and 1.
+    """
+    if not (0 < confidence < 1):
+        raise ValueError("Confidence level must be between 0 and 1.")
+
+    data = np.asarray(data, dtype=np.float64)
+    present = ~np.isnan(data)
+    counts = present.sum(axis=1)
+    means = np.full(len(data), np.nan)
+    margins = np.full(len(data), np.nan)
+
+    for count in np.unique(counts):
+        if count == 0:
+            continue
+        rows = np.flatnonzero(counts == count)
+        # Drop missing values while keeping the order of the remaining ones
+        values = data[rows][present[rows]].reshape(len(rows), count)
+        means[rows] = np.mean(values, axis=1)
+        stderr = np.std(values, axis=1, ddof=1) / np.sqrt(count)
+        margins[rows] = stderr * critical_value(confidence, int(count))
+
+    return means, margins
+
+
+def bootstrap_confidence_intervals(
+    data: np.ndarray,
+    confidence: float = 0.95,
+    method: str = "percentile",
+    n_resamples: int = 10_000,
+    seed: Union[int, Sequence[int]] = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute bootstrap confidence intervals of the mean for many groups of values at once.
+
+    Each row of ``data`` is one group and each column one run, with NaN marking missing values.
+    Rows with the same number of values share the resamples: each resample is drawn as a vector
+    of multinomial counts over the runs, so the resampled means of all rows are a single matrix
+    product. Unlike the parametric interval the bounds need not be symmetric around the mean.
+
+    Args:
+        data (np.ndarray): A (groups × runs) array of values with NaN for missing values.
+        confidence (float): The confidence level for the intervals (default is 0.95).
+        method (str): "percentile" or "bca" (bias-corrected and accelerated).
+        n_resamples (int): Number of bootstrap resamples.
+        seed (Union[int, Sequence[int]]): Seed of the random generator. The same seed gives the same intervals.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The mean, lower bound and upper bound of each group.
+        Bounds are NaN for groups with fewer than two values.
+
+    Raises:
+        ValueError: If the confidence level is not between 0 and 1 or the method is unknown.
+    """
+    if not (0 < confidence < 1):
+        raise ValueError("Confidence level must be between 0 and 1.")
+    if method not in ("percentile", "bca"):
+        raise ValueError(f"Unknown bootstrap method '{method}'. Must be 'percentile' or 'bca'.")
+
+    data = np.asarray(data, dtype=np.float64)
+    present = ~np.isnan(data)
+    counts = present.sum(axis=1)
+    means = np.full(len(data), np.nan)
+    lower = np.full(len(data), np.nan)
+    upper = np.full(len(data), np.nan)
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+
+    for count in np.unique(counts):
+        if count == 0:
+            continue
+        rows = np.flatnonzero(counts == count)
+        values = data[rows][present[rows]].reshape(len(rows), count)
+        means[rows] = np.mean(values, axis=1)
+        if count < 2:
+            continue
+
+        weights = rng.multinomial(count, np.full(count, 1 / count), size=n_resamples)
+        resampled = np.sort(values @ weights.T / count, axis=1)
+        if method == "percentile":
+            levels = np.tile([alpha, 1 - alpha], (len(rows), 1))
+        else:
+            levels = _bca_levels(values, means[rows], resampled, alpha)
+        bounds = _sorted_quantiles(resampled, levels)
+        lower[rows], upper[rows] = bounds[:, 0], bounds[:, 1]
+
+    return means, lower, upper
+
+
+def _bca_levels(values: np.ndarray, estimates: np.ndarray, resampled: np.ndarray, alpha: float) -> np.ndarray:
+    from scipy.stats import norm
+
+    # Bias correction from the share of resampled means below the estimate
+    n_resamples = resampled.shape[1]
+    proportion = np.clip((resampled < estimates[:, None]).mean(axis=1), 0.5 / n_resamples, 1 - 0.5 / n_resamples)
+    bias = norm.ppf(proportion)
+
+    # Acceleration from the jackknife means
+    jackknife = (values.sum(axis=1, keepdims=True) - values) / (values.shape[1] - 1)
+    deviations = jackknife.mean(axis=1, keepdims=True) - jackknife
+    denominator = 6 * (deviations ** 2).sum(axis=1) ** 1.5
+    acceleration = np.divide((deviations ** 3).sum(axis=1), denominator, out=np.zeros(len(values)), where=denominator > 0)
+
+    shifted = bias[:, None] + norm.ppf([alpha, 1 - alpha])[None, :]
+    return norm.cdf(bias[:, None] + shifted / (1 - acceleration[:, None] * shifted))
+
+
+def _sorted_quantiles(sorted_values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    # Linearly interpolated quantiles with a different level per row
+    positions = levels * (sorted_values.shape[1] - 1)
+    below = np.floor(positions).astype(np.intp)
+    above = np.minimum(below + 1, sorted_values.shape[1] - 1)
+    fraction = positions - below
+    rows = np.arange(len(sorted_values))[:, None]
+    return sorted_values[rows, below] * (1 - fraction) + sorted_values[rows, above] * fraction
@@ -1,5 +1,7 @@
 import csv
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, TextIO
+
+ROW_BATCH_SIZE = 1000
 
 def save_metrics_to_csv(
     all_metrics: Dict[str, Dict[str, str]],
@@ -28,18 +30,42 @@ def save_metrics_to_csv(
         print(f"⚠️  No metrics found. Skipping {csv_path}.")
         return
 
-    # Sort models if a custom sort order is provided
+    with open(csv_path, "w", newline="") as csvfile:
+        write_metrics_csv(all_metrics, csvfile, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order, include_step)
+
+
+def write_metrics_csv(
+    all_metrics: Dict[str, Dict[str, str]],
+    csvfile: TextIO,
+    model_name_mapping: Optional[Dict[str, str]] = None,
+    model_sort_order: Optional[List[str]] = None,
+    metric_name_mapping: Optional[Dict[str, str]] = None,
+    metric_sort_order: Optional[List[str]] = None,
+    include_step: Optional[bool] = None,
+) -> None:
+    """Write collected metrics as CSV into an open text stream.
+
+    Args:
+        all_metrics (Dict[str, Dict[str, str]]): Dictionary of metrics for each model.
+        csvfile (TextIO): Stream to write to, opened with ``newline=""``.
+        model_name_mapping (Optional[Dict[str, str]]): Mapping of model directory names to display names.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models in the CSV.
+        metric_name_mapping (Optional[Dict[str, str]]): Mapping of metric keys to display names.
+        metric_sort_order (Optional[List[str]]): Custom sorting order for metrics in the CSV.
+        include_step (Optional[bool]): Whether to include the "Step" key in the CSV.
+
+    Returns:
+        None
+    """
+    # Keep models in the sort order first, the others at the end
+    model_keys = list(all_metrics)
     if model_sort_order:
-        sorted_models = []
-        missing_models = []
-        for model_key in all_metrics.keys():
-            if model_sort_order and model_key in model_sort_order:
-                sorted_models.append(model_key)
-            else:
-                missing_models.append(model_key)
-                print(f"⚠️  Model '{model_key}' is not included in the model sort order. Adding it to the end.")
-        all_metrics_sorted = {model_key: all_metrics[model_key] for model_key in sorted_models + missing_models}
-        all_metrics = all_metrics_sorted
+        model_ranks = set(model_sort_order)
+        missing_models = [model_key for model_key in model_keys if model_key not in model_ranks]
+        if missing_models:
+            _warn_missing("models are not included in the model sort order. Adding them to the end", missing_models)
+            missing = set(missing_models)
+            model_keys = [model_key for model_key in model_keys if model_key not in missing] + missing_models
 
     metric_keys = set()
     for metrics in all_metrics.values():
@@ -49,47 +75,70 @@ def save_metrics_to_csv(
     if not include_step:
         metric_keys.discard("Step")
 
-    # Sort metrics if a custom sort order is provided 
     if metric_sort_order:
-        sorted_metrics = []
-        missing_metrics = []
-        for key in metric_keys:
-            if key in metric_sort_order:
-                sorted_metrics.append(key)
-            else:
-                missing_metrics.append(key)
-                print(f"⚠️  Metric '{key}' is not included in the metric sort order. Adding it to the end.")
-        metric_keys = sorted(sorted_metrics, key=lambda x: metric_sort_order.index(x)) + sorted(missing_metrics)
-    else:
-        metric_keys = sorted(metric_keys)
+        listed = set(metric_sort_order)
+        missing_metrics = sorted(key for key in metric_keys if key not in listed)
+        if missing_metrics:
+            _warn_missing("metrics are not included in the metric sort order. Adding them to the end", missing_metrics)
+    metric_keys = order_metric_keys(metric_keys, metric_sort_order)
 
     # Write metrics to CSV file
-    with open(csv_path, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        header = ["Name"]
+    writer = csv.writer(csvfile)
+    header = ["Name"]
+    if include_step:
+        header.append("Step")
+    if metric_name_mapping:
+        unmapped_metrics = [key for key in metric_keys if key not in metric_name_mapping]
+        if unmapped_metrics:
+            _warn_missing("metrics are not included in the metric name mapping. Using the keys as-is", unmapped_metrics)
+        header += [metric_name_mapping.get(key, key) for key in metric_keys]
+    else:
+        header += metric_keys
+    writer.writerow(header)
+
+    if model_name_mapping:
+        unmapped_models = [model_key for model_key in model_keys if model_key not in model_name_mapping]
+        if unmapped_models:
+            _warn_missing("models are not included in the model name mapping. Using the names as-is", unmapped_models)
+    model_name_mapping = model_name_mapping or {}
+
+    batch = []
+    for model_key in model_keys:
+        metrics = all_metrics[model_key]
+        row = [model_name_mapping.get(model_key, model_key)]
         if include_step:
-            header.append("Step")
-        if metric_name_mapping:
-            formatted_keys = []
-            for key in metric_keys:
-                if key in metric_name_mapping:
-                    formatted_keys.append(metric_name_mapping[key])
-                else:
-                    print(f"⚠️  Metric '{key}' is not included in the metric name mapping. Using the key as-is.")
-                    formatted_keys.append(key)
-            header += formatted_keys
-        else:
-            header += metric_keys
-        writer.writerow(header)
-
-        for name, metrics in all_metrics.items():
-            if model_name_mapping:
-                if name in model_name_mapping:
-                    name = model_name_mapping[name]
-                else:
-                    print(f"⚠️  Model '{name}' is not included in the model name mapping. Using the name as-is.")
-            row = [name]
-            if include_step:
-                row.append(metrics.get("Step", "N/A"))
-            row += [metrics.get(key, "N/A") for key in metric_keys]
-            writer.writerow(row)
+            row.append(metrics.get("Step", "N/A"))
+        row += [metrics.get(key, "N/A") for key in metric_keys]
+        batch.append(row)
+        if len(batch) >= ROW_BATCH_SIZE:
+            writer.writerows(batch)
+            batch = []
+    writer.writerows(batch)
+
+
+def order_metric_keys(metric_keys: Iterable[str], metric_sort_order: Optional[List[str]] = None) -> List[str]:
+    """Order metric keys by a custom sort order, with unlisted keys sorted alphabetically at the end.
+
+    Args:
+        metric_keys (Iterable[str]): The metric keys to order.
+        metric_sort_order (Optional[List[str]]): Custom sorting order. All keys are sorted alphabetically if None.
+
+    Returns:
+        List[str]: The ordered metric keys.
+    """
+    if not metric_sort_order:
+        return sorted(metric_keys)
+    # First occurrence wins if a key is listed twice
+    ranks = {}
+    for rank, key in enumerate(metric_sort_order):
+        ranks.setdefault(key, rank)
+    listed = sorted((key for key in metric_keys if key in ranks), key=ranks.__getitem__)
+    return listed + sorted(key for key in metric_keys if key not in ranks)
+
+
+def _warn_missing(message: str, names: List[str], shown: int = 5) -> None:
+    # One summary line instead of one warning per name
+    listing = ", ".join(f"'{name}'" for name in names[:shown])
+    if len(names) > shown:
+        listing += f" and {len(names) - shown} more"
+    print(f"⚠️  {len(names)} {message}: {listing}.")
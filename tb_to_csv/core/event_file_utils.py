@@ -1,37 +1,196 @@
+import fnmatch
 import os
-import glob
-from typing import Any, Dict, List
-from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from tb_to_csv.core.event_reader import ReadState, TimingTracker, iter_scalar_events, read_last_scalars, resume_last_scalars
+from tb_to_csv.core.reductions import ReductionEngine
 
-def find_event_files(logs_dir: str) -> List[str]:
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+READERS = ("native", "accumulator")
+EVENT_FILE_PREFIX = "events.out.tfevents."
+
+# Smallest reservoirs the EventAccumulator supports (a size of 0 means unbounded). The
+# reservoirs always keep the most recent item, so the last scalar value is preserved.
+# Keys are the plugin names of ``tensorboard.backend.event_processing.event_accumulator``.
+BOUNDED_SIZE_GUIDANCE = {
+    "distributions": 1,
+    "images": 1,
+    "audio": 1,
+    "scalars": 1,
+    "histograms": 1,
+    "tensors": 1,
+}
+
+# TensorBoard is slow to import and only needed by the "accumulator" reader, so it is
+# loaded on first use. Kept as a module attribute so it can be replaced in tests.
+EventAccumulator = None
+
+
+def load_event_accumulator():
+    """Import TensorBoard's EventAccumulator class on first use.
+
+    Returns:
+        type: The EventAccumulator class.
+    """
+    global EventAccumulator
+    if EventAccumulator is None:
+        from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+    return EventAccumulator
+
+def check_timing_reader(reader: str, timing: bool) -> None:
+    """Raise a ValueError if timing columns are requested from a reader that cannot record them.
+
+    Only the native reader sees the wall time of every summary event in its single pass.
+    """
+    if timing and reader != "native":
+        raise ValueError("❌ Timing columns require the native reader.")
+
+def resolve_jobs(jobs: int) -> int:
+    """Return the number of worker processes to use, with 0 meaning one per CPU.
+
+    Raises:
+        ValueError: If jobs is negative.
+    """
+    if jobs < 0:
+        raise ValueError(f"❌ The number of jobs must be 0 (one per CPU) or positive, got {jobs}.")
+    return jobs or os.cpu_count() or 1
+
+def find_event_files(
+    logs_dir: str,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    threads: int = 1,
+) -> List[str]:
     """Find the latest TensorBoard event file per experiment.
 
+    The directory tree is walked with ``os.scandir``. Files are only stat-ed to pick the
+    newest one when a directory contains several event files. Hidden directories are skipped.
+
     Args:
         logs_dir (str): Path to the logs directory.
+        max_depth (Optional[int]): Maximum number of directory levels below ``logs_dir`` to
+            search (2 for the 'model/run/' layout). Unlimited if None.
+        exclude (Optional[List[str]]): Glob patterns of directories to skip, matched against
+            the directory name and its path relative to ``logs_dir`` (e.g. 'checkpoints/').
+        threads (int): Number of threads used to walk the top-level subdirectories in parallel.
+
+    Returns:
+        List[str]: List of paths to the latest event files, ordered by directory path.
+    """
+    exclude = [pattern.rstrip("/") for pattern in exclude or []]
+    event_files, subdirs = _scan_dir(logs_dir, logs_dir, 0, max_depth, exclude)
+    if threads > 1 and len(subdirs) > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            subtrees = executor.map(lambda entry: _walk(entry.path, logs_dir, 1, max_depth, exclude), subdirs)
+            for subtree_files in subtrees:
+                event_files.extend(subtree_files)
+    else:
+        for entry in subdirs:
+            event_files.extend(_walk(entry.path, logs_dir, 1, max_depth, exclude))
+    return event_files
+
+def find_search_dirs(logs_dir: str, max_depth: Optional[int] = None, exclude: Optional[List[str]] = None) -> List[str]:
+    """List the directories ``find_event_files`` descends into, including ``logs_dir`` itself.
+
+    Takes the same ``max_depth`` and ``exclude`` arguments as ``find_event_files``.
 
     Returns:
-        List[str]: List of paths to the latest event files.
+        List[str]: Paths of the searched directories, in the order they are visited.
     """
-    all_event_files = glob.glob(os.path.join(logs_dir, "**/events.out.tfevents.*"), recursive=True)
-    all_event_files = sorted(all_event_files, key=os.path.getmtime, reverse=True)
+    exclude = [pattern.rstrip("/") for pattern in exclude or []]
+    search_dirs = []
+    pending = [(logs_dir, 0)]
+    while pending:
+        dir_path, depth = pending.pop()
+        search_dirs.append(dir_path)
+        _, subdirs = _scan_dir(dir_path, logs_dir, depth, max_depth, exclude)
+        pending.extend((entry.path, depth + 1) for entry in reversed(subdirs))
+    return search_dirs
 
-    unique_experiments = {}
-    for event_file in all_event_files:
-        exp_dir = os.path.dirname(event_file)
-        if exp_dir not in unique_experiments:
-            unique_experiments[exp_dir] = event_file
-    return list(unique_experiments.values())
+def _walk(dir_path: str, logs_dir: str, depth: int, max_depth: Optional[int], exclude: List[str]) -> List[str]:
+    event_files, subdirs = _scan_dir(dir_path, logs_dir, depth, max_depth, exclude)
+    for entry in subdirs:
+        event_files.extend(_walk(entry.path, logs_dir, depth + 1, max_depth, exclude))
+    return event_files
 
-def extract_metrics(event_file: str) -> Dict[str, Any]:
-    """Extract scalar metrics from a given TensorBoard event file.
+def _scan_dir(dir_path: str, logs_dir: str, depth: int, max_depth: Optional[int], exclude: List[str]) -> Tuple[List[str], List[os.DirEntry]]:
+    """Return the newest event file of a directory and the subdirectories to descend into."""
+    candidates = []
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name.startswith(EVENT_FILE_PREFIX):
+                    if entry.is_file():
+                        candidates.append(entry)
+                elif (max_depth is None or depth < max_depth) and entry.is_dir() and not _is_excluded(entry, logs_dir, exclude):
+                    subdirs.append(entry)
+    except OSError:
+        return [], []
+
+    event_files = []
+    if len(candidates) == 1:
+        event_files.append(candidates[0].path)
+    elif candidates:
+        newest = max(candidates, key=lambda entry: (entry.stat().st_mtime, entry.name))
+        event_files.append(newest.path)
+    subdirs.sort(key=lambda entry: entry.name)
+    return event_files, subdirs
+
+def _is_excluded(entry: os.DirEntry, logs_dir: str, exclude: List[str]) -> bool:
+    if not exclude:
+        return False
+    relative_path = os.path.relpath(entry.path, logs_dir).replace(os.sep, "/")
+    return any(fnmatch.fnmatch(entry.name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in exclude)
+
+def extract_metrics(
+    event_file: str,
+    reader: str = "native",
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    timing: bool = False,
+) -> Tuple[Dict[str, float], Optional[int]]:
+    """Extract the last value of every scalar metric from a given TensorBoard event file.
 
     Args:
         event_file (str): Path to the TensorBoard event file.
+        reader (str): Backend used to read the file. "native" streams the records and only
+            decodes scalar summaries; "accumulator" uses TensorBoard's EventAccumulator.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to extract.
+            The native reader skips other tags before decoding their values.
+        bounded_memory (bool): Limit the accumulator to a single item per tag and plugin instead
+            of keeping reservoirs of images, histograms, tensors and scalars. The native reader
+            always runs in memory proportional to the number of tags.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value
+            (see ``reduce_metrics``).
+        timing (bool): Also record the first and last wall time and step of the file in the same
+            pass (see ``tb_to_csv.core.event_reader.resume_last_scalars``). Native reader only.
 
     Returns:
-        Dict[str, Any]: Dictionary of extracted metrics.
+        Tuple[Dict[str, float], Optional[int]]: Dictionary of extracted metrics and the last step.
+
+    Raises:
+        ValueError: If the reader or a reduction is unknown, or timing is requested from the accumulator.
     """
-    event_acc = EventAccumulator(event_file)
+    check_timing_reader(reader, timing)
+    if reductions:
+        return reduce_metrics(event_file, reductions, reader, tag_filter, bounded_memory, timing)
+    if reader == "native":
+        return read_last_scalars(event_file, tag_filter, timing)
+    if reader != "accumulator":
+        raise ValueError(f"Unknown reader '{reader}'. Must be one of {READERS}.")
+
+    event_acc = load_event_accumulator()(event_file, size_guidance=BOUNDED_SIZE_GUIDANCE if bounded_memory else None)
     event_acc.Reload()
 
     available_scalars = event_acc.Tags().get("scalars", [])
@@ -39,6 +198,8 @@ def extract_metrics(event_file: str) -> Dict[str, Any]:
     last_step = None
 
     for scalar in available_scalars:
+        if tag_filter is not None and not tag_filter(scalar):
+            continue
         scalar_events = event_acc.Scalars(scalar)
         if scalar_events:
             metrics[scalar] = scalar_events[-1].value
@@ -46,17 +207,155 @@ def extract_metrics(event_file: str) -> Dict[str, Any]:
 
     return metrics, last_step
 
-def get_training_duration(event_file: str) -> float:
+def reduce_metrics(
+    event_file: str,
+    reductions: List[str],
+    reader: str = "native",
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    timing: bool = False,
+) -> Tuple[Dict[str, float], Optional[int]]:
+    """Compute reductions of every scalar metric of an event file in a single pass.
+
+    Each reduction of a tag is stored as '<tag>@<reduction>' (e.g. 'test/Acc@max'), except
+    'last', which keeps the plain tag name. The native reader streams the events through the
+    reduction engine. The accumulator keeps every scalar in memory and feeds the selector tags
+    of 'at_best' reductions first, so their best step is known before the other tags are reduced.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        reductions (List[str]): Reduction specifications (see ``tb_to_csv.core.reductions.Reduction``).
+        reader (str): Backend used to read the file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to reduce.
+        bounded_memory (bool): Limit the accumulator's reservoirs of non-scalar plugins.
+        timing (bool): Also record the timing fields of the file (native reader only).
+
+    Returns:
+        Tuple[Dict[str, float], Optional[int]]: Dictionary of reduced metrics and the last step.
+
+    Raises:
+        ValueError: If the reader or a reduction is unknown.
+    """
+    engine = ReductionEngine(reductions, tag_filter)
+    if reader == "native":
+        tracker = TimingTracker() if timing else None
+        for event in iter_scalar_events(event_file, engine.read_filter(), tracker.update if tracker is not None else None):
+            engine.update(event.tag, event.step, event.value)
+        results = engine.results()
+        return (tracker.store(results) if tracker is not None else results), engine.last_step
+    if reader != "accumulator":
+        raise ValueError(f"Unknown reader '{reader}'. Must be one of {READERS}.")
+
+    # Reductions need every scalar, not a downsampled reservoir
+    accumulator_class = load_event_accumulator()
+    from tensorboard.backend.event_processing.event_accumulator import DEFAULT_SIZE_GUIDANCE
+
+    size_guidance = dict(BOUNDED_SIZE_GUIDANCE if bounded_memory else DEFAULT_SIZE_GUIDANCE)
+    size_guidance["scalars"] = 0
+    event_acc = accumulator_class(event_file, size_guidance=size_guidance)
+    event_acc.Reload()
+
+    read_filter = engine.read_filter()
+    available_scalars = [scalar for scalar in event_acc.Tags().get("scalars", []) if read_filter is None or read_filter(scalar)]
+    selectors = set(engine.selectors)
+    last_step = None
+    for scalar in sorted(available_scalars, key=lambda tag: tag not in selectors):
+        for scalar_event in event_acc.Scalars(scalar):
+            engine.update(scalar, scalar_event.step, scalar_event.value)
+            last_step = scalar_event.step
+    return engine.results(), last_step
+
+def extract_metrics_incremental(
+    event_file: str,
+    reader: str = "native",
+    state: Optional[ReadState] = None,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    timing: bool = False,
+) -> ReadState:
+    """Extract metrics, resuming after a previous read of the same file where possible.
+
+    Only the native reader can resume the last values; with the accumulator or with
+    reductions the file is always read in full and the returned state carries no offset.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        reader (str): Backend used to read the file.
+        state (Optional[ReadState]): State returned by a previous call for the same file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to extract.
+        bounded_memory (bool): Limit the accumulator's reservoirs (see ``extract_metrics``).
+        report_memory (bool): Print the peak memory allocated while reading the file.
+        reductions (Optional[List[str]]): Reductions to compute per tag instead of the last value.
+        timing (bool): Also record the first and last wall time and step of the file.
+
+    Returns:
+        ReadState: The extracted metrics, the last step and the position to resume from.
+    """
+    with track_peak_memory(event_file, enabled=report_memory):
+        if reader == "native" and not reductions:
+            return resume_last_scalars(event_file, state, tag_filter, timing)
+        metrics, last_step = extract_metrics(event_file, reader, tag_filter, bounded_memory, reductions, timing)
+        return ReadState(metrics, last_step, None, None)
+
+@contextmanager
+def track_peak_memory(event_file: str, enabled: bool = True) -> Iterator[None]:
+    """Print the peak memory used while the block runs.
+
+    Two figures are reported. The peak of the Python heap is measured with ``tracemalloc``,
+    which slows down allocations while enabled and does not see native allocations such as
+    protobuf messages or TensorBoard's reservoirs. The growth of the process's peak RSS covers
+    native allocations too, but is zero if the block stayed below an earlier peak of the
+    process, e.g. one reached while reading a previous file in the same worker.
+
+    Args:
+        event_file (str): Path to the event file being read, used in the report.
+        enabled (bool): Whether to measure memory at all.
+    """
+    if not enabled or tracemalloc.is_tracing():
+        yield
+        return
+    rss_before = peak_rss_mib()
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = peak_rss_mib()
+        rss = "" if rss_after is None else f", peak RSS {rss_after:.1f} MiB (+{rss_after - rss_before:.1f} MiB while reading)"
+        print(f"📈 Peak memory while reading {event_file}: {peak / 2**20:.1f} MiB Python heap{rss}")
+
+def peak_rss_mib() -> Optional[float]:
+    """Peak resident set size of this process in MiB, or None if the platform does not report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+def get_training_duration(event_file: str, bounded_memory: bool = False) -> float:
     """
     Approximate the training duration from a TensorBoard event file.
 
     Args:
         event_file (str): Path to the TensorBoard event file.
+        bounded_memory (bool): Stream the scalar wall times instead of loading the file into an EventAccumulator.
 
     Returns:
         float: Training duration in seconds.
     """
-    event_acc = EventAccumulator(event_file)
+    if bounded_memory:
+        start_time = end_time = None
+        for event in iter_scalar_events(event_file):
+            start_time = event.wall_time if start_time is None else min(start_time, event.wall_time)
+            end_time = event.wall_time if end_time is None else max(end_time, event.wall_time)
+        if start_time is None:
+            raise ValueError(f"No scalar events found in {event_file}")
+        return end_time - start_time
+
+    event_acc = load_event_accumulator()(event_file)
     event_acc.Reload()
 
     # Get all events
@@ -0,0 +1,542 @@
+import hashlib
+import os
+import struct
+from collections import namedtuple
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import google_crc32c
+except ImportError:
+    google_crc32c = None
+
+# Record checksums are computed in C by google-crc32c. The pure Python fallback for platforms
+# without its C extension makes reading several times slower
+_crc32c = google_crc32c.value if google_crc32c is not None and google_crc32c.implementation == "c" else None
+
+# A single scalar data point as stored in a TensorBoard event file.
+ScalarEvent = namedtuple("ScalarEvent", ["tag", "step", "wall_time", "value"])
+
+# Result of reading an event file up to ``offset``, from which a later read can resume.
+# ``head`` is a digest of the beginning of the file used to detect rewritten files.
+ReadState = namedtuple("ReadState", ["metrics", "last_step", "offset", "head"])
+
+
+class ReadCounters:
+    """Running totals of the records and bytes read from event files in this process."""
+
+    __slots__ = ("records", "bytes")
+
+    def __init__(self):
+        self.records = 0
+        self.bytes = 0
+
+
+# Only updated when a file has been read, so the read loop just increments a local
+READ_COUNTERS = ReadCounters()
+
+# Timing fields stored in the extracted metrics under this prefix, so that they are cached and
+# resumed together with the metrics. No prefix mapping selects them as metrics.
+TIMING_PREFIX = "__timing__/"
+TIMING_FIELDS = ("first_wall_time", "last_wall_time", "first_step", "last_step")
+
+
+class TimingTracker:
+    """Tracks the first and last wall time and step of the summary events of a file.
+
+    Args:
+        metrics (Optional[Dict[str, float]]): Metrics of a previous read holding timing fields to resume from.
+    """
+
+    __slots__ = TIMING_FIELDS
+
+    def __init__(self, metrics: Optional[Dict[str, float]] = None):
+        metrics = metrics or {}
+        for field in TIMING_FIELDS:
+            setattr(self, field, metrics.get(TIMING_PREFIX + field))
+
+    def update(self, wall_time: float, step: int) -> None:
+        """Account for a summary event."""
+        if self.first_wall_time is None:
+            self.first_wall_time = self.last_wall_time = wall_time
+            self.first_step = self.last_step = step
+            return
+        self.first_wall_time = min(self.first_wall_time, wall_time)
+        self.last_wall_time = max(self.last_wall_time, wall_time)
+        self.first_step = min(self.first_step, step)
+        self.last_step = max(self.last_step, step)
+
+    def store(self, metrics: Dict[str, float]) -> Dict[str, float]:
+        """Add the timing fields to the metrics, unless no summary event was seen."""
+        if self.first_wall_time is not None:
+            for field in TIMING_FIELDS:
+                metrics[TIMING_PREFIX + field] = getattr(self, field)
+        return metrics
+
+
+# Number of leading bytes covered by the head digest
+HEAD_BYTES = 4096
+
+# Protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+# TensorFlow DataType enum values of the tensor dtypes that can hold a scalar metric
+_TENSOR_DTYPES = {
+    1: ("<f", 4),   # DT_FLOAT
+    2: ("<d", 8),   # DT_DOUBLE
+    3: ("<i", 4),   # DT_INT32
+    9: ("<q", 8),   # DT_INT64
+    19: ("<e", 2),  # DT_HALF
+}
+_SCALARS_PLUGIN = b"scalars"
+_DATA_CLASS_SCALAR = 1
+
+_HEADER = struct.Struct("<QI")
+_FOOTER = struct.Struct("<I")
+_FLOAT = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+
+
+def _make_crc32c_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def masked_crc32c(data: bytes) -> int:
+    """Compute the masked CRC32C checksum used by the TFRecord format.
+
+    Args:
+        data (bytes): Data to checksum.
+
+    Returns:
+        int: Masked CRC32C checksum.
+    """
+    if _crc32c is not None:
+        crc = _crc32c(data)
+    else:
+        crc = 0xFFFFFFFF
+        for byte in data:
+            crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        crc ^= 0xFFFFFFFF
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+def _iter_frames(file: BinaryIO, offset: int = 0) -> Iterator[Tuple[int, bytes, int]]:
+    """Iterate over the records of a TFRecord file with their unverified payload checksums.
+
+    Iteration stops silently at the first incomplete record or corrupted length header,
+    which is what a file that is still being written looks like.
+
+    Yields:
+        Tuple[int, bytes, int]: The byte offset right after the record, the record payload
+        and the masked CRC32C stored for the payload.
+    """
+    file.seek(offset)
+    start = offset
+    records = 0
+    try:
+        while True:
+            header = file.read(12)
+            if len(header) < 12:
+                return
+            length, length_crc = _HEADER.unpack(header)
+            if masked_crc32c(header[:8]) != length_crc:
+                return
+            data = file.read(length)
+            footer = file.read(4)
+            if len(data) < length or len(footer) < 4:
+                return
+            offset += length + 16
+            records += 1
+            yield offset, data, _FOOTER.unpack(footer)[0]
+    finally:
+        READ_COUNTERS.records += records
+        READ_COUNTERS.bytes += offset - start
+
+
+def _warn_corrupt(file: BinaryIO, corrupt: int) -> None:
+    if corrupt:
+        print(f"⚠️ Skipped {corrupt} corrupted records in {getattr(file, 'name', 'event file')}.")
+
+
+def iter_records(file: BinaryIO, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Iterate over the raw records of a TFRecord file.
+
+    Iteration stops silently at the first incomplete record or corrupted length header,
+    which is what a file that is still being written looks like. Complete records whose
+    payload does not match its checksum are skipped with a warning.
+
+    Args:
+        file (BinaryIO): File opened in binary mode.
+        offset (int): Byte offset of the first record to read.
+
+    Yields:
+        Tuple[int, bytes]: The byte offset right after the record and the record payload.
+    """
+    corrupt = 0
+    try:
+        for offset, data, checksum in _iter_frames(file, offset):
+            if masked_crc32c(data) != checksum:
+                corrupt += 1
+                continue
+            yield offset, data
+    finally:
+        _warn_corrupt(file, corrupt)
+
+
+def _iter_events(
+    file: BinaryIO,
+    offset: int = 0,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    all_summaries: bool = False,
+) -> Iterator[Tuple[int, Optional[Tuple[float, int, List[Tuple[str, float]]]]]]:
+    """Decode the records of a TFRecord file with ``parse_scalar_event``.
+
+    Checksumming a payload costs more than skipping it, and most of the bytes of an event
+    file are images, histograms and graphs that are never decoded. Payload checksums are
+    therefore only verified for the events that are used: events with values passing the
+    filter, or every summary event if ``all_summaries``. Events that fail the check are
+    skipped with a warning.
+
+    Yields:
+        Tuple[int, Optional[Tuple[float, int, List[Tuple[str, float]]]]]: The byte offset right
+        after each record and its decoded event, or None if it is not used.
+    """
+    corrupt = 0
+    try:
+        for offset, record, checksum in _iter_frames(file, offset):
+            event = parse_scalar_event(record, tag_filter)
+            if event is not None and not (event[2] or all_summaries):
+                event = None
+            if event is not None and masked_crc32c(record) != checksum:
+                corrupt += 1
+                event = None
+            yield offset, event
+    finally:
+        _warn_corrupt(file, corrupt)
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _skip_field(buf: bytes, pos: int, wire_type: int) -> int:
+    if wire_type == _VARINT:
+        _, pos = _read_varint(buf, pos)
+        return pos
+    if wire_type == _FIXED64:
+        return pos + 8
+    if wire_type == _LENGTH_DELIMITED:
+        length, pos = _read_varint(buf, pos)
+        return pos + length
+    if wire_type == _FIXED32:
+        return pos + 4
+    raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+
+
+def _is_scalar_metadata(buf: bytes, pos: int, end: int) -> bool:
+    """Check whether a SummaryMetadata message marks its value as a scalar."""
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if field == 1 and wire_type == _LENGTH_DELIMITED:
+            # PluginData
+            length, pos = _read_varint(buf, pos)
+            plugin_end = pos + length
+            while pos < plugin_end:
+                key, pos = _read_varint(buf, pos)
+                if key == (1 << 3 | _LENGTH_DELIMITED):
+                    length, pos = _read_varint(buf, pos)
+                    if buf[pos:pos + length] == _SCALARS_PLUGIN:
+                        return True
+                    pos += length
+                else:
+                    pos = _skip_field(buf, pos, key & 7)
+        elif field == 4 and wire_type == _VARINT:
+            data_class, pos = _read_varint(buf, pos)
+            if data_class == _DATA_CLASS_SCALAR:
+                return True
+        else:
+            pos = _skip_field(buf, pos, wire_type)
+    return False
+
+
+def _decode_scalar_tensor(buf: bytes, pos: int, end: int) -> Optional[float]:
+    """Decode a rank-0 TensorProto, returning None for anything that is not a scalar."""
+    dtype = None
+    content = None
+    typed_field = None
+    typed_value = None
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if field == 1 and wire_type == _VARINT:
+            dtype, pos = _read_varint(buf, pos)
+        elif field == 2 and wire_type == _LENGTH_DELIMITED:
+            # TensorShapeProto: any dimension means this is not a scalar
+            length, pos = _read_varint(buf, pos)
+            shape_end = pos + length
+            while pos < shape_end:
+                key, pos = _read_varint(buf, pos)
+                if key >> 3 == 2:
+                    return None
+                pos = _skip_field(buf, pos, key & 7)
+        elif field == 4 and wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(buf, pos)
+            content = buf[pos:pos + length]
+            pos += length
+        elif field in (5, 6) and wire_type in (_LENGTH_DELIMITED, _FIXED32, _FIXED64):
+            # float_val / double_val, packed or not
+            if wire_type == _LENGTH_DELIMITED:
+                length, pos = _read_varint(buf, pos)
+            else:
+                length = 4 if wire_type == _FIXED32 else 8
+            unpacker = _FLOAT if field == 5 else _DOUBLE
+            if length == unpacker.size:
+                typed_field, typed_value = field, unpacker.unpack_from(buf, pos)[0]
+            pos += length
+        elif field in (7, 10, 13) and wire_type in (_LENGTH_DELIMITED, _VARINT):
+            # int_val / int64_val / half_val, packed or not
+            if wire_type == _LENGTH_DELIMITED:
+                length, pos = _read_varint(buf, pos)
+                typed_value, _ = _read_varint(buf, pos)
+                pos += length
+            else:
+                typed_value, pos = _read_varint(buf, pos)
+            typed_field = field
+        else:
+            pos = _skip_field(buf, pos, wire_type)
+
+    if dtype not in _TENSOR_DTYPES:
+        return None
+    if content is not None:
+        fmt, size = _TENSOR_DTYPES[dtype]
+        if len(content) != size:
+            return None
+        return float(struct.unpack(fmt, content)[0])
+    if typed_field is None:
+        return None
+    if typed_field == 13:
+        return float(struct.unpack("<e", struct.pack("<H", typed_value & 0xFFFF))[0])
+    if typed_field in (7, 10) and typed_value >= 1 << 63:
+        typed_value -= 1 << 64
+    return float(typed_value)
+
+
+def _parse_value(buf: bytes, pos: int, end: int, tag_filter: Optional[Callable[[str], bool]]) -> Optional[Tuple[str, float]]:
+    """Decode a Summary.Value message into a (tag, value) pair if it holds a scalar."""
+    tag = None
+    simple_value = None
+    metadata = None
+    tensor = None
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if field == 1 and wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(buf, pos)
+            tag = buf[pos:pos + length].decode("utf-8")
+            pos += length
+            if tag_filter is not None and not tag_filter(tag):
+                return None
+        elif field == 2 and wire_type == _FIXED32:
+            simple_value = _FLOAT.unpack_from(buf, pos)[0]
+            pos += 4
+        elif field in (8, 9) and wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(buf, pos)
+            if field == 8:
+                tensor = (pos, pos + length)
+            else:
+                metadata = (pos, pos + length)
+            pos += length
+        else:
+            pos = _skip_field(buf, pos, wire_type)
+
+    if tag is None:
+        return None
+    if simple_value is not None:
+        return tag, float(simple_value)
+    if tensor is not None and metadata is not None and _is_scalar_metadata(buf, *metadata):
+        value = _decode_scalar_tensor(buf, *tensor)
+        if value is not None:
+            return tag, value
+    return None
+
+
+def parse_scalar_event(record: bytes, tag_filter: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[float, int, List[Tuple[str, float]]]]:
+    """Decode the scalar summary values of a serialized Event message.
+
+    Only the wall time, step and scalar summary values are decoded. Graph definitions,
+    images, histograms and all other payloads are skipped without being parsed.
+
+    Args:
+        record (bytes): Serialized Event protobuf.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate deciding which tags to decode.
+
+    Returns:
+        Optional[Tuple[float, int, List[Tuple[str, float]]]]: The wall time, step and
+        (tag, value) pairs, or None if the event contains no summary or is malformed.
+    """
+    try:
+        return _parse_event(record, tag_filter)
+    except (IndexError, UnicodeDecodeError, ValueError, struct.error):
+        # Truncated varints, invalid tags or unknown wire types of a malformed record
+        return None
+
+
+def _parse_event(record: bytes, tag_filter: Optional[Callable[[str], bool]]) -> Optional[Tuple[float, int, List[Tuple[str, float]]]]:
+    wall_time = 0.0
+    step = 0
+    values = None
+    pos = 0
+    end = len(record)
+    while pos < end:
+        key, pos = _read_varint(record, pos)
+        field, wire_type = key >> 3, key & 7
+        if field == 1 and wire_type == _FIXED64:
+            wall_time = _DOUBLE.unpack_from(record, pos)[0]
+            pos += 8
+        elif field == 2 and wire_type == _VARINT:
+            step, pos = _read_varint(record, pos)
+            if step >= 1 << 63:
+                step -= 1 << 64
+        elif field == 5 and wire_type == _LENGTH_DELIMITED:
+            # Summary: repeated Value value = 1
+            length, pos = _read_varint(record, pos)
+            summary_end = pos + length
+            values = []
+            while pos < summary_end:
+                key, pos = _read_varint(record, pos)
+                if key == (1 << 3 | _LENGTH_DELIMITED):
+                    length, pos = _read_varint(record, pos)
+                    scalar = _parse_value(record, pos, pos + length, tag_filter)
+                    if scalar is not None:
+                        values.append(scalar)
+                    pos += length
+                else:
+                    pos = _skip_field(record, pos, key & 7)
+        else:
+            pos = _skip_field(record, pos, wire_type)
+
+    if values is None:
+        return None
+    return wall_time, step, values
+
+
+def iter_scalar_events(
+    event_file: str,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    on_summary: Optional[Callable[[float, int], None]] = None,
+) -> Iterator[ScalarEvent]:
+    """Stream the scalar data points of a TensorBoard event file in file order.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate deciding which tags to decode.
+        on_summary (Optional[Callable[[float, int], None]]): Called with the wall time and step
+            of every summary event, including events without values passing the filter.
+
+    Yields:
+        ScalarEvent: One entry per scalar value.
+    """
+    with open(event_file, "rb") as file:
+        for _, event in _iter_events(file, 0, tag_filter, on_summary is not None):
+            if event is None:
+                continue
+            wall_time, step, values = event
+            if on_summary is not None:
+                on_summary(wall_time, step)
+            for tag, value in values:
+                yield ScalarEvent(tag, step, wall_time, value)
+
+
+def _head_digest(file: BinaryIO, offset: int) -> str:
+    file.seek(0)
+    return hashlib.sha1(file.read(min(offset, HEAD_BYTES))).hexdigest()
+
+
+def resume_last_scalars(
+    event_file: str,
+    state: Optional[ReadState] = None,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    timing: bool = False,
+) -> ReadState:
+    """Read the last value of every scalar tag, resuming after a previous read if possible.
+
+    Event files are append-only, so if the file did not shrink and its head is unchanged,
+    only the records after ``state.offset`` are decoded. Otherwise the file is read from
+    the start.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        state (Optional[ReadState]): State returned by a previous read of the same file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate deciding which tags to decode.
+        timing (bool): Also track the first and last wall time and step of all summary events
+            as ``TIMING_FIELDS`` prefixed with ``TIMING_PREFIX`` in the metrics.
+
+    Returns:
+        ReadState: The last value per tag, the step of the last scalar, and the offset
+        right after the last complete record.
+    """
+    metrics = {}
+    last_step = None
+    offset = 0
+    with open(event_file, "rb") as file:
+        if (
+            state is not None
+            and os.fstat(file.fileno()).st_size >= state.offset
+            and _head_digest(file, state.offset) == state.head
+        ):
+            metrics = dict(state.metrics)
+            last_step = state.last_step
+            offset = state.offset
+
+        tracker = TimingTracker(metrics) if timing else None
+        for offset, event in _iter_events(file, offset, tag_filter, timing):
+            if event is None:
+                continue
+            wall_time, step, values = event
+            if tracker is not None:
+                tracker.update(wall_time, step)
+            for tag, value in values:
+                metrics[tag] = value
+                last_step = step
+
+        if tracker is not None:
+            tracker.store(metrics)
+        return ReadState(metrics, last_step, offset, _head_digest(file, offset))
+
+
+def read_last_scalars(event_file: str, tag_filter: Optional[Callable[[str], bool]] = None, timing: bool = False) -> Tuple[Dict[str, float], Optional[int]]:
+    """Read the last value of every scalar tag in a single streaming pass.
+
+    Memory usage is proportional to the number of tags, not to the size of the file.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate deciding which tags to decode.
+        timing (bool): Also track the timing fields (see ``resume_last_scalars``).
+
+    Returns:
+        Tuple[Dict[str, float], Optional[int]]: The last value per tag and the step of
+        the last scalar in the file (None if the file contains no scalars).
+    """
+    state = resume_last_scalars(event_file, tag_filter=tag_filter, timing=timing)
+    return state.metrics, state.last_step
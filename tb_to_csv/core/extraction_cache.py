@@ -0,0 +1,224 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from tb_to_csv.core.event_reader import ReadState
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_CACHE_FILE = ".tb_to_csv_cache.json"
+CACHE_VERSION = 2
+
+
+def file_identity(path: str) -> Tuple[int, int, int]:
+    """Return the (size, mtime in ns, inode) triple identifying the current state of a file.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        Tuple[int, int, int]: Size, modification time and inode of the file.
+    """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class ExtractionCache:
+    """On-disk cache of ``extract_metrics`` results keyed by file identity.
+
+    Entries are keyed by the reader, the tag filter, the reductions and the absolute path of the event file and are only
+    valid while the file's size, mtime and inode are unchanged. Entries written by the
+    native reader also record how far the file was read, so a file that was appended to
+    can be resumed instead of re-read. When the cache holds more than ``max_entries``
+    entries, the least recently used ones are evicted on save.
+
+    Several processes, e.g. the jobs of a sharded sweep, may share a cache file. Saving
+    merges the entries other processes saved in the meantime, under a lock where ``fcntl``
+    is available.
+
+    Args:
+        path (str): Path to the JSON cache file.
+        max_entries (int): Maximum number of entries kept in the cache file.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._clock = 0
+        # Keys of the entries written by this process
+        self._updated = set()
+        self.entries = self._read_entries()
+        self._clock = max((entry["last_used"] for entry in self.entries.values()), default=0)
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            print(f"⚠️  Could not read cache {self.path} ({error}). Starting with an empty cache.")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    @staticmethod
+    def _key(event_file: str, reader: str, tag_filter: Optional[Callable[[str], bool]], reductions: Optional[List[str]] = None, timing: bool = False) -> str:
+        if timing:
+            reader = f"{reader}+timing"
+        if reductions:
+            return f"{reader}:{tag_filter!r}:{list(reductions)!r}:{os.path.abspath(event_file)}"
+        return f"{reader}:{tag_filter!r}:{os.path.abspath(event_file)}"
+
+    def get(
+        self,
+        event_file: str,
+        reader: str,
+        identity: Tuple[int, int, int],
+        tag_filter: Optional[Callable[[str], bool]] = None,
+        reductions: Optional[List[str]] = None,
+        timing: bool = False,
+    ) -> Optional[Tuple[Dict[str, float], Optional[int]]]:
+        """Look up the cached extraction result of an event file.
+
+        Args:
+            event_file (str): Path to the TensorBoard event file.
+            reader (str): Backend used to read the file.
+            identity (Tuple[int, int, int]): Current identity of the file (see ``file_identity``).
+            tag_filter (Optional[Callable[[str], bool]]): Tag filter used for the extraction. Must have a stable ``repr``.
+            reductions (Optional[List[str]]): Reductions computed by the extraction.
+            timing (bool): Whether the extraction recorded timing fields.
+
+        Returns:
+            Optional[Tuple[Dict[str, float], Optional[int]]]: The cached metrics and last step,
+            or None if the file is not cached or changed since it was cached.
+        """
+        entry = self.entries.get(self._key(event_file, reader, tag_filter, reductions, timing))
+        if entry is None or tuple(entry["identity"]) != identity:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._clock += 1
+        entry["last_used"] = self._clock
+        return entry["metrics"], entry["last_step"]
+
+    def get_resume_state(
+        self,
+        event_file: str,
+        reader: str,
+        identity: Tuple[int, int, int],
+        tag_filter: Optional[Callable[[str], bool]] = None,
+        reductions: Optional[List[str]] = None,
+        timing: bool = False,
+    ) -> Optional[ReadState]:
+        """Look up the state of a previous read of a file that has since been appended to.
+
+        Args:
+            event_file (str): Path to the TensorBoard event file.
+            reader (str): Backend used to read the file.
+            identity (Tuple[int, int, int]): Current identity of the file (see ``file_identity``).
+            tag_filter (Optional[Callable[[str], bool]]): Tag filter used for the extraction.
+            reductions (Optional[List[str]]): Reductions computed by the extraction.
+            timing (bool): Whether the extraction recorded timing fields.
+
+        Returns:
+            Optional[ReadState]: The state to resume from, or None if the file is unknown,
+            was replaced (different inode) or shrank.
+        """
+        entry = self.entries.get(self._key(event_file, reader, tag_filter, reductions, timing))
+        if entry is None or entry.get("offset") is None:
+            return None
+        size, _, inode = identity
+        if inode != entry["identity"][2] or size < entry["offset"]:
+            return None
+        return ReadState(entry["metrics"], entry["last_step"], entry["offset"], entry["head"])
+
+    def put(
+        self,
+        event_file: str,
+        reader: str,
+        identity: Tuple[int, int, int],
+        metrics: Dict[str, float],
+        last_step: Optional[int],
+        offset: Optional[int] = None,
+        head: Optional[str] = None,
+        tag_filter: Optional[Callable[[str], bool]] = None,
+        reductions: Optional[List[str]] = None,
+        timing: bool = False,
+    ) -> None:
+        """Store the extraction result of an event file.
+
+        Args:
+            event_file (str): Path to the TensorBoard event file.
+            reader (str): Backend used to read the file.
+            identity (Tuple[int, int, int]): Identity of the file before it was read.
+            metrics (Dict[str, float]): Extracted metrics.
+            last_step (Optional[int]): Last step in the file.
+            offset (Optional[int]): Offset right after the last complete record that was read.
+            head (Optional[str]): Digest of the beginning of the file (see ``ReadState``).
+            tag_filter (Optional[Callable[[str], bool]]): Tag filter used for the extraction.
+            reductions (Optional[List[str]]): Reductions computed by the extraction.
+            timing (bool): Whether the extraction recorded timing fields.
+        """
+        self._clock += 1
+        key = self._key(event_file, reader, tag_filter, reductions, timing)
+        self._updated.add(key)
+        self.entries[key] = {
+            "identity": list(identity),
+            "metrics": metrics,
+            "last_step": last_step,
+            "offset": offset,
+            "head": head,
+            "last_used": self._clock,
+        }
+
+    def save(self) -> None:
+        """Merge the entries saved by other processes, evict the least recently used entries
+        beyond ``max_entries`` and write the cache file atomically.
+
+        Entries written by this process replace those on disk. Other entries on disk are kept,
+        since another process may have updated them after this cache was loaded.
+        """
+        with self._lock():
+            entries = self._read_entries()
+            for key, entry in self.entries.items():
+                if key in self._updated or key not in entries:
+                    entries[key] = entry
+                else:
+                    entries[key]["last_used"] = max(entries[key]["last_used"], entry["last_used"])
+            if len(entries) > self.max_entries:
+                keep = sorted(entries, key=lambda key: entries[key]["last_used"], reverse=True)[:self.max_entries]
+                entries = {key: entries[key] for key in keep}
+
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(self.path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path)))
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump({"version": CACHE_VERSION, "entries": entries}, file)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        self.entries = entries
+        self._updated.clear()
+        self._clock = max((entry["last_used"] for entry in entries.values()), default=0)
+
+    @contextmanager
+    def _lock(self):
+        # Serializes the read-merge-write of save() across processes sharing the cache file
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,7 +1,110 @@
+import re
+from functools import lru_cache
+from tb_to_csv.core.event_reader import TIMING_PREFIX
+
+_GLOB_CHARS = frozenset("*?")
+
+
+class PrefixMatcher:
+    """Compiled matcher assigning tags to the category of their prefix.
+
+    All prefixes are compiled into a single regular expression once per prefix mapping.
+    Prefixes may be nested ('ood' and 'ood/cifar10') and may contain glob segments, where
+    '*' and '?' match within a single path segment (e.g. 'ood/*/' matches 'ood/svhn/AUROC').
+    A tag matching several prefixes is assigned to the most specific one: the prefix with the
+    most segments, then the most literal segments, then the first one in the mapping.
+
+    The metric name is the tag without the literal leading segments of its prefix. Segments
+    matched by a glob are kept, so 'ood/*' turns 'ood/svhn/AUROC' into 'svhn/AUROC'.
+
+    Args:
+        prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
+    """
+
+    def __init__(self, prefix_mapping):
+        if isinstance(prefix_mapping, list):
+            pairs = [(prefix, prefix) for prefix in prefix_mapping]
+        elif isinstance(prefix_mapping, dict):
+            pairs = list(prefix_mapping.items())
+        else:
+            raise ValueError("prefix_mapping must be a list or a dictionary.")
+
+        self.categories = list(dict.fromkeys(category for _, category in pairs))
+        self.prefixes = tuple(sorted(f"{prefix.strip('/')}/" for prefix, _ in pairs))
+
+        entries = []
+        for order, (prefix, category) in enumerate(pairs):
+            segments = prefix.strip("/").split("/")
+            literal = 0
+            while literal < len(segments) and not _GLOB_CHARS.intersection(segments[literal]):
+                literal += 1
+            entries.append((-len(segments), -literal, order, segments, literal, category))
+        entries.sort(key=lambda entry: entry[:3])
+
+        alternatives = []
+        self._matches = []
+        for index, (_, _, _, segments, literal, category) in enumerate(entries):
+            pattern = "".join(f"{_segment_pattern(segment)}/" for segment in segments)
+            alternatives.append(f"(?P<p{index}>{pattern})")
+            head_length = sum(len(segment) + 1 for segment in segments[:literal])
+            self._matches.append((category, head_length))
+        self.pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, tag):
+        """
+        Find the category of a tag.
+
+        Args:
+            tag (str): The tag to match.
+
+        Returns:
+            Optional[Tuple[str, str]]: The category and the metric name, or None if no prefix matches.
+        """
+        if self.pattern is None:
+            return None
+        match = self.pattern.match(tag)
+        if match is None:
+            return None
+        category, head_length = self._matches[int(match.lastgroup[1:])]
+        return category, tag[head_length:]
+
+
+def _segment_pattern(segment):
+    if segment == "*":
+        return "[^/]+"
+    return "".join("[^/]*" if char == "*" else "[^/]" if char == "?" else re.escape(char) for char in segment)
+
+
+@lru_cache(maxsize=64)
+def _compile_prefix_matcher(kind, pairs):
+    return PrefixMatcher(list(pairs) if kind is list else dict(pairs))
+
+
+def prefix_matcher(prefix_mapping):
+    """
+    Get the compiled matcher of a prefix mapping. Matchers are cached, so repeated calls with
+    the same mapping (e.g. once per run) compile it only once.
+
+    Args:
+        prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
+
+    Returns:
+        PrefixMatcher: The compiled matcher.
+    """
+    if isinstance(prefix_mapping, list):
+        return _compile_prefix_matcher(list, tuple(prefix_mapping))
+    if isinstance(prefix_mapping, dict):
+        return _compile_prefix_matcher(dict, tuple(prefix_mapping.items()))
+    raise ValueError("prefix_mapping must be a list or a dictionary.")
+
+
 def categorize_metrics(metrics, prefix_mapping):
     """
     Categorize metrics into categories based on the prefix mapping.
 
+    Each metric is assigned to the category of its most specific matching prefix (see
+    ``PrefixMatcher``). Metrics without a matching prefix are dropped.
+
     Args:
         metrics (Dict[str, float]): Dictionary of metric names and values.
         prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
@@ -9,21 +112,125 @@ def categorize_metrics(metrics, prefix_mapping):
     Returns:
         Dict[str, Dict[str, float]]: Categorized metrics.
     """
-    if isinstance(prefix_mapping, list):
-        # Use the prefix directly as the category
-        categorized_metrics = {prefix: {} for prefix in prefix_mapping}
-        for key, value in metrics.items():
-            for prefix in prefix_mapping:
-                if key.startswith(f"{prefix}/"):
-                    categorized_metrics[prefix][key.replace(f"{prefix}/", "")] = value
-    elif isinstance(prefix_mapping, dict):
-        # Use the dictionary values as the category
-        categorized_metrics = {category: {} for category in prefix_mapping.values()}
-        for key, value in metrics.items():
-            for prefix, category in prefix_mapping.items():
-                if key.startswith(f"{prefix}/"):
-                    categorized_metrics[category][key.replace(f"{prefix}/", "")] = value
-    else:
-        raise ValueError("prefix_mapping must be a list or a dictionary.")
+    matcher = prefix_matcher(prefix_mapping)
+    categorized_metrics = {category: {} for category in matcher.categories}
+    for key, value in metrics.items():
+        match = matcher.match(key)
+        if match is not None:
+            category, metric_key = match
+            categorized_metrics[category][metric_key] = value
+
+    return categorized_metrics
+
+
+TIMING_COLUMNS = ("duration", "steps", "steps_per_second")
+
+
+def timing_columns(fields):
+    """
+    Derive the training duration and throughput of a run from its timing fields.
 
+    Args:
+        fields (Dict[str, float]): 'first_wall_time', 'last_wall_time', 'first_step' and 'last_step'.
+
+    Returns:
+        Dict[str, float]: 'duration' in seconds between the first and last summary event, the
+        number of 'steps' between them and 'steps_per_second'. Throughput is omitted if the
+        duration is zero, e.g. for runs with a single event.
+    """
+    duration = fields["last_wall_time"] - fields["first_wall_time"]
+    steps = fields["last_step"] - fields["first_step"]
+    columns = {"duration": duration, "steps": steps}
+    if duration > 0:
+        columns["steps_per_second"] = steps / duration
+    return columns
+
+
+def has_metrics(metrics):
+    """Whether extraction found any metric besides the timing fields."""
+    return any(not key.startswith(TIMING_PREFIX) for key in metrics)
+
+
+def categorize_run(metrics, prefix_mapping):
+    """
+    Categorize the metrics of a run and add its timing columns to every non-empty category.
+
+    Timing fields are the keys starting with ``TIMING_PREFIX`` that extraction adds when
+    timing is enabled. A timing column is skipped with a warning in categories that contain a
+    logged metric of the same name (e.g. 'train/steps'). ``metrics`` is not modified, since it
+    may be shared with the cache.
+
+    Args:
+        metrics (Dict[str, float]): Dictionary of metric names and values.
+        prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Categorized metrics.
+    """
+    fields = {key[len(TIMING_PREFIX):]: value for key, value in metrics.items() if key.startswith(TIMING_PREFIX)}
+    if not fields:
+        return categorize_metrics(metrics, prefix_mapping)
+
+    categorized_metrics = categorize_metrics(
+        {key: value for key, value in metrics.items() if not key.startswith(TIMING_PREFIX)}, prefix_mapping
+    )
+    columns = timing_columns(fields)
+    for category, category_metrics in categorized_metrics.items():
+        if not category_metrics:
+            continue
+        for column, value in columns.items():
+            if column in category_metrics:
+                # A logged metric of the same name takes precedence over the timing column
+                _warn_timing_collision(category, column)
+            else:
+                category_metrics[column] = value
     return categorized_metrics
+
+
+@lru_cache(maxsize=None)
+def _warn_timing_collision(category, column):
+    # Cached so that the warning is printed once per category and column, not once per run
+    print(f"⚠️ Category '{category}' has a logged metric '{column}'. Skipping the timing column of the same name.")
+
+
+class TagFilter:
+    """Predicate accepting only the tags that can match a prefix mapping.
+
+    Used to skip tags during extraction that ``categorize_metrics`` would drop anyway.
+    Unlike a lambda it can be sent to worker processes and has a stable ``repr``, which
+    is used as part of extraction cache keys.
+
+    Args:
+        prefix_mapping (List[str] or Dict[str, str]): Mapping of prefixes to categories.
+    """
+
+    def __init__(self, prefix_mapping):
+        self.matcher = prefix_matcher(prefix_mapping)
+        self.prefixes = self.matcher.prefixes
+
+    def __call__(self, tag):
+        return self.matcher.pattern is not None and self.matcher.pattern.match(tag) is not None
+
+    def __repr__(self):
+        return f"TagFilter({list(self.prefixes)})"
+
+    def __eq__(self, other):
+        return isinstance(other, TagFilter) and self.prefixes == other.prefixes
+
+    def __hash__(self):
+        return hash(self.prefixes)
+
+
+def build_tag_filter(prefix_mapping):
+    """
+    Build the tag filter matching a prefix mapping.
+
+    Args:
+        prefix_mapping (Optional[List[str] or Dict[str, str]]): Mapping of prefixes to categories.
+
+    Returns:
+        Optional[TagFilter]: The tag filter, or None if all tags are needed.
+    """
+    if not prefix_mapping:
+        return None
+    return TagFilter(prefix_mapping)
@@ -0,0 +1,241 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+
+def _import_pandas():
+    # pandas is optional and only needed to convert reports to DataFrames
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("❌ Converting reports to DataFrames requires pandas. Install it with `pip install tb-to-csv[pandas]`.")
+    return pandas
+
+
+class MetricStore:
+    """Columnar store of the metric values of all runs.
+
+    Each row is a run of a model and each column a (category, metric) pair. Model names and
+    columns are interned, rows refer to their model by index, and all values live in a single
+    float64 matrix with NaN for metrics a run did not log.
+
+    Attributes:
+        models (List[str]): Interned model names in order of first appearance.
+        columns (List[Tuple[str, str]]): Interned (category, metric) columns in order of first appearance.
+        run_names (List[str]): Run name of each row.
+    """
+
+    def __init__(self):
+        self.models: List[str] = []
+        self.columns: List[Tuple[str, str]] = []
+        self.run_names: List[str] = []
+        self._model_index: Dict[str, int] = {}
+        self._column_index: Dict[Tuple[str, str], int] = {}
+        self._row_index: Dict[Tuple[str, str], int] = {}
+        self._row_models = array("l")
+        # Values are collected as (row, column, value) triplets and densified on demand
+        self._entry_rows = array("l")
+        self._entry_columns = array("l")
+        self._entry_values = array("d")
+        self._values: Optional[np.ndarray] = None
+        self._has_overwrites = False
+
+    def add_model(self, model_key: str) -> int:
+        """Intern a model name, even if it has no runs yet.
+
+        Args:
+            model_key (str): Name of the model.
+
+        Returns:
+            int: Index of the model in ``models``.
+        """
+        model = self._model_index.get(model_key)
+        if model is None:
+            model = self._model_index[model_key] = len(self.models)
+            self.models.append(model_key)
+        return model
+
+    def add_run(self, model_key: str, run_name: str, categorized_metrics: Dict[str, Dict[str, float]]) -> None:
+        """Add the categorized metrics of a run. Adding the same run twice overwrites its values.
+
+        Args:
+            model_key (str): Name of the model the run belongs to.
+            run_name (str): Name of the run.
+            categorized_metrics (Dict[str, Dict[str, float]]): Metric values per category.
+        """
+        model = self.add_model(model_key)
+        row = self._row_index.get((model_key, run_name))
+        if row is None:
+            row = self._row_index[(model_key, run_name)] = len(self.run_names)
+            self.run_names.append(run_name)
+            self._row_models.append(model)
+        else:
+            self._has_overwrites = True
+
+        for category, metrics in categorized_metrics.items():
+            for metric_key, value in metrics.items():
+                column = self._column_index.get((category, metric_key))
+                if column is None:
+                    column = self._column_index[(category, metric_key)] = len(self.columns)
+                    self.columns.append((category, metric_key))
+                self._entry_rows.append(row)
+                self._entry_columns.append(column)
+                self._entry_values.append(value)
+        self._values = None
+
+    @property
+    def row_models(self) -> np.ndarray:
+        """Model index of each row."""
+        return np.frombuffer(self._row_models, dtype=self._row_models.typecode).astype(np.intp)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Dense (runs × columns) float64 matrix of metric values with NaN for missing values."""
+        if self._values is None:
+            values = np.full((len(self.run_names), len(self.columns)), np.nan)
+            rows = np.frombuffer(self._entry_rows, dtype=self._entry_rows.typecode)
+            columns = np.frombuffer(self._entry_columns, dtype=self._entry_columns.typecode)
+            entries = np.frombuffer(self._entry_values)
+            if self._has_overwrites:
+                # Keep only the last entry of every cell
+                cells = rows * len(self.columns) + columns
+                _, first_from_end = np.unique(cells[::-1], return_index=True)
+                last = len(cells) - 1 - first_from_end
+                rows, columns, entries = rows[last], columns[last], entries[last]
+            values[rows, columns] = entries
+            self._values = values
+        return self._values
+
+    def model_rows(self) -> List[np.ndarray]:
+        """Row indices of each model's runs, in the order of ``models``."""
+        row_models = self.row_models
+        return [np.flatnonzero(row_models == model) for model in range(len(self.models))]
+
+    def run_table(self) -> "ReportTable":
+        """Build a report table with one row per run, named 'model/run'."""
+        row_models = self.row_models
+        row_names = [f"{self.models[model]}/{run_name}" for model, run_name in zip(row_models, self.run_names)]
+        return ReportTable(row_names, self.columns, self.values)
+
+    def to_model_metrics(self) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """Convert to nested ``model -> category -> metric -> run -> value`` dictionaries."""
+        model_metrics = {model_key: {} for model_key in self.models}
+        values = self.values
+        for row, (model, run_name) in enumerate(zip(self.row_models, self.run_names)):
+            categories = model_metrics[self.models[model]]
+            for column in np.flatnonzero(~np.isnan(values[row])):
+                category, metric_key = self.columns[column]
+                categories.setdefault(category, {}).setdefault(metric_key, {})[run_name] = float(values[row, column])
+        return model_metrics
+
+    @classmethod
+    def from_model_metrics(cls, model_metrics: Dict[str, Dict[str, Dict[str, Dict[str, float]]]]) -> "MetricStore":
+        """Build a store from nested ``model -> category -> metric -> run -> value`` dictionaries."""
+        store = cls()
+        for model_key, categories in model_metrics.items():
+            runs = {}
+            for category, metrics in categories.items():
+                for metric_key, run_results in metrics.items():
+                    for run_name, value in run_results.items():
+                        runs.setdefault(run_name, {}).setdefault(category, {})[metric_key] = value
+            store.add_model(model_key)
+            for run_name, categorized_metrics in runs.items():
+                store.add_run(model_key, run_name, categorized_metrics)
+        return store
+
+
+class ReportTable:
+    """Finalized report values: one row per model (or run), one column per (category, metric).
+
+    Args:
+        row_names (List[str]): Name of each row.
+        columns (List[Tuple[str, str]]): (category, metric) of each column.
+        values (np.ndarray): (rows × columns) values, or means when ``margins`` is given. NaN marks missing values.
+        margins (Optional[np.ndarray]): (rows × columns) confidence interval margins, if aggregated.
+        lower (Optional[np.ndarray]): (rows × columns) lower bounds of asymmetric (bootstrap) confidence intervals.
+        upper (Optional[np.ndarray]): (rows × columns) upper bounds of asymmetric (bootstrap) confidence intervals.
+    """
+
+    def __init__(
+        self,
+        row_names: List[str],
+        columns: List[Tuple[str, str]],
+        values: np.ndarray,
+        margins: Optional[np.ndarray] = None,
+        lower: Optional[np.ndarray] = None,
+        upper: Optional[np.ndarray] = None,
+    ):
+        self.row_names = row_names
+        self.columns = columns
+        self.values = values
+        self.margins = margins
+        self.lower = lower
+        self.upper = upper
+
+    def to_model_metrics(self, combine_columns: bool = True) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Format the table as nested ``row -> category -> column -> value`` dictionaries for the CSV writer.
+
+        Args:
+            combine_columns (bool): Whether to combine mean and CI into one "mean ±margin" column
+                (or "mean [lower, upper]" for asymmetric intervals).
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: Formatted values per row and category. Missing values are omitted.
+        """
+        formatted = {}
+        present = ~np.isnan(self.values)
+        for row, row_name in enumerate(self.row_names):
+            categories = formatted[row_name] = {}
+            for column in np.flatnonzero(present[row]):
+                category, metric_key = self.columns[column]
+                metrics = categories.setdefault(category, {})
+                value = float(self.values[row, column])
+                if self.lower is not None:
+                    lower, upper = float(self.lower[row, column]), float(self.upper[row, column])
+                    if combine_columns:
+                        metrics[metric_key] = f"{value:.3f} [{lower:.3f}, {upper:.3f}]"
+                    else:
+                        metrics[f"{metric_key} Mean"] = f"{value:.3f}"
+                        metrics[f"{metric_key} CI Lower"] = f"{lower:.3f}"
+                        metrics[f"{metric_key} CI Upper"] = f"{upper:.3f}"
+                    continue
+                if self.margins is None:
+                    metrics[metric_key] = value
+                    continue
+                margin = float(self.margins[row, column])
+                if combine_columns:
+                    metrics[metric_key] = f"{value:.3f} ±{margin:.3f}"
+                else:
+                    metrics[f"{metric_key} Mean"] = f"{value:.3f}"
+                    metrics[f"{metric_key} ± CI"] = f"{margin:.3f}"
+        return formatted
+
+    def to_pandas(self):
+        """Convert the table to a long-format pandas DataFrame with one row per present value.
+
+        The columns are 'model' (and 'run' for per-run tables), 'category', 'metric' and
+        'value', followed by 'margin', or 'lower' and 'upper', if the table holds confidence
+        intervals. Pivot it for wide views, e.g. ``df.pivot(index="model", columns="metric", values="value")``.
+
+        Returns:
+            pandas.DataFrame: The values of the table.
+
+        Raises:
+            ImportError: If pandas is not installed.
+        """
+        pd = _import_pandas()
+        rows, columns = np.nonzero(~np.isnan(self.values))
+        # Per-run tables name their rows 'model/run'
+        row_models, _, row_runs = zip(*(row_name.partition("/") for row_name in self.row_names)) if self.row_names else ((), (), ())
+        data = {"model": [row_models[row] for row in rows]}
+        if any(row_runs):
+            data["run"] = [row_runs[row] for row in rows]
+        data["category"] = [self.columns[column][0] for column in columns]
+        data["metric"] = [self.columns[column][1] for column in columns]
+        data["value"] = self.values[rows, columns]
+        if self.lower is not None:
+            data["lower"] = self.lower[rows, columns]
+            data["upper"] = self.upper[rows, columns]
+        elif self.margins is not None:
+            data["margin"] = self.margins[rows, columns]
+        return pd.DataFrame(data)
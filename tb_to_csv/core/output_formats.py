@@ -0,0 +1,181 @@
+import os
+from typing import Dict, List, Optional, Union
+import numpy as np
+from tb_to_csv.core.csv_writer import order_metric_keys
+from tb_to_csv.core.metric_store import ReportTable
+
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def _import_pyarrow():
+    # pyarrow is optional and slow to import, so it is only loaded when columnar output is written
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("❌ Columnar output formats require pyarrow. Install it with `pip install tb-to-csv[parquet]`.")
+    return pyarrow
+
+
+def output_file_name(csv_file_name: str, output_format: str) -> str:
+    """Replace the '.csv' extension of an output file name with the one of the output format.
+
+    Args:
+        csv_file_name (str): File name as used for CSV output (e.g. 'test_metrics.csv').
+        output_format (str): One of ``OUTPUT_FORMATS``.
+
+    Returns:
+        str: The file name for the output format.
+    """
+    if output_format == "csv":
+        return csv_file_name
+    base, ext = os.path.splitext(csv_file_name)
+    return (base if ext == ".csv" else csv_file_name) + _EXTENSIONS[output_format]
+
+
+def split_report_columns(table: ReportTable, prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]]) -> Dict[str, List[int]]:
+    """Assign the columns of a report table to output files, like ``build_csv_tables`` does for CSV files.
+
+    Args:
+        table (ReportTable): The finalized report.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Mapping of prefixes to file names or a list of prefixes.
+
+    Returns:
+        Dict[str, List[int]]: Column indices per output CSV file name.
+    """
+    if not prefix_file_mapping:
+        return {"all_metrics.csv": list(range(len(table.columns)))}
+
+    if isinstance(prefix_file_mapping, list):
+        category_files = {prefix: f"{prefix}_metrics.csv" for prefix in prefix_file_mapping}
+    else:
+        category_files = {file_name: file_name for file_name in prefix_file_mapping.values()}
+
+    file_columns = {file_name: [] for file_name in category_files.values()}
+    for column, (category, _) in enumerate(table.columns):
+        if category in category_files:
+            file_columns[category_files[category]].append(column)
+    return file_columns
+
+
+def report_to_arrow(
+    table: ReportTable,
+    columns: List[int],
+    model_name_mapping: Optional[Dict[str, str]] = None,
+    model_sort_order: Optional[List[str]] = None,
+    metric_name_mapping: Optional[Dict[str, str]] = None,
+    metric_sort_order: Optional[List[str]] = None,
+):
+    """Convert columns of a report table to an Arrow table.
+
+    Model (and, for per-run reports, run) names are dictionary-encoded string columns. Every
+    metric is a float64 column, followed by a '<metric> ± CI' float64 column if the report
+    holds confidence intervals, or '<metric> CI Lower' and '<metric> CI Upper' columns for
+    bootstrap intervals. Missing values are nulls. Models and metrics are selected,
+    ordered and renamed the same way as in the CSV output.
+
+    Args:
+        table (ReportTable): The finalized report.
+        columns (List[int]): Indices of the report columns to convert.
+        model_name_mapping (Optional[Dict[str, str]]): Mapping of model directory names to display names.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models. Only these models are kept.
+        metric_name_mapping (Optional[Dict[str, str]]): Mapping of metric keys to display names.
+        metric_sort_order (Optional[List[str]]): Custom sorting order for metrics.
+
+    Returns:
+        pyarrow.Table: The converted table.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If two columns would get the same name, e.g. metrics of the same name from
+            categories sharing an output file, or metrics mapped to the same display name.
+    """
+    pa = _import_pyarrow()
+
+    # Per-run reports name their rows 'model/run'
+    row_models, _, row_runs = zip(*(row_name.partition("/") for row_name in table.row_names)) if table.row_names else ((), (), ())
+    rows = list(range(len(table.row_names)))
+    if model_sort_order:
+        rank = {model_key: index for index, model_key in enumerate(model_sort_order)}
+        rows = sorted((row for row in rows if row_models[row] in rank), key=lambda row: rank[row_models[row]])
+
+    model_name_mapping = model_name_mapping or {}
+    metric_name_mapping = metric_name_mapping or {}
+    arrays = {"model": pa.array([model_name_mapping.get(row_models[row], row_models[row]) for row in rows], pa.string()).dictionary_encode()}
+    if any(row_runs):
+        arrays["run"] = pa.array([row_runs[row] for row in rows], pa.string()).dictionary_encode()
+
+    metric_columns = {}
+    for column in columns:
+        category, metric_key = table.columns[column]
+        if metric_key in metric_columns:
+            other_category = table.columns[metric_columns[metric_key]][0]
+            raise ValueError(f"❌ Categories '{other_category}' and '{category}' both have a metric '{metric_key}'. Write them to different output files.")
+        metric_columns[metric_key] = column
+    for metric_key in order_metric_keys(metric_columns, metric_sort_order):
+        column = metric_columns[metric_key]
+        name = metric_name_mapping.get(metric_key, metric_key)
+        if name in arrays:
+            raise ValueError(f"❌ Metric '{metric_key}' is mapped to '{name}', which is already the name of another column.")
+        values = table.values[rows, column]
+        arrays[name] = pa.array(values, pa.float64(), mask=np.isnan(values))
+        if table.lower is not None:
+            arrays[f"{name} CI Lower"] = pa.array(table.lower[rows, column], pa.float64(), mask=np.isnan(values))
+            arrays[f"{name} CI Upper"] = pa.array(table.upper[rows, column], pa.float64(), mask=np.isnan(values))
+        elif table.margins is not None:
+            margins = table.margins[rows, column]
+            arrays[f"{name} ± CI"] = pa.array(margins, pa.float64(), mask=np.isnan(values))
+    return pa.table(arrays)
+
+
+def save_report(
+    table: ReportTable,
+    output_dir: str,
+    prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]],
+    output_format: str,
+    compression: Optional[str] = None,
+    model_name_mapping: Optional[Dict[str, str]] = None,
+    model_sort_order: Optional[List[str]] = None,
+    metric_name_mapping: Optional[Dict[str, str]] = None,
+    metric_sort_order: Optional[List[str]] = None,
+) -> List[str]:
+    """Save a report table as one columnar file per output file of the prefix mapping.
+
+    Args:
+        table (ReportTable): The finalized report.
+        output_dir (str): Directory the files are written to.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Mapping of prefixes to file names or a list of prefixes.
+        output_format (str): "parquet" or "feather" (Arrow IPC).
+        compression (Optional[str]): Compression codec (e.g. "zstd", "lz4", "snappy"). Uses the pyarrow default if None.
+        model_name_mapping (Optional[Dict[str, str]]): Mapping of model directory names to display names.
+        model_sort_order (Optional[List[str]]): Custom sorting order for models.
+        metric_name_mapping (Optional[Dict[str, str]]): Mapping of metric keys to display names.
+        metric_sort_order (Optional[List[str]]): Custom sorting order for metrics.
+
+    Returns:
+        List[str]: Paths of the written files.
+
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    if output_format not in _EXTENSIONS:
+        raise ValueError(f"Unknown output format '{output_format}'. Must be one of {OUTPUT_FORMATS}.")
+
+    written = []
+    for file_name, columns in split_report_columns(table, prefix_file_mapping).items():
+        path = os.path.join(output_dir, output_file_name(file_name, output_format))
+        if not columns:
+            print(f"⚠️  No metrics found. Skipping {path}.")
+            continue
+        arrow_table = report_to_arrow(table, columns, model_name_mapping, model_sort_order, metric_name_mapping, metric_sort_order)
+        if output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(arrow_table, path, compression=compression or "snappy")
+        else:
+            import pyarrow.feather as feather
+
+            feather.write_feather(arrow_table, path, compression=compression)
+        written.append(path)
+        print(f"✅ Saved {path} with {arrow_table.num_rows} rows.")
+    return written
@@ -0,0 +1,146 @@
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from tb_to_csv.core.event_file_utils import extract_metrics_incremental, peak_rss_mib
+from tb_to_csv.core.event_reader import READ_COUNTERS, ReadState
+
+PROFILE_FILE = "profile.json"
+
+
+def profile_extraction(
+    event_file: str,
+    reader: str = "native",
+    state: Optional[ReadState] = None,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    timing: bool = False,
+) -> Tuple[ReadState, Dict[str, Any]]:
+    """Run ``extract_metrics_incremental`` and measure it.
+
+    Runs in the worker process that reads the file, so the timings and counters only cover
+    that file. Records are only counted by the native reader; for the accumulator the bytes
+    read are the size of the file and the record count is None.
+
+    Returns:
+        Tuple[ReadState, Dict[str, Any]]: The read state and the measurements of the file.
+    """
+    records, read_bytes = READ_COUNTERS.records, READ_COUNTERS.bytes
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    result = extract_metrics_incremental(event_file, reader, state, tag_filter, bounded_memory, report_memory, reductions, timing)
+    stats = {
+        "wall_time": time.perf_counter() - start_wall,
+        "cpu_time": time.process_time() - start_cpu,
+        "bytes_read": READ_COUNTERS.bytes - read_bytes,
+        "records": READ_COUNTERS.records - records,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+    if reader != "native":
+        stats["bytes_read"] = os.path.getsize(event_file)
+        stats["records"] = None
+    return result, stats
+
+
+class Profiler:
+    """Collects per-stage and per-file measurements of a run.
+
+    Stages record their wall time, the CPU time of this process and the peak RSS at their
+    end. Stages that read event files also total the measurements of their files. Worker
+    processes report the CPU time and peak RSS of the worker that read each file.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the block as the stage ``name``."""
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        files_before = len(self.files)
+        try:
+            yield
+        finally:
+            stage = {
+                "wall_time": time.perf_counter() - start_wall,
+                "cpu_time": time.process_time() - start_cpu,
+                "peak_rss_mib": peak_rss_mib(),
+            }
+            files = list(self.files.values())[files_before:]
+            if files:
+                stage.update(
+                    files=len(files),
+                    files_skipped=sum(1 for file in files if file["skipped"]),
+                    file_cpu_time=sum(file.get("cpu_time", 0.0) for file in files),
+                    bytes_read=sum(file.get("bytes_read", 0) for file in files),
+                    records=sum(file.get("records") or 0 for file in files),
+                )
+            self.stages[name] = stage
+
+    def add_file(self, event_file: str, stats: Optional[Dict[str, Any]] = None, skipped: Optional[str] = None) -> None:
+        """Record the measurements of an event file, or why it was skipped.
+
+        Args:
+            event_file (str): Path to the event file.
+            stats (Optional[Dict[str, Any]]): Measurements returned by ``profile_extraction``.
+            skipped (Optional[str]): Reason the file was not read or not used, e.g. 'cached'.
+        """
+        self.files[event_file] = {"path": event_file, "skipped": skipped, **(stats or {})}
+
+    def skip_file(self, event_file: str, reason: str) -> None:
+        """Mark a file that was read as skipped, e.g. because it contained no metrics."""
+        self.files.setdefault(event_file, {"path": event_file})["skipped"] = reason
+
+    def report(self) -> Dict[str, Any]:
+        """The measurements as a JSON-serializable dictionary."""
+        return {
+            "wall_time": time.perf_counter() - self._start,
+            "peak_rss_mib": peak_rss_mib(),
+            "stages": self.stages,
+            "files": list(self.files.values()),
+        }
+
+    def save(self, path: str) -> None:
+        """Write the report to a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+
+def profile_stage(profiler: Optional[Profiler], name: str):
+    """``profiler.stage(name)``, or a no-op context if profiling is disabled."""
+    return nullcontext() if profiler is None else profiler.stage(name)
+
+
+@contextmanager
+def profile_run(profile_path: Optional[str] = None, cprofile_path: Optional[str] = None) -> Iterator[Optional[Profiler]]:
+    """Profile the block if requested.
+
+    Args:
+        profile_path (Optional[str]): Write the per-stage and per-file JSON report to this path.
+        cprofile_path (Optional[str]): Write a cProfile dump of this process to this path,
+            to be inspected with ``pstats`` or snakeviz. Worker processes are not included.
+
+    Yields:
+        Optional[Profiler]: The profiler to pass to the stages, or None if no report was requested.
+    """
+    profiler = Profiler() if profile_path else None
+    cprofile = cProfile.Profile() if cprofile_path else None
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(cprofile_path)
+            print(f"✅ Saved cProfile dump {cprofile_path}.")
+        if profiler is not None:
+            profiler.save(profile_path)
+            for name, stage in profiler.stages.items():
+                print(f"⏱️  {name}: {stage['wall_time']:.3f}s wall, {stage['cpu_time']:.3f}s CPU")
+            print(f"✅ Saved profile report {profile_path}.")
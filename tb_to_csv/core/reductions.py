@@ -0,0 +1,184 @@
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+REDUCTION_KINDS = ("last", "min", "max", "step", "mean_last", "at_best")
+
+
+class Reduction(NamedTuple):
+    """A parsed reduction specification.
+
+    Specifications are written as:
+        - 'last': last logged value (the default reduction).
+        - 'min' / 'max': best value so far.
+        - 'step:<N>': value at step N, or the last value logged before it.
+        - 'mean_last:<K>': mean of the last K logged values.
+        - 'at_best:<selector tag>:<min|max>': value at the step where the selector tag was best,
+          e.g. 'at_best:val/loss:min' gives the test accuracy at the best validation loss.
+
+    Attributes:
+        spec (str): The original specification, used as the suffix of the metric name.
+        kind (str): One of ``REDUCTION_KINDS``.
+        argument (Optional[int]): Step of 'step' or window size of 'mean_last'.
+        selector (Optional[str]): Selector tag of 'at_best'.
+        mode (Optional[str]): 'min' or 'max' for 'at_best'.
+    """
+
+    spec: str
+    kind: str
+    argument: Optional[int] = None
+    selector: Optional[str] = None
+    mode: Optional[str] = None
+
+
+def parse_reduction(spec: str) -> Reduction:
+    """Parse a reduction specification such as 'max', 'step:1000' or 'at_best:val/loss:min'.
+
+    Args:
+        spec (str): The reduction specification.
+
+    Returns:
+        Reduction: The parsed reduction.
+
+    Raises:
+        ValueError: If the specification is invalid.
+    """
+    kind, _, argument = spec.partition(":")
+    if kind in ("last", "min", "max") and not argument:
+        return Reduction(spec, kind)
+    if kind in ("step", "mean_last") and argument.isdigit():
+        if kind == "mean_last" and int(argument) == 0:
+            raise ValueError(f"Invalid reduction '{spec}'. The window of 'mean_last' must be positive.")
+        return Reduction(spec, kind, argument=int(argument))
+    if kind == "at_best":
+        selector, _, mode = argument.rpartition(":")
+        if selector and mode in ("min", "max"):
+            return Reduction(spec, kind, selector=selector, mode=mode)
+    raise ValueError(
+        f"Invalid reduction '{spec}'. Must be one of 'last', 'min', 'max', 'step:<N>', "
+        "'mean_last:<K>' or 'at_best:<selector tag>:<min|max>'."
+    )
+
+
+def reduced_metric_name(tag: str, reduction: Reduction) -> str:
+    """Name of the metric holding a reduction of a tag. The 'last' reduction keeps the plain tag name."""
+    return tag if reduction.kind == "last" else f"{tag}@{reduction.spec}"
+
+
+class SelectorTagFilter:
+    """Tag filter that also accepts the selector tags of 'at_best' reductions.
+
+    Args:
+        tag_filter (Optional[Callable[[str], bool]]): Filter for the reduced tags. Accepts all tags if None.
+        selectors (Iterable[str]): Selector tags that must be read even if the filter rejects them.
+    """
+
+    def __init__(self, tag_filter: Optional[Callable[[str], bool]], selectors: Iterable[str]):
+        self.tag_filter = tag_filter
+        self.selectors = frozenset(selectors)
+
+    def __call__(self, tag: str) -> bool:
+        return tag in self.selectors or self.tag_filter is None or self.tag_filter(tag)
+
+    def __repr__(self) -> str:
+        return f"SelectorTagFilter({self.tag_filter!r}, {sorted(self.selectors)!r})"
+
+
+class ReductionEngine:
+    """Compute all configured reductions of every tag in a single pass over the scalar events.
+
+    Every (tag, reduction) pair keeps a constant amount of state ('mean_last:<K>' keeps a window
+    of K values), so memory does not grow with the length of the series. For 'at_best'
+    reductions the value a tag logged at the selector's best step is captured while streaming;
+    the tag must be logged at that step, before it logs a later step.
+
+    Args:
+        reductions (List[str]): Reduction specifications (see ``Reduction``).
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to reduce.
+            Selector tags are tracked even if the filter rejects them.
+    """
+
+    def __init__(self, reductions: List[str], tag_filter: Optional[Callable[[str], bool]] = None):
+        self.reductions = [parse_reduction(spec) for spec in reductions]
+        self.tag_filter = tag_filter
+        self.last_step: Optional[int] = None
+        # (selector, mode) -> [best value, best step]
+        self._selectors: Dict[Tuple[str, str], list] = {
+            (reduction.selector, reduction.mode): [None, None] for reduction in self.reductions if reduction.kind == "at_best"
+        }
+        # tag -> [last step, last value, one state per reduction]
+        self._tags: Dict[str, list] = {}
+
+    @property
+    def selectors(self) -> List[str]:
+        """Selector tags of the 'at_best' reductions."""
+        return sorted({selector for selector, _ in self._selectors})
+
+    def read_filter(self) -> Optional[Callable[[str], bool]]:
+        """Tag filter to read events with: the configured filter extended by the selector tags."""
+        if not self._selectors:
+            return self.tag_filter
+        return SelectorTagFilter(self.tag_filter, self.selectors)
+
+    def _initial_state(self, reduction: Reduction):
+        if reduction.kind == "mean_last":
+            return deque(maxlen=reduction.argument)
+        return None
+
+    def update(self, tag: str, step: int, value: float) -> None:
+        """Feed the next scalar value of a tag.
+
+        Args:
+            tag (str): Tag of the value.
+            step (int): Step the value was logged at.
+            value (float): The value.
+        """
+        self.last_step = step
+        for (selector, mode), best in self._selectors.items():
+            if selector == tag and (best[0] is None or (value < best[0] if mode == "min" else value > best[0])):
+                best[0], best[1] = value, step
+                self._capture_best(selector, mode, step)
+
+        if self.tag_filter is not None and not self.tag_filter(tag):
+            return
+        entry = self._tags.get(tag)
+        if entry is None:
+            entry = self._tags[tag] = [None, None] + [self._initial_state(reduction) for reduction in self.reductions]
+        entry[0], entry[1] = step, value
+
+        for index, reduction in enumerate(self.reductions, start=2):
+            kind = reduction.kind
+            if kind == "min":
+                entry[index] = value if entry[index] is None else min(entry[index], value)
+            elif kind == "max":
+                entry[index] = value if entry[index] is None else max(entry[index], value)
+            elif kind == "step":
+                if step <= reduction.argument:
+                    entry[index] = value
+            elif kind == "mean_last":
+                entry[index].append(value)
+            elif kind == "at_best":
+                if self._selectors[(reduction.selector, reduction.mode)][1] == step:
+                    entry[index] = value
+
+    def _capture_best(self, selector: str, mode: str, step: int) -> None:
+        # The selector improved: every tag's value at the new best step is its last value if
+        # it was logged at that step already, otherwise it is captured when it is logged.
+        for entry in self._tags.values():
+            for index, reduction in enumerate(self.reductions, start=2):
+                if reduction.kind == "at_best" and reduction.selector == selector and reduction.mode == mode:
+                    entry[index] = entry[1] if entry[0] == step else None
+
+    def results(self) -> Dict[str, float]:
+        """Reduced values of every tag, keyed by ``reduced_metric_name``. Reductions without a value are omitted."""
+        metrics = {}
+        for tag, entry in self._tags.items():
+            for index, reduction in enumerate(self.reductions, start=2):
+                if reduction.kind == "last":
+                    value = entry[1]
+                elif reduction.kind == "mean_last":
+                    value = sum(entry[index]) / len(entry[index])
+                else:
+                    value = entry[index]
+                if value is not None:
+                    metrics[reduced_metric_name(tag, reduction)] = value
+        return metrics
@@ -0,0 +1,293 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
+from tb_to_csv.core.aggregation import build_metric_store, finalize_report_table, iter_runs, save_report_table
+from tb_to_csv.core.event_file_utils import check_timing_reader, find_event_files, resolve_jobs
+from tb_to_csv.core.extraction_cache import ExtractionCache
+from tb_to_csv.core.metric_processing import build_tag_filter, categorize_run
+from tb_to_csv.core.metric_store import MetricStore, ReportTable
+from tb_to_csv.core.output_formats import output_file_name
+from tb_to_csv.core.profiling import profile_run, profile_stage
+
+# Settings a report definition of ``save_reports`` may contain
+REPORT_KEYS = (
+    "name", "output_dir", "prefix_file_mapping", "model_name_mapping", "model_sort_order", "metric_name_mapping",
+    "metric_sort_order", "compute_ci", "confidence", "ci_method", "bootstrap_resamples", "seed", "combine_columns",
+    "include_step", "output_format", "compression",
+)
+
+
+class MetricsReport:
+    """Run-level metrics extracted from a logs directory, kept in memory.
+
+    The event files are read once by ``collect_metrics``; the report can then be aggregated,
+    converted and saved any number of times with different settings.
+
+    Args:
+        store (MetricStore): Metric values of every run.
+        event_files (List[str]): Paths to the event files the metrics were extracted from.
+        prefix_file_mapping (Union[Dict[str, str], List[str]]): Mapping of prefixes to file names or a list of prefixes.
+    """
+
+    def __init__(self, store: MetricStore, event_files: List[str], prefix_file_mapping: Union[Dict[str, str], List[str]]):
+        self.store = store
+        self.event_files = event_files
+        self.prefix_file_mapping = prefix_file_mapping
+
+    @property
+    def models(self) -> List[str]:
+        """Model names in order of first appearance."""
+        return self.store.models
+
+    @property
+    def columns(self) -> List[Tuple[str, str]]:
+        """(category, metric) columns in order of first appearance."""
+        return self.store.columns
+
+    def table(
+        self,
+        compute_ci: bool = False,
+        confidence: float = 0.95,
+        ci_method: str = "parametric",
+        bootstrap_resamples: int = 10_000,
+        seed: int = 0,
+        jobs: int = 1,
+    ) -> ReportTable:
+        """Aggregate the runs of each model into means and confidence intervals, or keep one row per run.
+
+        Args:
+            compute_ci (bool): Whether to aggregate runs or return one row per run named 'model/run'.
+                Defaults to one row per run, like the CLI.
+            confidence (float): Confidence level for intervals.
+            ci_method (str): "parametric" (t/z interval), or "percentile"/"bca" bootstrap intervals.
+            bootstrap_resamples (int): Number of bootstrap resamples.
+            seed (int): Seed of the bootstrap resampling.
+            jobs (int): Number of worker processes used for bootstrapping (0 for one per CPU).
+
+        Returns:
+            ReportTable: Unformatted values (and intervals) as NumPy arrays.
+        """
+        return finalize_report_table(self.store, compute_ci, confidence, ci_method, bootstrap_resamples, seed, jobs)
+
+    def to_pandas(self, compute_ci: bool = False, **kwargs):
+        """Long-format DataFrame of ``table(compute_ci, **kwargs)`` (see ``ReportTable.to_pandas``). Requires pandas."""
+        return self.table(compute_ci, **kwargs).to_pandas()
+
+    def save(
+        self,
+        output_dir: str,
+        compute_ci: bool = False,
+        confidence: float = 0.95,
+        ci_method: str = "parametric",
+        bootstrap_resamples: int = 10_000,
+        seed: int = 0,
+        jobs: int = 1,
+        model_name_mapping: Optional[Dict[str, str]] = None,
+        model_sort_order: Optional[List[str]] = None,
+        metric_name_mapping: Optional[Dict[str, str]] = None,
+        metric_sort_order: Optional[List[str]] = None,
+        combine_columns: bool = True,
+        include_step: bool = False,
+        output_format: str = "csv",
+        compression: Optional[str] = None,
+    ) -> ReportTable:
+        """Write the report as CSV (or Parquet/Feather) files, like ``process_and_save_metrics``.
+
+        Args:
+            output_dir (str): Directory the files are written to.
+            compute_ci (bool): Whether to aggregate runs into confidence intervals or save every run (the default, like the CLI).
+            confidence (float): Confidence level for intervals.
+            ci_method (str): "parametric", "percentile" or "bca".
+            bootstrap_resamples (int): Number of bootstrap resamples.
+            seed (int): Seed of the bootstrap resampling.
+            jobs (int): Number of worker processes used for bootstrapping (0 for one per CPU).
+            model_name_mapping (Optional[Dict[str, str]]): Mapping of model directory names to display names.
+            model_sort_order (Optional[List[str]]): Custom sorting order for models.
+            metric_name_mapping (Optional[Dict[str, str]]): Mapping of metric keys to display names.
+            metric_sort_order (Optional[List[str]]): Custom sorting order for metrics.
+            combine_columns (bool): Whether to combine mean and CI into one column.
+            include_step (bool): Whether to include the "Step" key in the CSV.
+            output_format (str): "csv", or "parquet"/"feather" for typed columnar files (requires pyarrow).
+            compression (Optional[str]): Compression codec of columnar files.
+
+        Returns:
+            ReportTable: The saved table.
+        """
+        table = self.table(compute_ci, confidence, ci_method, bootstrap_resamples, seed, jobs)
+        save_report_table(
+            table, output_dir, self.prefix_file_mapping, model_name_mapping or {}, model_sort_order,
+            metric_name_mapping or {}, metric_sort_order, combine_columns, include_step, output_format, compression,
+        )
+        return table
+
+
+def collect_metrics(
+    logs_dir: str,
+    prefix_file_mapping: Union[Dict[str, str], List[str]],
+    reader: str = "native",
+    jobs: int = 1,
+    cache_path: Optional[str] = None,
+    cache_max_entries: int = 100_000,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    discovery_threads: int = 1,
+    bounded_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    timing: bool = False,
+) -> MetricsReport:
+    """Find and extract the event files of a logs directory without writing any output files.
+
+    Example:
+        >>> report = collect_metrics("logs", ["test", "ood"])
+        >>> table = report.table(compute_ci=True, confidence=0.9)  # means and margins as NumPy arrays
+        >>> df = report.to_pandas()  # one row per run and metric
+        >>> report.save("results", compute_ci=True, ci_method="bca")
+
+    Args:
+        logs_dir (str): Path to the logs directory containing event files.
+        prefix_file_mapping (Union[Dict[str, str], List[str]]): Mapping of prefixes to file names or a list of prefixes.
+        reader (str): Backend used to read event files ("native" or "accumulator").
+        jobs (int): Number of worker processes used to extract event files (0 for one per CPU).
+        cache_path (Optional[str]): Path to the extraction cache file. Caching is disabled if None.
+        cache_max_entries (int): Maximum number of event files kept in the extraction cache.
+        max_depth (Optional[int]): Maximum number of directory levels below logs_dir searched for event files.
+        exclude (Optional[List[str]]): Glob patterns of directories to skip when searching for event files.
+        discovery_threads (int): Number of threads used to search for event files.
+        bounded_memory (bool): Limit the EventAccumulator's reservoirs to a single item per tag and plugin.
+        reductions (Optional[List[str]]): Reductions to compute per metric instead of the last value.
+        shard (Optional[Tuple[int, int]]): Only extract shard ``index`` of ``count`` of the event files.
+        timing (bool): Add the 'duration', 'steps' and 'steps_per_second' of each run to every category.
+
+    Returns:
+        MetricsReport: The extracted metrics of every run.
+
+    Raises:
+        FileNotFoundError: If the logs directory contains no event files.
+        ValueError: If jobs is negative.
+    """
+    check_timing_reader(reader, timing)
+    jobs = resolve_jobs(jobs)
+    event_files = find_event_files(logs_dir, max_depth, exclude, discovery_threads)
+    if shard is not None:
+        index, count = shard
+        event_files = event_files[index::count]
+    if not event_files:
+        raise FileNotFoundError(f"❌ No event files found in logs directory {logs_dir}")
+
+    cache = ExtractionCache(cache_path, cache_max_entries) if cache_path else None
+    store = build_metric_store(event_files, prefix_file_mapping, reader, jobs, cache, bounded_memory, reductions=reductions, timing=timing)
+    if cache is not None:
+        cache.save()
+    return MetricsReport(store, event_files, prefix_file_mapping)
+
+
+def _report_paths(report: Dict[str, Any], logs_dir: str) -> List[str]:
+    # Paths of the files a report definition writes, to detect reports overwriting each other
+    prefix_file_mapping = report.get("prefix_file_mapping")
+    if isinstance(prefix_file_mapping, dict):
+        file_names = set(prefix_file_mapping.values())
+    else:
+        file_names = {f"{prefix}_metrics.csv" for prefix in prefix_file_mapping or []}
+    output_dir = report.get("output_dir", logs_dir)
+    return [os.path.join(output_dir, output_file_name(file_name, report.get("output_format", "csv"))) for file_name in sorted(file_names)]
+
+
+def save_reports(
+    logs_dir: str,
+    reports: List[Dict[str, Any]],
+    reader: str = "native",
+    jobs: int = 1,
+    cache_path: Optional[str] = None,
+    cache_max_entries: int = 100_000,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    discovery_threads: int = 1,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    profile_path: Optional[str] = None,
+    cprofile_path: Optional[str] = None,
+    timing: bool = False,
+) -> None:
+    """Produce several reports from a single discovery and extraction pass.
+
+    The event files are read once, keeping every tag that matches a prefix of any report.
+    Only categorizing, aggregating and writing are repeated per report.
+
+    Args:
+        logs_dir (str): Path to the logs directory containing event files.
+        reports (List[Dict[str, Any]]): Report definitions with the keys of ``REPORT_KEYS``.
+            'prefix_file_mapping' is required; 'output_dir' defaults to ``logs_dir`` and 'name'
+            (used in messages and profiles) to 'report_<index>'. The other keys are passed to
+            ``MetricsReport.save``.
+        reader (str): Backend used to read event files ("native" or "accumulator").
+        jobs (int): Number of worker processes used to extract event files and bootstrap (0 for one per CPU).
+        cache_path (Optional[str]): Path to the extraction cache file. Caching is disabled if None.
+        cache_max_entries (int): Maximum number of event files kept in the extraction cache.
+        max_depth (Optional[int]): Maximum number of directory levels below logs_dir searched for event files.
+        exclude (Optional[List[str]]): Glob patterns of directories to skip when searching for event files.
+        discovery_threads (int): Number of threads used to search for event files.
+        bounded_memory (bool): Limit the EventAccumulator's reservoirs to a single item per tag and plugin.
+        report_memory (bool): Print the peak memory allocated while reading each event file.
+        reductions (Optional[List[str]]): Reductions to compute per metric instead of the last value.
+        shard (Optional[Tuple[int, int]]): Only process shard ``index`` of ``count`` of the event files.
+        profile_path (Optional[str]): Write a per-stage and per-file JSON profile to this file.
+        cprofile_path (Optional[str]): Write a cProfile dump of the main process to this file.
+        timing (bool): Add the 'duration', 'steps' and 'steps_per_second' of each run to every category.
+
+    Raises:
+        ValueError: If a report definition is invalid, two reports would write the same file or
+            jobs is negative.
+        FileNotFoundError: If the logs directory contains no event files.
+    """
+    check_timing_reader(reader, timing)
+    jobs = resolve_jobs(jobs)
+    names = [report.get("name", f"report_{index}") for index, report in enumerate(reports)]
+    writers = {}
+    for name, report in zip(names, reports):
+        unknown = sorted(set(report) - set(REPORT_KEYS))
+        if unknown:
+            raise ValueError(f"❌ Unknown keys {unknown} in report '{name}'. Must be among {list(REPORT_KEYS)}.")
+        if not isinstance(report.get("prefix_file_mapping"), (list, dict)):
+            raise ValueError(f"❌ Report '{name}' needs a 'prefix_file_mapping' list or dictionary.")
+        for path in _report_paths(report, logs_dir):
+            if path in writers:
+                raise ValueError(f"❌ Reports '{writers[path]}' and '{name}' both write {path}. Give them different 'output_dir's.")
+            writers[path] = name
+
+    with profile_run(profile_path, cprofile_path) as profiler:
+        with profile_stage(profiler, "discovery"):
+            event_files = find_event_files(logs_dir, max_depth, exclude, discovery_threads)
+            if shard is not None:
+                index, count = shard
+                event_files = event_files[index::count]
+        if not event_files:
+            raise FileNotFoundError(f"❌ No event files found in logs directory {logs_dir}")
+
+        # Extract every tag any report needs in one pass
+        prefixes = []
+        for report in reports:
+            prefixes.extend(prefix for prefix in report["prefix_file_mapping"] if prefix not in prefixes)
+        cache = ExtractionCache(cache_path, cache_max_entries) if cache_path else None
+        with profile_stage(profiler, "extraction"):
+            runs = list(iter_runs(event_files, build_tag_filter(prefixes), reader, jobs, cache, bounded_memory, report_memory, reductions, profiler, timing))
+            if cache is not None:
+                cache.save()
+                print(f"✅ Extraction cache {cache_path}: {cache.hits} hits, {cache.misses} misses.")
+
+        for name, report in zip(names, reports):
+            with profile_stage(profiler, f"report:{name}"):
+                prefix_file_mapping = report["prefix_file_mapping"]
+                store = MetricStore()
+                for model_key, run_name, metrics in runs:
+                    categorized_metrics = categorize_run(metrics, prefix_file_mapping)
+                    # Like a separate run, skip runs without metrics of this report's prefixes
+                    if any(categorized_metrics.values()):
+                        store.add_run(model_key, run_name, categorized_metrics)
+
+                output_dir = report.get("output_dir", logs_dir)
+                os.makedirs(output_dir, exist_ok=True)
+                settings = {key: value for key, value in report.items() if key not in ("name", "output_dir", "prefix_file_mapping")}
+                print(f"📄 Report '{name}':")
+                MetricsReport(store, event_files, prefix_file_mapping).save(output_dir, jobs=jobs, **settings)
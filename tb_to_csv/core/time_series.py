@@ -0,0 +1,149 @@
+import csv
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Union
+from tb_to_csv.core.aggregation import get_run_key
+from tb_to_csv.core.event_file_utils import find_event_files, resolve_jobs
+from tb_to_csv.core.event_reader import ScalarEvent, iter_scalar_events
+from tb_to_csv.core.metric_processing import build_tag_filter
+
+TIME_SERIES_FILE = "time_series.csv"
+TIME_SERIES_HEADER = ["model", "run", "tag", "step", "wall_time", "value"]
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def iter_time_series_chunks(
+    event_file: str,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[ScalarEvent]]:
+    """Stream every scalar data point of an event file in chunks of at most ``chunk_size`` points.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to export.
+        chunk_size (int): Maximum number of data points per chunk.
+
+    Yields:
+        List[ScalarEvent]: The next data points in file order.
+    """
+    events = iter_scalar_events(event_file, tag_filter)
+    while True:
+        chunk = list(islice(events, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_time_series(
+    event_file: str,
+    output: TextIO,
+    tag_filter: Optional[Callable[[str], bool]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write the (model, run, tag, step, wall_time, value) rows of an event file to an open CSV file.
+
+    Only one chunk of rows is held in memory at a time.
+
+    Args:
+        event_file (str): Path to the TensorBoard event file.
+        output (TextIO): File object the rows are written to.
+        tag_filter (Optional[Callable[[str], bool]]): Predicate selecting the tags to export.
+        chunk_size (int): Maximum number of rows held in memory.
+
+    Returns:
+        int: Number of rows written.
+    """
+    model_key, run_name = get_run_key(event_file)
+    writer = csv.writer(output)
+    rows = 0
+    for chunk in iter_time_series_chunks(event_file, tag_filter, chunk_size):
+        writer.writerows((model_key, run_name, event.tag, event.step, event.wall_time, event.value) for event in chunk)
+        rows += len(chunk)
+    return rows
+
+
+def _write_time_series_part(
+    event_file: str,
+    part_path: str,
+    tag_filter: Optional[Callable[[str], bool]],
+    chunk_size: int,
+) -> int:
+    with open(part_path, "w", newline="") as part:
+        return write_time_series(event_file, part, tag_filter, chunk_size)
+
+
+def export_time_series(
+    logs_dir: str,
+    output_path: Optional[str] = None,
+    prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]] = None,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    discovery_threads: int = 1,
+) -> int:
+    """Export the full learning curves of all runs to a single long-format CSV file.
+
+    Rows are streamed from the native event reader to the output file in chunks. With
+    several jobs each worker writes its event files to a temporary part file, which is then
+    appended to the output in event file order, so the output is identical to a serial export
+    and no worker holds more than one chunk in memory.
+
+    Args:
+        logs_dir (str): Path to the logs directory containing event files.
+        output_path (Optional[str]): Path to the output CSV file. Defaults to '<logs_dir>/time_series.csv'.
+        prefix_file_mapping (Optional[Union[Dict[str, str], List[str]]]): Only tags with these prefixes are exported. All tags if None.
+        jobs (int): Number of worker processes (0 for one per CPU).
+        chunk_size (int): Maximum number of rows a worker holds in memory.
+        max_depth (Optional[int]): Maximum number of directory levels below logs_dir searched for event files.
+        exclude (Optional[List[str]]): Glob patterns of directories to skip when searching for event files.
+        discovery_threads (int): Number of threads used to search for event files.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        FileNotFoundError: If no event files are found.
+        ValueError: If jobs is negative.
+    """
+    jobs = resolve_jobs(jobs)
+    event_files = find_event_files(logs_dir, max_depth, exclude, discovery_threads)
+    if not event_files:
+        raise FileNotFoundError(f"❌ No event files found in logs directory {logs_dir}")
+
+    output_path = output_path or os.path.join(logs_dir, TIME_SERIES_FILE)
+    tag_filter = build_tag_filter(prefix_file_mapping)
+
+    rows = 0
+    with open(output_path, "w", newline="") as output:
+        csv.writer(output).writerow(TIME_SERIES_HEADER)
+        if jobs == 1 or len(event_files) <= 1:
+            for event_file in event_files:
+                rows += write_time_series(event_file, output, tag_filter, chunk_size)
+        else:
+            part_dir = tempfile.mkdtemp(prefix=".time_series_", dir=os.path.dirname(os.path.abspath(output_path)))
+            try:
+                part_paths = [os.path.join(part_dir, f"{index}.csv") for index in range(len(event_files))]
+                with ProcessPoolExecutor(max_workers=min(jobs, len(event_files))) as executor:
+                    part_rows = executor.map(
+                        _write_time_series_part,
+                        event_files,
+                        part_paths,
+                        [tag_filter] * len(event_files),
+                        [chunk_size] * len(event_files),
+                    )
+                    # Results arrive in input order, so each part can be appended as soon as it is done
+                    for part_path, count in zip(part_paths, part_rows):
+                        with open(part_path, "r", newline="") as part:
+                            shutil.copyfileobj(part, output)
+                        os.remove(part_path)
+                        rows += count
+            finally:
+                shutil.rmtree(part_dir, ignore_errors=True)
+
+    print(f"✅ Saved {output_path} with {rows} rows from {len(event_files)} event files.")
+    return rows
@@ -0,0 +1,386 @@
+import io
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+from tb_to_csv.core.aggregation import (
+    build_csv_tables,
+    extract_states_in_order,
+    finalize_metric_store,
+    get_run_key,
+    sort_models,
+)
+from tb_to_csv.core.csv_writer import write_metrics_csv
+from tb_to_csv.core.event_file_utils import EVENT_FILE_PREFIX, check_timing_reader, find_event_files, find_search_dirs, resolve_jobs
+from tb_to_csv.core.extraction_cache import file_identity
+from tb_to_csv.core.metric_processing import build_tag_filter, categorize_run, has_metrics
+from tb_to_csv.core.metric_store import MetricStore
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+_INOTIFY_MASK = 0 if INotify is None else (
+    flags.CREATE | flags.CLOSE_WRITE | flags.MODIFY | flags.MOVED_TO | flags.DELETE | flags.MOVED_FROM | flags.DELETE_SELF
+)
+# Events that add or remove event files or directories and therefore require a new discovery
+_STRUCTURE_FLAGS = 0 if INotify is None else (
+    flags.CREATE | flags.MOVED_TO | flags.DELETE | flags.MOVED_FROM
+)
+
+# Seconds without events after which a burst of writes is considered finished
+SETTLE_SECONDS = 0.5
+
+
+class MetricsWatcher:
+    """Keep the metric CSVs of a logs directory up to date while event files are being written.
+
+    The watcher keeps the read state of every event file, the metrics of every run and the
+    aggregated metrics of every model in memory. On each update only new or changed event
+    files are read (appended files only from where the previous read stopped), only the
+    models owning those runs are re-aggregated, and only the CSV files whose content changed
+    are rewritten.
+
+    With inotify, only the directories searched for event files are watched, and an update
+    only re-stats the event files that were written to. The directory tree is only searched
+    again when files or directories were created, moved or deleted. Without inotify, or if
+    a directory cannot be watched (e.g. because ``max_user_watches`` is exhausted), every
+    update searches the tree and re-stats every event file.
+
+    The arguments are the same as for ``process_and_save_metrics``.
+    """
+
+    def __init__(
+        self,
+        logs_dir: str,
+        prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]],
+        model_name_mapping: Dict[str, str],
+        model_sort_order: Optional[List[str]],
+        metric_name_mapping: Dict[str, str],
+        metric_sort_order: Optional[List[str]],
+        compute_ci: bool,
+        confidence: float,
+        combine_columns: bool,
+        include_step: bool,
+        reader: str = "native",
+        jobs: int = 1,
+        max_depth: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        discovery_threads: int = 1,
+        bounded_memory: bool = False,
+        report_memory: bool = False,
+        reductions: Optional[List[str]] = None,
+        ci_method: str = "parametric",
+        bootstrap_resamples: int = 10_000,
+        seed: int = 0,
+        timing: bool = False,
+    ):
+        check_timing_reader(reader, timing)
+        self.logs_dir = logs_dir
+        self.prefix_file_mapping = prefix_file_mapping
+        self.model_name_mapping = model_name_mapping
+        self.model_sort_order = model_sort_order
+        self.metric_name_mapping = metric_name_mapping
+        self.metric_sort_order = metric_sort_order
+        self.compute_ci = compute_ci
+        self.confidence = confidence
+        self.combine_columns = combine_columns
+        self.include_step = include_step
+        self.reader = reader
+        self.jobs = resolve_jobs(jobs)
+        self.max_depth = max_depth
+        self.exclude = exclude
+        self.discovery_threads = discovery_threads
+        self.bounded_memory = bounded_memory
+        self.report_memory = report_memory
+        self.reductions = reductions
+        self.ci_method = ci_method
+        self.bootstrap_resamples = bootstrap_resamples
+        self.seed = seed
+        self.timing = timing
+        self.tag_filter = build_tag_filter(prefix_file_mapping)
+
+        # (model_key, run_name) -> latest event file found by the last discovery
+        self.runs: Dict[Tuple[str, str], str] = {}
+        # (model_key, run_name) -> (event_file, file identity, read state)
+        self.files: Dict[Tuple[str, str], tuple] = {}
+        # model_key -> run_name -> raw metrics
+        self.run_metrics: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # model_key -> finalized metrics of that model's rows
+        self.model_results: Dict[str, Dict[str, Dict[str, Dict[str, str]]]] = {}
+        self.model_order: List[str] = []
+        # csv_path -> content last written
+        self.csv_contents: Dict[str, str] = {}
+
+        self._inotify = INotify() if INotify is not None else None
+        # watch descriptor -> directory and back
+        self._watches: Dict[int, str] = {}
+        self._watched_dirs: Dict[str, int] = {}
+        self._rediscover = True
+        self._changed_paths: Set[str] = set()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are detected with inotify instead of polling."""
+        return self._inotify is not None
+
+    def update(self) -> List[str]:
+        """Pick up changed event files and rewrite the CSV files whose content changed.
+
+        Returns:
+            List[str]: Paths of the CSV files that were written.
+        """
+        if self._inotify is not None:
+            # Pick up the changes made since the last wait
+            self._read_events(0)
+        dirty_models = set()
+        if self._inotify is None or self._rediscover:
+            if self._inotify is not None:
+                # Watch before searching, so that files created during the search are not missed
+                self._sync_watches()
+            self._rediscover = False
+            self._changed_paths.clear()
+            self.runs = {get_run_key(event_file): event_file for event_file in find_event_files(self.logs_dir, self.max_depth, self.exclude, self.discovery_threads)}
+            self.model_order = list(dict.fromkeys(model_key for model_key, _ in self.runs))
+            candidates = self.runs
+
+            # Forget runs whose event files disappeared
+            for run in [run for run in self.files if run not in self.runs]:
+                del self.files[run]
+                self.run_metrics.get(run[0], {}).pop(run[1], None)
+                dirty_models.add(run[0])
+        else:
+            changed_paths, self._changed_paths = self._changed_paths, set()
+            candidates = {run: event_file for run, event_file in self.runs.items() if event_file in changed_paths}
+
+        changed = []
+        for run, event_file in candidates.items():
+            try:
+                identity = file_identity(event_file)
+            except FileNotFoundError:
+                continue
+            previous = self.files.get(run)
+            if previous is not None and previous[0] == event_file:
+                if previous[1] == identity:
+                    continue
+                changed.append((run, event_file, identity, previous[2]))
+            else:
+                changed.append((run, event_file, identity, None))
+
+        states = extract_states_in_order([event_file for _, event_file, _, _ in changed], [state for _, _, _, state in changed], self.reader, self.jobs, self.tag_filter, self.bounded_memory, self.report_memory, self.reductions, None, self.timing)
+        for ((model_key, run_name), event_file, identity, _), state in zip(changed, states):
+            self.files[(model_key, run_name)] = (event_file, identity, state)
+            model_runs = self.run_metrics.setdefault(model_key, {})
+            if has_metrics(state.metrics):
+                model_runs[run_name] = state.metrics
+            else:
+                print(f"⚠️ No metrics extracted from {event_file}. Skipping...")
+                model_runs.pop(run_name, None)
+            dirty_models.add(model_key)
+
+        for model_key in dirty_models:
+            self._aggregate_model(model_key)
+
+        if not dirty_models and self.csv_contents:
+            return []
+        return self._write_changed_csvs()
+
+    def _aggregate_model(self, model_key: str) -> None:
+        runs = self.run_metrics.get(model_key)
+        if not runs:
+            self.model_results.pop(model_key, None)
+            return
+        store = MetricStore()
+        for run_name, metrics in runs.items():
+            store.add_run(model_key, run_name, categorize_run(metrics, self.prefix_file_mapping))
+        self.model_results[model_key] = finalize_metric_store(store, None, self.compute_ci, self.confidence, self.combine_columns, self.ci_method, self.bootstrap_resamples, self.seed)
+
+    def _write_changed_csvs(self) -> List[str]:
+        model_metrics = {}
+        for model_key in self.model_order:
+            model_metrics.update(self.model_results.get(model_key, {}))
+        model_metrics = sort_models(model_metrics, self.model_sort_order)
+
+        written = []
+        for file_name, table in build_csv_tables(model_metrics, self.prefix_file_mapping).items():
+            if not table:
+                continue
+            csv_path = os.path.join(self.logs_dir, file_name)
+            buffer = io.StringIO(newline="")
+            write_metrics_csv(table, buffer, self.model_name_mapping, self.model_sort_order, self.metric_name_mapping, self.metric_sort_order, include_step=self.include_step)
+            content = buffer.getvalue()
+
+            if csv_path not in self.csv_contents and os.path.exists(csv_path):
+                with open(csv_path, "r", newline="") as csvfile:
+                    self.csv_contents[csv_path] = csvfile.read()
+            if self.csv_contents.get(csv_path) == content:
+                continue
+
+            with open(csv_path, "w", newline="") as csvfile:
+                csvfile.write(content)
+            self.csv_contents[csv_path] = content
+            written.append(csv_path)
+            print(f"✅ Saved {csv_path} with {len(table)} models.")
+        return written
+
+    def wait_for_changes(self, timeout: float) -> None:
+        """Block until an event file changes or the timeout expires.
+
+        Uses inotify if ``inotify_simple`` is installed, otherwise simply sleeps for the timeout.
+        After the first change, events are collected until no event arrived for
+        ``SETTLE_SECONDS``, so that a file that is flushed continuously triggers at most one
+        update per ``timeout``.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait.
+        """
+        if self._inotify is None:
+            time.sleep(timeout)
+            return
+
+        deadline = time.monotonic() + timeout
+        while not self._read_events(deadline - time.monotonic()):
+            if time.monotonic() >= deadline:
+                return
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._read_events(min(SETTLE_SECONDS, remaining)):
+                return
+
+    def _read_events(self, timeout: float) -> bool:
+        """Read the pending inotify events, waiting up to ``timeout`` seconds for the first one.
+
+        Returns:
+            bool: Whether an event file or directory changed.
+        """
+        relevant = False
+        for event in self._inotify.read(timeout=max(0, int(timeout * 1000))):
+            if event.mask & flags.IGNORED:
+                # The directory was deleted or unmounted and the kernel removed its watch
+                dir_path = self._watches.pop(event.wd, None)
+                if dir_path is not None:
+                    self._watched_dirs.pop(dir_path, None)
+                continue
+            if event.mask & flags.Q_OVERFLOW:
+                # Events were dropped, so the changed files are unknown
+                self._rediscover = relevant = True
+                continue
+            if event.name.startswith(".") or not (event.mask & flags.ISDIR or event.name.startswith(EVENT_FILE_PREFIX)):
+                # Hidden files and other files such as the CSVs written by the watcher itself
+                continue
+            relevant = True
+            if event.mask & _STRUCTURE_FLAGS:
+                self._rediscover = True
+            elif event.wd in self._watches:
+                self._changed_paths.add(os.path.join(self._watches[event.wd], event.name))
+        return relevant
+
+    def _sync_watches(self) -> None:
+        """Watch exactly the directories that ``find_event_files`` searches."""
+        search_dirs = find_search_dirs(self.logs_dir, self.max_depth, self.exclude)
+        wanted = set(search_dirs)
+        for dir_path in [dir_path for dir_path in self._watched_dirs if dir_path not in wanted]:
+            watch = self._watched_dirs.pop(dir_path)
+            self._watches.pop(watch, None)
+            try:
+                self._inotify.rm_watch(watch)
+            except OSError:
+                pass  # Already removed by the kernel
+        for dir_path in search_dirs:
+            if dir_path in self._watched_dirs:
+                continue
+            try:
+                watch = self._inotify.add_watch(dir_path, _INOTIFY_MASK)
+            except FileNotFoundError:
+                continue  # Deleted since it was searched
+            except OSError as error:
+                print(f"⚠️ Could not watch {dir_path} ({error}). Falling back to polling.")
+                self._stop_inotify()
+                return
+            self._watches[watch] = dir_path
+            self._watched_dirs[dir_path] = watch
+
+    def _stop_inotify(self) -> None:
+        self._inotify.close()
+        self._inotify = None
+        self._watches.clear()
+        self._watched_dirs.clear()
+
+    def run(self, poll_interval: float = 5.0, max_updates: Optional[int] = None) -> None:
+        """Update the CSV files until interrupted.
+
+        Args:
+            poll_interval (float): Maximum number of seconds between two updates.
+            max_updates (Optional[int]): Stop after this many updates. Runs forever if None.
+        """
+        updates = 0
+        while True:
+            self.update()
+            updates += 1
+            if max_updates is not None and updates >= max_updates:
+                return
+            self.wait_for_changes(poll_interval)
+
+
+def watch_and_save_metrics(
+    logs_dir: str,
+    prefix_file_mapping: Optional[Union[Dict[str, str], List[str]]],
+    model_name_mapping: Dict[str, str],
+    model_sort_order: Optional[List[str]],
+    metric_name_mapping: Dict[str, str],
+    metric_sort_order: Optional[List[str]],
+    compute_ci: bool,
+    confidence: float,
+    combine_columns: bool,
+    include_step: bool,
+    reader: str = "native",
+    jobs: int = 1,
+    max_depth: Optional[int] = None,
+    exclude: Optional[List[str]] = None,
+    discovery_threads: int = 1,
+    bounded_memory: bool = False,
+    report_memory: bool = False,
+    reductions: Optional[List[str]] = None,
+    ci_method: str = "parametric",
+    bootstrap_resamples: int = 10_000,
+    seed: int = 0,
+    poll_interval: float = 5.0,
+    timing: bool = False,
+) -> None:
+    """Keep the metric CSVs of a logs directory up to date until interrupted.
+
+    Takes the same arguments as ``process_and_save_metrics``, plus:
+
+    Args:
+        poll_interval (float): Maximum number of seconds between two updates.
+    """
+    watcher = MetricsWatcher(
+        logs_dir,
+        prefix_file_mapping,
+        model_name_mapping,
+        model_sort_order,
+        metric_name_mapping,
+        metric_sort_order,
+        compute_ci,
+        confidence,
+        combine_columns,
+        include_step,
+        reader=reader,
+        jobs=jobs,
+        max_depth=max_depth,
+        exclude=exclude,
+        discovery_threads=discovery_threads,
+        bounded_memory=bounded_memory,
+        report_memory=report_memory,
+        reductions=reductions,
+        ci_method=ci_method,
+        bootstrap_resamples=bootstrap_resamples,
+        seed=seed,
+        timing=timing,
+    )
+    mode = "inotify" if watcher.uses_inotify else f"polling every {poll_interval}s"
+    print(f"👀 Watching {logs_dir} ({mode}). Press Ctrl+C to stop.")
+    try:
+        watcher.run(poll_interval)
+    except KeyboardInterrupt:
+        print("🛑 Stopped watching.")
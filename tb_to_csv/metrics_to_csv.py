@@ -1,8 +1,46 @@
 import argparse
+import os
 import yaml
 import ast
-from typing import Any, Dict, List, Optional, Union
-from tb_to_csv.core.aggregation import process_and_save_metrics
+from typing import Any, Dict, List, Optional, Tuple, Union
+from tb_to_csv.core.aggregation import merge_and_save_metrics, process_and_save_metrics
+from tb_to_csv.core.confidence_intervals import CI_METHODS
+from tb_to_csv.core.event_file_utils import READERS, check_timing_reader, resolve_jobs
+from tb_to_csv.core.extraction_cache import DEFAULT_CACHE_FILE
+from tb_to_csv.core.output_formats import OUTPUT_FORMATS
+from tb_to_csv.core.profiling import PROFILE_FILE
+from tb_to_csv.core.report import save_reports
+from tb_to_csv.core.time_series import DEFAULT_CHUNK_SIZE, TIME_SERIES_FILE, export_time_series
+from tb_to_csv.core.watch import watch_and_save_metrics
+
+
+# Options that each mode cannot honour, in the order in which the modes take precedence
+UNSUPPORTED_OPTIONS = {
+    "time_series": ["merge", "watch", "reports", "partial_state", "cache", "shard", "profile", "cprofile", "timing", "reductions", "output_format", "compression"],
+    "merge": ["watch", "reports", "partial_state", "cache", "shard", "profile", "cprofile", "timing", "reductions"],
+    "watch": ["reports", "partial_state", "cache", "shard", "profile", "cprofile", "output_format", "compression"],
+    "reports": ["partial_state"],
+}
+# Values of options that behave like leaving the option unset
+DEFAULT_OPTIONS = {"output_format": "csv", "reductions": ["last"]}
+
+
+def check_mode_options(options: Dict[str, Any]) -> None:
+    """Reject options that the selected mode would otherwise silently ignore.
+
+    Args:
+        options (Dict[str, Any]): Value of every mode and option of ``UNSUPPORTED_OPTIONS``.
+            Unset options are falsy or have their ``DEFAULT_OPTIONS`` value.
+
+    Raises:
+        ValueError: If an option is set that the selected mode does not support.
+    """
+    for mode, unsupported in UNSUPPORTED_OPTIONS.items():
+        if options.get(mode):
+            conflicts = [option for option in unsupported if options.get(option) and options[option] != DEFAULT_OPTIONS.get(option)]
+            if conflicts:
+                raise ValueError(f"❌ '{mode}' cannot be combined with {', '.join(repr(option) for option in conflicts)}. Remove them from the arguments or the config.")
+            return
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
@@ -36,6 +74,24 @@ def parse_inline_argument(arg_value: str) -> Union[Dict[str, Any], List[Any]]:
         raise ValueError(f"Invalid inline argument: {arg_value}. Must be a valid dictionary or list.")
 
 
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Parse a shard specification of the form 'INDEX/COUNT' (e.g. '0/4').
+
+    Args:
+        shard (str): The shard specification.
+
+    Returns:
+        Tuple[int, int]: The shard index and the number of shards.
+
+    Raises:
+        ValueError: If the specification is invalid.
+    """
+    index, _, count = str(shard).partition("/")
+    if not (index.isdigit() and count.isdigit() and int(index) < int(count)):
+        raise ValueError(f"❌ Invalid shard: {shard}. Must be 'INDEX/COUNT' with 0 <= INDEX < COUNT.")
+    return int(index), int(count)
+
+
 def main() -> None:
     """Main function to parse arguments, load configuration, and process metrics."""
     parser = argparse.ArgumentParser(
@@ -70,6 +126,8 @@ def main() -> None:
             "  - A list of prefixes (e.g., '[\"test\", \"shift\", \"ood\"]').\n"
             "    Metrics for each prefix are saved to '<prefix>_metrics.csv'.\n"
             "  - A dictionary mapping prefixes to custom file names (e.g., '{\"test\": \"test_metrics.csv\"}').\n"
+            "Prefixes may be nested ('ood/cifar10') or contain globs within a segment ('ood/*/');\n"
+            "a metric matching several prefixes goes to the most specific one.\n"
             "If not provided, all metrics are saved to a single CSV file."
         )
     )
@@ -119,6 +177,28 @@ def main() -> None:
         type=float,
         help="Confidence level for intervals. Default: 0.95 if not specified in the config."
     )
+    parser.add_argument(
+        "--ci-method",
+        type=str,
+        choices=CI_METHODS,
+        help=(
+            "Method used to compute confidence intervals:\n"
+            "  - 'parametric' uses the t-distribution (z for more than 30 runs), written as 'mean ±margin'.\n"
+            "  - 'percentile' and 'bca' (bias-corrected and accelerated) bootstrap the mean, written as\n"
+            "    'mean [lower, upper]'. Better suited to bounded metrics such as ECE or AUROC.\n"
+            "Default: 'parametric' if not specified in the config."
+        )
+    )
+    parser.add_argument(
+        "--bootstrap-resamples",
+        type=int,
+        help="Number of bootstrap resamples. Default: 10000."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the bootstrap resampling. Default: 0."
+    )
     parser.add_argument(
         "--separate-columns",
         action="store_true",
@@ -129,6 +209,185 @@ def main() -> None:
         action="store_true",
         help="Include the 'Step' key in the CSV. Default: False."
     )
+    parser.add_argument(
+        "--reader",
+        type=str,
+        choices=READERS,
+        help=(
+            "Backend used to read event files:\n"
+            "  - 'native' streams the records and only decodes scalar summaries (fast, low memory).\n"
+            "  - 'accumulator' uses TensorBoard's EventAccumulator.\n"
+            "Default: 'native' if not specified in the config."
+        )
+    )
+    parser.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help=(
+            "Limit the 'accumulator' reader to a single item per tag for every plugin (scalars, images,\n"
+            "audio, histograms, tensors) instead of keeping reservoirs in memory. Default: False."
+        )
+    )
+    parser.add_argument(
+        "--report-memory",
+        action="store_true",
+        help=(
+            "Print the peak memory used while reading each event file: the Python heap (tracemalloc, which does not\n"
+            "see native protobuf or TensorBoard allocations) and the growth of the process's peak RSS.\n"
+            "Slows down extraction. Default: False."
+        )
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help=(
+            "Add the 'duration' (seconds between the first and last summary event), 'steps' and\n"
+            "'steps_per_second' of each run to every category, read in the same pass as the metrics.\n"
+            "Requires the 'native' reader. Default: False."
+        )
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=True,
+        metavar="PATH",
+        help=(
+            "Write a JSON report of the wall time, CPU time, bytes read, records decoded, files skipped and\n"
+            "peak RSS of every stage (discovery, extraction, aggregation, writing) and every event file.\n"
+            f"Without PATH the report is written to '<logs_dir>/{PROFILE_FILE}'. Default: disabled."
+        )
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        metavar="PATH",
+        help="Write a cProfile dump of the main process to PATH (inspect with 'python -m pstats PATH'). Default: disabled."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="Number of worker processes used to extract event files (0 for one per CPU). Default: 1."
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Maximum number of directory levels below the logs directory searched for event files (2 for 'model/run/'). Default: unlimited."
+    )
+    parser.add_argument(
+        "--exclude",
+        type=str,
+        help=(
+            "Inline list of glob patterns of directories to skip when searching for event files.\n"
+            "Patterns are matched against directory names and paths relative to the logs directory.\n"
+            "For example: '[\"checkpoints/\", \"*/debug_*\"]'."
+        )
+    )
+    parser.add_argument(
+        "--discovery-threads",
+        type=int,
+        help="Number of threads used to search the logs directory for event files. Default: 1."
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=True,
+        metavar="PATH",
+        help=(
+            "Cache extraction results so unchanged event files are not re-read on the next run\n"
+            "and event files that were appended to are only read from where the last run stopped.\n"
+            f"Without PATH the cache is stored in '<logs_dir>/{DEFAULT_CACHE_FILE}'. Default: disabled."
+        )
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        help="Maximum number of event files kept in the cache. Default: 100000."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and update the CSV files whenever event files change.\n"
+            "Changes are detected with inotify if 'inotify_simple' is installed, otherwise by polling."
+        )
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        help="Maximum number of seconds between two updates in watch mode. Default: 5."
+    )
+    parser.add_argument(
+        "--reductions",
+        type=str,
+        help=(
+            "Inline list of reductions computed per metric in a single pass instead of the last value:\n"
+            "  - 'last': last logged value, keeps the plain metric name.\n"
+            "  - 'min' / 'max': best value so far.\n"
+            "  - 'step:<N>': value at step N (or the last value before it).\n"
+            "  - 'mean_last:<K>': mean of the last K logged values.\n"
+            "  - 'at_best:<tag>:<min|max>': value at the step where <tag> was best.\n"
+            "Reduced metrics are named '<metric>@<reduction>'.\n"
+            "For example: '[\"last\", \"max\", \"at_best:val/loss:min\"]'. Default: last value only."
+        )
+    )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        choices=OUTPUT_FORMATS,
+        help=(
+            "Format of the output files:\n"
+            "  - 'csv' writes formatted text tables.\n"
+            "  - 'parquet' and 'feather' (Arrow IPC) write typed float columns with dictionary-encoded\n"
+            "    model and run names. Requires pyarrow ('pip install tb-to-csv[parquet]').\n"
+            "Watch mode and time series export always write CSV. Default: 'csv' if not specified in the config."
+        )
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        help="Compression codec of 'parquet' and 'feather' files (e.g. 'zstd', 'lz4', 'snappy'). Default: pyarrow's default."
+    )
+    parser.add_argument(
+        "--partial-state",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Instead of the output files, write the mergeable per-metric statistics (count, mean, M2, min, max)\n"
+            "of the processed runs to PATH. Combine the files of all jobs with --merge."
+        )
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        metavar="INDEX/COUNT",
+        help="Only process every COUNT-th event file starting at INDEX (e.g. '3/10'), to split a sweep across jobs."
+    )
+    parser.add_argument(
+        "--merge",
+        type=str,
+        nargs="+",
+        metavar="PATH",
+        help=(
+            "Merge partial state files written with --partial-state into the final output files in the logs directory.\n"
+            "The partial states must cover disjoint runs. Intervals are always parametric."
+        )
+    )
+    parser.add_argument(
+        "--time-series",
+        nargs="?",
+        const=True,
+        metavar="PATH",
+        help=(
+            "Export the full learning curves instead of the last values, as (model, run, tag, step, wall_time, value)\n"
+            "rows streamed from the event files in chunks. Only tags matching the prefixes are exported.\n"
+            f"Without PATH the rows are written to '<logs_dir>/{TIME_SERIES_FILE}'. Default: disabled."
+        )
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help=f"Maximum number of time series rows held in memory per worker. Default: {DEFAULT_CHUNK_SIZE}."
+    )
     args = parser.parse_args()
 
     # Load configuration from YAML file if provided
@@ -181,6 +440,150 @@ def main() -> None:
     confidence: float = args.confidence or config.get("confidence", 0.95)
     combine_columns: bool = not args.separate_columns if args.separate_columns is not None else config.get("combine_columns", True)
     include_step: bool = args.include_step or config.get("include_step", False)
+    reader: str = args.reader or config.get("reader", "native")
+    jobs: int = args.jobs if args.jobs is not None else config.get("jobs", 1)
+    bounded_memory: bool = args.bounded_memory or config.get("bounded_memory", False)
+    report_memory: bool = args.report_memory or config.get("report_memory", False)
+    timing: bool = args.timing or config.get("timing", False)
+    max_depth: Optional[int] = args.max_depth if args.max_depth is not None else config.get("max_depth", None)
+    exclude: Optional[List[str]] = parse_inline_argument(args.exclude) if args.exclude else config.get("exclude", None)
+    discovery_threads: int = args.discovery_threads or config.get("discovery_threads", 1)
+    cache: Union[bool, str] = args.cache if args.cache is not None else config.get("cache", False)
+    cache_path: Optional[str] = os.path.join(logs_dir, DEFAULT_CACHE_FILE) if cache is True else cache or None
+    cache_max_entries: int = args.cache_max_entries or config.get("cache_max_entries", 100_000)
+    watch: bool = args.watch or config.get("watch", False)
+    poll_interval: float = args.poll_interval or config.get("poll_interval", 5.0)
+    ci_method: str = args.ci_method or config.get("ci_method", "parametric")
+    bootstrap_resamples: int = args.bootstrap_resamples or config.get("bootstrap_resamples", 10_000)
+    seed: int = args.seed if args.seed is not None else config.get("seed", 0)
+    reductions: Optional[List[str]] = parse_inline_argument(args.reductions) if args.reductions else config.get("reductions", None)
+    if reductions == ["last"]:
+        # Same output as no reductions, but keeps the incremental native reader and cache offsets
+        reductions = None
+    output_format: str = args.output_format or config.get("output_format", "csv")
+    compression: Optional[str] = args.compression or config.get("compression", None)
+    partial_state: Optional[str] = args.partial_state or config.get("partial_state", None)
+    shard: Optional[Tuple[int, int]] = parse_shard(args.shard or config["shard"]) if args.shard or config.get("shard") else None
+    merge: Optional[List[str]] = args.merge or config.get("merge", None)
+    time_series: Union[bool, str] = args.time_series if args.time_series is not None else config.get("time_series", False)
+    chunk_size: int = args.chunk_size or config.get("chunk_size", DEFAULT_CHUNK_SIZE)
+    profile: Union[bool, str] = args.profile if args.profile is not None else config.get("profile", False)
+    profile_path: Optional[str] = os.path.join(logs_dir, PROFILE_FILE) if profile is True else profile or None
+    cprofile_path: Optional[str] = args.cprofile or config.get("cprofile", None)
+    reports: Optional[List[Dict[str, Any]]] = config.get("reports", None)
+    check_timing_reader(reader, timing)
+    resolve_jobs(jobs)
+    check_mode_options({
+        "time_series": time_series,
+        "merge": merge,
+        "watch": watch,
+        "reports": reports,
+        "partial_state": partial_state,
+        "cache": cache,
+        "shard": shard,
+        "profile": profile,
+        "cprofile": cprofile_path,
+        "timing": timing,
+        "reductions": reductions,
+        "output_format": output_format,
+        "compression": compression,
+    })
+
+    if time_series:
+        export_time_series(
+            logs_dir,
+            None if time_series is True else time_series,
+            prefix_file_mapping,
+            jobs=jobs,
+            chunk_size=chunk_size,
+            max_depth=max_depth,
+            exclude=exclude,
+            discovery_threads=discovery_threads,
+        )
+        return
+
+    if merge:
+        merge_and_save_metrics(
+            merge,
+            logs_dir,
+            prefix_file_mapping,
+            model_name_mapping,
+            model_sort_order,
+            metric_name_mapping,
+            metric_sort_order,
+            confidence,
+            combine_columns,
+            include_step,
+            output_format=output_format,
+            compression=compression,
+        )
+        return
+
+    if watch:
+        watch_and_save_metrics(
+            logs_dir,
+            prefix_file_mapping,
+            model_name_mapping,
+            model_sort_order,
+            metric_name_mapping,
+            metric_sort_order,
+            compute_ci,
+            confidence,
+            combine_columns,
+            include_step,
+            reader=reader,
+            jobs=jobs,
+            max_depth=max_depth,
+            exclude=exclude,
+            discovery_threads=discovery_threads,
+            bounded_memory=bounded_memory,
+            report_memory=report_memory,
+            reductions=reductions,
+            ci_method=ci_method,
+            bootstrap_resamples=bootstrap_resamples,
+            seed=seed,
+            poll_interval=poll_interval,
+            timing=timing,
+        )
+        return
+
+    if reports:
+        # Top-level settings are the defaults of every report
+        defaults = {
+            "prefix_file_mapping": prefix_file_mapping,
+            "model_name_mapping": model_name_mapping,
+            "model_sort_order": model_sort_order,
+            "metric_name_mapping": metric_name_mapping,
+            "metric_sort_order": metric_sort_order,
+            "compute_ci": compute_ci,
+            "confidence": confidence,
+            "ci_method": ci_method,
+            "bootstrap_resamples": bootstrap_resamples,
+            "seed": seed,
+            "combine_columns": combine_columns,
+            "include_step": include_step,
+            "output_format": output_format,
+            "compression": compression,
+        }
+        save_reports(
+            logs_dir,
+            [{**defaults, **report} for report in reports],
+            reader=reader,
+            jobs=jobs,
+            cache_path=cache_path,
+            cache_max_entries=cache_max_entries,
+            max_depth=max_depth,
+            exclude=exclude,
+            discovery_threads=discovery_threads,
+            bounded_memory=bounded_memory,
+            report_memory=report_memory,
+            reductions=reductions,
+            shard=shard,
+            profile_path=profile_path,
+            cprofile_path=cprofile_path,
+            timing=timing,
+        )
+        return
 
     # Process and save metrics
     process_and_save_metrics(
@@ -193,7 +596,27 @@ def main() -> None:
         compute_ci,
         confidence,
         combine_columns,
-        include_step
+        include_step,
+        reader=reader,
+        jobs=jobs,
+        cache_path=cache_path,
+        cache_max_entries=cache_max_entries,
+        max_depth=max_depth,
+        exclude=exclude,
+        discovery_threads=discovery_threads,
+        bounded_memory=bounded_memory,
+        report_memory=report_memory,
+        output_format=output_format,
+        compression=compression,
+        reductions=reductions,
+        ci_method=ci_method,
+        bootstrap_resamples=bootstrap_resamples,
+        seed=seed,
+        partial_state_path=partial_state,
+        shard=shard,
+        profile_path=profile_path,
+        cprofile_path=cprofile_path,
+        timing=timing,
     )
 
 
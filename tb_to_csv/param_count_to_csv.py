@@ -1,25 +1,158 @@
 import importlib
 import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 import yaml
-from torch_uncertainty.models.resnet import (
-    batched_resnet,
-    packed_resnet,
-    resnet,
-    ensemble_resnet
-)
-from torch_uncertainty.models.wrappers.mc_dropout import mc_dropout
-
-def instantiate_model(class_path, init_args):
-    """Dynamically import and instantiate a model."""
+from tb_to_csv.core.event_file_utils import resolve_jobs
+
+CACHE_VERSION = 1
+
+@lru_cache(maxsize=None)
+def resolve_model_class(class_path):
+    """Import the module of a model class (e.g. 'torch_uncertainty.models.resnet.resnet') and return the class.
+
+    Modules are only imported when a config refers to them, and each class path is resolved
+    once per process.
+    """
     module_name, class_name = class_path.rsplit(".", 1)
     module = importlib.import_module(module_name)
-    model_class = getattr(module, class_name)
-    return model_class(**init_args)
+    return getattr(module, class_name)
+
+def _construct(model_class, init_args, meta=False):
+    if not meta:
+        return model_class(**init_args)
+
+    import torch
+
+    with torch.device("meta"):
+        return model_class(**init_args)
+
+def instantiate_model(class_path, init_args, meta=False):
+    """Dynamically import and instantiate a model.
+
+    Args:
+        class_path (str): Import path of the model class, e.g. 'torch_uncertainty.models.resnet.resnet'.
+        init_args (Dict[str, Any]): Keyword arguments of the model class.
+        meta (bool): Build the model on PyTorch's 'meta' device, which records parameter shapes
+            without allocating or initializing any storage. Requires torch >= 2.0.
+    """
+    return _construct(resolve_model_class(class_path), init_args, meta)
 
 def count_parameters(model):
     """Count the number of parameters in a model."""
     return sum(p.numel() for p in model.parameters())
 
+def time_model_parameters(class_path, init_args, meta=False) -> Tuple[int, Dict[str, float]]:
+    """Instantiate a model, count its parameters and time each step.
+
+    Models that cannot be built on the meta device (e.g. because their constructor reads
+    weight values) are built with real weights instead.
+
+    Returns:
+        Tuple[int, Dict[str, float]]: The parameter count and the seconds spent on importing
+        the model class ('import'), building the model ('construction') and counting ('counting').
+    """
+    start = time.perf_counter()
+    model_class = resolve_model_class(class_path)
+    resolved = time.perf_counter()
+    model = None
+    if meta:
+        try:
+            model = _construct(model_class, init_args, meta=True)
+        except (NotImplementedError, RuntimeError) as error:
+            print(f"⚠️  Could not build {class_path} on the meta device ({error}). Using real weights...")
+    if model is None:
+        model = _construct(model_class, init_args)
+    constructed = time.perf_counter()
+    count = count_parameters(model)
+    timings = {"import": resolved - start, "construction": constructed - resolved, "counting": time.perf_counter() - constructed}
+    return count, timings
+
+def count_model_parameters(class_path, init_args, meta=False):
+    """Instantiate a model and count its parameters (see ``time_model_parameters``)."""
+    return time_model_parameters(class_path, init_args, meta)[0]
+
+def config_hash(class_path, init_args):
+    """Hash of a model config, used as its key in the parameter count cache."""
+    payload = json.dumps({"class_path": class_path, "init_args": init_args}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def load_cache(cache_path: Optional[str]) -> Dict[str, int]:
+    """Load cached parameter counts keyed by ``config_hash``. Returns an empty cache if the file is missing or unreadable."""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError) as error:
+        print(f"⚠️  Could not read cache {cache_path} ({error}). Starting with an empty cache.")
+        return {}
+    return data.get("counts", {}) if data.get("version") == CACHE_VERSION else {}
+
+def save_cache(counts: Dict[str, int], cache_path: str) -> None:
+    """Write the parameter count cache atomically, through a temporary file unique to this process."""
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(cache_path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(cache_path)))
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump({"version": CACHE_VERSION, "counts": counts}, file)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def count_all_parameters(model_configs: Dict[str, Dict[str, Any]], jobs: int = 1, meta: bool = False, cache_path: Optional[str] = None) -> Dict[str, int]:
+    """Count the parameters of every configured model.
+
+    Args:
+        model_configs (Dict[str, Dict[str, Any]]): 'class_path' and 'init_args' of each model.
+        jobs (int): Number of worker processes building models in parallel (0 for one per CPU).
+        meta (bool): Build the models on the meta device instead of allocating their weights.
+        cache_path (Optional[str]): Cache file of counts keyed by a hash of 'class_path' and
+            'init_args'. Models with unchanged configs are not built again. Disabled if None.
+
+    Returns:
+        Dict[str, int]: Parameter count of each model, in the order of ``model_configs``.
+
+    Raises:
+        ValueError: If jobs is negative.
+    """
+    jobs = resolve_jobs(jobs)
+    cache = load_cache(cache_path)
+    keys = {name: config_hash(config["class_path"], config.get("init_args", {})) for name, config in model_configs.items()}
+    pending = []
+    for model_name in model_configs:
+        if keys[model_name] in cache:
+            print(f"Using cached count for model: {model_name}")
+        else:
+            pending.append(model_name)
+
+    calls = [(model_configs[name]["class_path"], model_configs[name].get("init_args", {}), meta) for name in pending]
+    if jobs == 1 or len(pending) <= 1:
+        results = []
+        for model_name, call in zip(pending, calls):
+            print(f"Processing model: {model_name}")
+            results.append(time_model_parameters(*call))
+    else:
+        print(f"Processing {len(pending)} models in {min(jobs, len(pending))} worker processes...")
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            results = list(executor.map(time_model_parameters, *zip(*calls)))
+
+    for model_name, (count, timings) in zip(pending, results):
+        cache[keys[model_name]] = count
+        print(
+            f"⏱️  {model_name}: import {timings['import']:.2f}s, "
+            f"construction {timings['construction']:.2f}s, counting {timings['counting']:.2f}s"
+        )
+    if cache_path and pending:
+        save_cache(cache, cache_path)
+    return {model_name: cache[keys[model_name]] for model_name in model_configs}
+
 def save_to_csv(data, output_path):
     """Save model parameter counts to a CSV file."""
     with open(output_path, mode="w", newline="") as file:
@@ -27,16 +160,12 @@ def save_to_csv(data, output_path):
         writer.writerow(data.keys())  # Write header row
         writer.writerow(data.values())  # Write parameter counts
 
-def main(config_path, output_path):
+def main(config_path, output_path, jobs=1, meta=False, cache_path=None):
     """Main function to count parameters and save to CSV."""
     with open(config_path, "r") as file:
         model_configs = yaml.safe_load(file)
 
-    param_counts = {}
-    for model_name, config in model_configs.items():
-        print(f"Processing model: {model_name}")
-        model = instantiate_model(config["class_path"], config["init_args"])
-        param_counts[model_name] = count_parameters(model)
+    param_counts = count_all_parameters(model_configs, jobs, meta, cache_path)
 
     save_to_csv(param_counts, output_path)
     print(f"Parameter counts saved to {output_path}")
@@ -47,6 +176,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Count model parameters and save to CSV.")
     parser.add_argument("-c", "--config", type=str, required=True, help="Path to the YAML configuration file.")
     parser.add_argument("-o", "--output", type=str, required=True, help="Path to save the CSV file.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes building models (0 for one per CPU). Default: 1.")
+    parser.add_argument("--meta", action="store_true", help="Build models on the meta device without allocating weights (requires torch >= 2.0).")
+    parser.add_argument("--cache", type=str, metavar="PATH", help="Cache counts by a hash of 'class_path' and 'init_args' in PATH to skip unchanged models on re-runs.")
     args = parser.parse_args()
 
-    main(args.config, args.output)
+    main(args.config, args.output, args.jobs, args.meta, args.cache)
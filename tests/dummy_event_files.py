@@ -0,0 +1,24 @@
+import numpy as np
+from tensorboard.compat.proto import event_pb2, summary_pb2
+from tensorboard.summary.writer.event_file_writer import EventFileWriter
+from tensorboard.util import tensor_util
+
+
+def write_event_file(log_dir, steps=3, offset=0.0):
+    """Write a real TensorBoard event file with scalar, tensor-scalar and histogram summaries."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    writer = EventFileWriter(str(log_dir))
+    for step in range(steps):
+        summary = summary_pb2.Summary(value=[
+            summary_pb2.Summary.Value(tag="test/Acc", simple_value=0.5 + step / 10 + offset),
+            summary_pb2.Summary.Value(tag="test/Loss", simple_value=1.0 - step / 10 + offset),
+            summary_pb2.Summary.Value(
+                tag="test/NLL",
+                tensor=tensor_util.make_tensor_proto(np.float64(2.0 + step + offset)),
+                metadata=summary_pb2.SummaryMetadata(plugin_data=summary_pb2.SummaryMetadata.PluginData(plugin_name="scalars")),
+            ),
+            summary_pb2.Summary.Value(tag="test/Hist", histo=summary_pb2.HistogramProto(min=0.0, max=1.0, num=2)),
+        ])
+        writer.add_event(event_pb2.Event(wall_time=100.0 + step, step=step, summary=summary))
+    writer.close()
+    return str(next(log_dir.glob("events.out.tfevents.*")))
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from tb_to_csv.core.aggregate_state import AggregateState, load_partial_states
+from tb_to_csv.core.aggregation import compute_ci_table, merge_and_save_metrics, process_and_save_metrics
+from tb_to_csv.core.metric_store import MetricStore
+from dummy_event_files import write_event_file
+
+
+def test_merged_shards_match_single_pass(tmp_path):
+    rng = np.random.default_rng(0)
+    runs = [(f"model_{index % 3}", {"test": {"Acc": rng.random(), "ECE": rng.random()}}) for index in range(20)]
+
+    store = MetricStore()
+    shards = [AggregateState() for _ in range(3)]
+    for index, (model_key, metrics) in enumerate(runs):
+        store.add_run(model_key, f"run_{index}", metrics)
+        shards[index % 3].add_run(model_key, metrics)
+    for index, shard in enumerate(shards):
+        shard.save(str(tmp_path / f"{index}.json"))
+
+    merged = AggregateState.merged(AggregateState.load(str(tmp_path / f"{index}.json")) for index in range(3))
+    table = merged.to_report_table(0.9)
+    expected = compute_ci_table(store, 0.9)
+    order = [table.row_names.index(model_key) for model_key in expected.row_names]
+    columns = [table.columns.index(column) for column in expected.columns]
+    np.testing.assert_allclose(table.values[np.ix_(order, columns)], expected.values, rtol=1e-12)
+    np.testing.assert_allclose(table.margins[np.ix_(order, columns)], expected.margins, rtol=1e-9)
+
+    values = [metrics["test"]["Acc"] for model_key, metrics in runs if model_key == "model_1"]
+    count, _, _, minimum, maximum = merged.cells[("model_1", "test", "Acc")]
+    assert (count, minimum, maximum) == (len(values), min(values), max(values))
+
+
+def test_sharded_cli_flow_matches_single_run(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for model_key in ["model_a", "model_b"]:
+        for seed in range(3):
+            write_event_file(logs_dir / model_key / f"seed_{seed}", offset=seed / 10)
+
+    arguments = (["test"], {}, None, {}, None)
+    process_and_save_metrics(str(logs_dir), *arguments, True, 0.95, True, False)
+    expected = (logs_dir / "test_metrics.csv").read_text()
+
+    partials = [str(tmp_path / f"part_{index}.json") for index in range(2)]
+    for index, partial in enumerate(partials):
+        process_and_save_metrics(str(logs_dir), *arguments, True, 0.95, True, False, partial_state_path=partial, shard=(index, 2))
+    (logs_dir / "test_metrics.csv").unlink()
+    merge_and_save_metrics(partials, str(logs_dir), *arguments, 0.95, True, False)
+    assert (logs_dir / "test_metrics.csv").read_text() == expected
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text('{"version": 99, "entries": {}}')
+    with pytest.raises(ValueError):
+        AggregateState.load(str(path))
+
+
+def test_merge_rejects_partial_states_that_do_not_belong_together(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for seed in range(2):
+        write_event_file(logs_dir / "model_a" / f"seed_{seed}", offset=seed / 10)
+    arguments = (["test"], {}, None, {}, None, True, 0.95, True, False)
+
+    def write_partial(name, **kwargs):
+        path = str(tmp_path / f"{name}.json")
+        process_and_save_metrics(str(logs_dir), *arguments, partial_state_path=path, **kwargs)
+        return path
+
+    shard_0, shard_1 = write_partial("shard_0", shard=(0, 2)), write_partial("shard_1", shard=(1, 2))
+    assert len(load_partial_states([shard_0, shard_1])) == 2
+    with pytest.raises(ValueError, match="more than once"):
+        load_partial_states([shard_0, shard_0])
+    with pytest.raises(ValueError, match="both shard 0 of 2"):
+        load_partial_states([shard_0, write_partial("copy", shard=(0, 2))])
+    with pytest.raises(ValueError, match="split into 2 shards"):
+        load_partial_states([shard_0, write_partial("thirds", shard=(1, 3))])
+    with pytest.raises(ValueError, match="different settings.*reductions, timing"):
+        load_partial_states([shard_0, write_partial("other", shard=(1, 2), reductions=["max"], timing=True)])
+
+
+def test_nan_values_are_missing_in_both_paths():
+    runs = [("model_a", {"test": {"Acc": value, "ECE": 0.1 * index}}) for index, value in enumerate([0.5, float("nan"), 0.7])]
+    store, state = MetricStore(), AggregateState()
+    for index, (model_key, metrics) in enumerate(runs):
+        store.add_run(model_key, f"run_{index}", metrics)
+        state.add_run(model_key, metrics)
+
+    expected = compute_ci_table(store, 0.95)
+    table = state.to_report_table(0.95)
+    assert table.columns == expected.columns
+    np.testing.assert_allclose(table.values, expected.values)
+    np.testing.assert_allclose(table.margins, expected.margins)
+    assert table.values[0, table.columns.index(("test", "Acc"))] == pytest.approx(0.6)
+
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
-from tb_to_csv.core.aggregation import process_and_save_metrics
+from tb_to_csv.core.aggregation import build_csv_tables, compute_bootstrap_table, compute_ci_table, process_and_save_metrics
 from tb_to_csv.core.event_file_utils import find_event_files
+from tb_to_csv.core.metric_store import MetricStore
+from dummy_event_files import write_event_file
 
 def test_process_and_save_metrics(tmp_path):
     # Create a mock logs directory with event files
@@ -36,4 +39,72 @@ def test_process_and_save_metrics(tmp_path):
     event_files = find_event_files(str(logs_dir))
     assert len(event_files) > 0
 
-    # TODO: Add more test cases to cover all cases
\ No newline at end of file
+    # TODO: Add more test cases to cover all cases
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for model in ["model_a", "model_b"]:
+        for seed in range(3):
+            write_event_file(logs_dir / model / f"seed_{seed}", offset=seed / 100)
+
+    outputs = []
+    for jobs in [1, 2]:
+        process_and_save_metrics(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False, jobs=jobs)
+        outputs.append((logs_dir / "test_metrics.csv").read_bytes())
+
+    assert outputs[0] == outputs[1]
+    assert b"model_a" in outputs[0] and b"model_b" in outputs[0]
+
+    with pytest.raises(ValueError, match="number of jobs"):
+        process_and_save_metrics(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False, jobs=-1)
+
+
+def test_timing_columns(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for seed in range(2):
+        write_event_file(logs_dir / "model_a" / f"seed_{seed}", steps=3)
+    cache_path = str(tmp_path / "cache.json")
+
+    for _ in range(2):  # The second run is served from the cache
+        process_and_save_metrics(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, False, False, cache_path=cache_path, timing=True)
+        header, row = (logs_dir / "test_metrics.csv").read_text().splitlines()
+        columns = dict(zip(header.split(","), row.split(",")))
+        assert float(columns["duration Mean"]) == 2.0 and float(columns["steps Mean"]) == 2.0
+        assert float(columns["steps_per_second Mean"]) == 1.0
+
+    with pytest.raises(ValueError, match="native reader"):
+        # Rejected before the (missing) logs directory is searched
+        process_and_save_metrics(str(tmp_path / "missing"), ["test"], {}, None, {}, None, True, 0.95, False, False, reader="accumulator", timing=True)
+
+
+def test_build_csv_tables_with_prefix_file_dict():
+    model_metrics = {"model_a": {"test.csv": {"Acc": "0.9"}, "ood.csv": {"AUROC": "0.8"}}}
+    tables = build_csv_tables(model_metrics, {"test": "test.csv", "ood": "ood.csv"})
+    assert tables == {"test.csv": {"model_a": {"Acc": "0.9"}}, "ood.csv": {"model_a": {"AUROC": "0.8"}}}
+
+
+def test_bootstrap_table_does_not_depend_on_jobs():
+    store = MetricStore()
+    for model_key in ["model_a", "model_b", "model_c"]:
+        for seed in range(4):
+            store.add_run(model_key, f"seed_{seed}", {"test": {"Acc": 0.5 + seed / 10 + len(model_key) / 100, "ECE": seed / 100}})
+    serial = compute_bootstrap_table(store, method="bca", n_resamples=500, seed=3)
+    parallel = compute_bootstrap_table(store, method="bca", n_resamples=500, seed=3, jobs=2)
+    assert np.array_equal(serial.lower, parallel.lower) and np.array_equal(serial.upper, parallel.upper)
+    assert serial.to_model_metrics()["model_a"]["test"]["Acc"].startswith("0.720 [")
+
+
+def test_ci_tables_without_models_or_columns(tmp_path, capsys):
+    empty = compute_ci_table(MetricStore())
+    assert empty.values.shape == (0, 0) and empty.to_model_metrics() == {}
+
+    store = MetricStore()
+    store.add_run("model_a", "seed_0", {})
+    for table in [compute_ci_table(store), compute_bootstrap_table(store)]:
+        assert table.values.shape == (1, 0) and table.to_model_metrics() == {"model_a": {}}
+
+    logs_dir = tmp_path / "logs"
+    write_event_file(logs_dir / "model_a" / "seed_0")
+    process_and_save_metrics(str(logs_dir), ["nomatch"], {}, None, {}, None, True, 0.95, True, False)
+    assert "No metrics found" in capsys.readouterr().out
+
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+import pytest
+from tb_to_csv.core.event_file_utils import extract_metrics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from run_benchmarks import load_baseline, machine_info  # noqa: E402
+from synthetic_event_files import generate_logs  # noqa: E402
+
+
+def test_synthetic_logs_are_read_identically_by_both_readers(tmp_path):
+    paths = generate_logs(str(tmp_path), models=2, seeds=1, tags=6, steps=5, noise_every=2)
+    assert len(paths) == 2
+
+    native, native_step = extract_metrics(paths[0], reader="native")
+    accumulator, accumulator_step = extract_metrics(paths[0], reader="accumulator")
+    assert native_step == accumulator_step == 4
+    # The accumulator only exposes simple_value scalars; the native reader also decodes tensor scalars
+    assert set(native) - set(accumulator) == {"test/tensor_0", "test/tensor_1"}
+    assert {"test/metric_0", "shift/metric_1", "ood/metric_2", "train/metric_3"} <= set(accumulator)
+    for tag, value in accumulator.items():
+        assert native[tag] == pytest.approx(value)
+
+
+def test_baselines_from_other_machines_are_not_compared(tmp_path, capsys):
+    config = {"models": 1, "seeds": 1, "tags": 1, "steps": 1, "noise_every": 0}
+    machine = machine_info()
+    path = tmp_path / "baseline.json"
+    results = {"find_event_files": {"seconds": 0.1, "peak_mib": 0.0}}
+
+    path.write_text(json.dumps({"config": config, "machine": machine, "results": results}))
+    assert load_baseline(str(path), config, machine) == results
+    path.write_text(json.dumps({"config": config, "machine": {**machine, "cpu": "other"}, "results": results}))
+    assert load_baseline(str(path), config, machine) is None
+    assert "different machine" in capsys.readouterr().out
+
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
-from tb_to_csv.core.confidence_intervals import compute_confidence_interval
+from scipy.stats import bootstrap
+from tb_to_csv.core.confidence_intervals import bootstrap_confidence_intervals, compute_confidence_interval, compute_confidence_intervals
 
 def test_compute_confidence_interval_large_sample():
     data = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
@@ -18,4 +20,40 @@ def test_empty_data():
 
 def test_invalid_confidence_level():
     with pytest.raises(ValueError):
-        compute_confidence_interval([1, 2, 3], confidence=1.5)
\ No newline at end of file
+        compute_confidence_interval([1, 2, 3], confidence=1.5)
+
+def test_batched_matches_scalar():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(200, 40))
+    data[rng.random(data.shape) < rng.random((200, 1))] = np.nan
+    data[0] = np.nan
+
+    means, margins = compute_confidence_intervals(data, confidence=0.9)
+
+    assert np.isnan(means[0]) and np.isnan(margins[0])
+    for row, mean, margin in zip(data[1:], means[1:], margins[1:]):
+        values = row[~np.isnan(row)]
+        if len(values) < 2:
+            continue
+        assert (mean, margin) == compute_confidence_interval(list(values), confidence=0.9)
+
+def test_batched_invalid_confidence_level():
+    with pytest.raises(ValueError):
+        compute_confidence_intervals(np.ones((2, 3)), confidence=0)
+
+def test_bootstrap_is_seeded_and_masks_missing_values():
+    data = np.array([[0.1, 0.4, 0.2, 0.3, np.nan], [0.5, np.nan, np.nan, np.nan, np.nan], [np.nan] * 5])
+    means, lower, upper = bootstrap_confidence_intervals(data, method="bca", n_resamples=2000, seed=1)
+    assert np.array_equal(np.stack([means, lower, upper]), np.stack(bootstrap_confidence_intervals(data, method="bca", n_resamples=2000, seed=1)), equal_nan=True)
+    assert means[0] == pytest.approx(0.25)
+    assert lower[0] < means[0] < upper[0]
+    assert means[1] == 0.5 and np.isnan(lower[1]) and np.isnan(means[2])
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_bootstrap_matches_scipy(method):
+    data = np.random.default_rng(0).exponential(size=(3, 12))
+    _, lower, upper = bootstrap_confidence_intervals(data, confidence=0.9, method=method, n_resamples=20000)
+    for row, low, high in zip(data, lower, upper):
+        reference = bootstrap((row,), np.mean, confidence_level=0.9, n_resamples=20000, method="BCa" if method == "bca" else method, random_state=0).confidence_interval
+        assert low == pytest.approx(reference.low, rel=0.03)
+        assert high == pytest.approx(reference.high, rel=0.03)
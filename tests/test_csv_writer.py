@@ -16,4 +16,19 @@ def test_save_metrics_to_csv(tmp_path):
 
     assert rows[0] == ["Name", "Acc", "Loss"]
     assert rows[1] == ["Model A", "0.95 ±0.01", "0.1 ±0.02"]
-    assert rows[2] == ["Model B", "0.90 ±0.02", "0.15 ±0.03"]
\ No newline at end of file
+    assert rows[2] == ["Model B", "0.90 ±0.02", "0.15 ±0.03"]
+
+
+def test_sort_orders_and_summarized_warnings(tmp_path, capsys):
+    all_metrics = {f"model_{index}": {f"metric_{column}": str(index) for column in range(10)} for index in range(8)}
+    csv_path = tmp_path / "metrics.csv"
+    save_metrics_to_csv(all_metrics, str(csv_path), {"model_0": "Model 0"}, ["model_1", "model_0"], {"metric_9": "Last"}, ["metric_9", "metric_3"])
+
+    with open(csv_path, "r") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:4] == ["Name", "Last", "metric_3", "metric_0"]
+    assert [row[0] for row in rows[1:4]] == ["Model 0", "model_1", "model_2"]
+
+    warnings = capsys.readouterr().out.splitlines()
+    assert len(warnings) == 4
+    assert warnings[0] == "⚠️  6 models are not included in the model sort order. Adding them to the end: 'model_2', 'model_3', 'model_4', 'model_5', 'model_6' and 1 more."
@@ -30,10 +30,29 @@ def test_extract_metrics(tmp_path):
         MockEventAccumulator.return_value = mock_accumulator
 
         # Call the function
-        metrics, last_step = extract_metrics(str(event_file))
+        metrics, last_step = extract_metrics(str(event_file), reader="accumulator")
 
         # Assertions
         assert isinstance(metrics, dict)
         assert metrics["test/Acc"] == 0.95
         assert metrics["test/Loss"] == 0.1
-        assert last_step == 1
\ No newline at end of file
+        assert last_step == 1
+
+def test_find_event_files_latest_per_directory(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for run_dir in ["model1/seed_0", "model1/seed_1", "model2/seed_0", "model2/seed_0/checkpoints"]:
+        (logs_dir / run_dir).mkdir(parents=True)
+        (logs_dir / run_dir / "events.out.tfevents.1").write_text("dummy content")
+    newest = logs_dir / "model1" / "seed_0" / "events.out.tfevents.2"
+    newest.write_text("dummy content")
+    os.utime(newest, (2e9, 2e9))
+
+    relative = lambda files: [os.path.relpath(path, logs_dir) for path in files]
+    expected = [
+        os.path.join("model1", "seed_0", "events.out.tfevents.2"),
+        os.path.join("model1", "seed_1", "events.out.tfevents.1"),
+        os.path.join("model2", "seed_0", "events.out.tfevents.1"),
+    ]
+    assert relative(find_event_files(str(logs_dir), max_depth=2)) == expected
+    assert relative(find_event_files(str(logs_dir), exclude=["checkpoints/"], threads=2)) == expected
+    assert len(find_event_files(str(logs_dir))) == 4
@@ -0,0 +1,138 @@
+import struct
+import numpy as np
+from unittest.mock import patch
+from tb_to_csv.core import event_reader
+from tb_to_csv.core.event_file_utils import extract_metrics, extract_metrics_incremental, get_training_duration, resource
+from tb_to_csv.core.event_reader import TIMING_PREFIX, iter_records, iter_scalar_events, masked_crc32c, parse_scalar_event, read_last_scalars, resume_last_scalars
+from dummy_event_files import write_event_file
+
+
+def test_read_last_scalars(tmp_path):
+    event_file = write_event_file(tmp_path)
+    metrics, last_step = read_last_scalars(event_file)
+    assert metrics == {"test/Acc": np.float32(0.7), "test/Loss": np.float32(0.8), "test/NLL": 4.0}
+    assert last_step == 2
+
+
+def test_native_reader_matches_accumulator(tmp_path):
+    event_file = write_event_file(tmp_path)
+    native_metrics, native_step = extract_metrics(event_file, reader="native")
+    accumulator_metrics, accumulator_step = extract_metrics(event_file, reader="accumulator")
+    # The accumulator does not report tensor-encoded scalars
+    del native_metrics["test/NLL"]
+    assert native_metrics == accumulator_metrics
+    assert native_step == accumulator_step
+
+
+def test_iter_scalar_events_tag_filter(tmp_path):
+    event_file = write_event_file(tmp_path)
+    events = list(iter_scalar_events(event_file, tag_filter=lambda tag: tag == "test/Acc"))
+    assert [event.step for event in events] == [0, 1, 2]
+    assert [event.wall_time for event in events] == [100.0, 101.0, 102.0]
+
+
+def test_truncated_event_file(tmp_path):
+    event_file = write_event_file(tmp_path)
+    with open(event_file, "rb") as file:
+        data = file.read()
+    with open(event_file, "wb") as file:
+        file.write(data[:-5])
+    _, last_step = read_last_scalars(event_file)
+    assert last_step == 1
+
+
+def frame_record(data):
+    length = struct.pack("<Q", len(data))
+    return length + struct.pack("<I", masked_crc32c(length)) + data + struct.pack("<I", masked_crc32c(data))
+
+
+def test_corrupted_records_are_skipped(tmp_path, capsys):
+    event_file = write_event_file(tmp_path, steps=3)
+    with open(event_file, "rb") as file:
+        data = bytearray(file.read())
+        offsets = [offset for offset, _ in iter_records(file)]
+
+    # Flip a byte in the payload of the step 1 record and append a well-framed but truncated event
+    data[offsets[2] - 8] ^= 0xFF
+    data += frame_record(b"\x2a\x05\x0a")
+    with open(event_file, "wb") as file:
+        file.write(data)
+
+    events = list(iter_scalar_events(event_file))
+    assert sorted({event.step for event in events}) == [0, 2]
+    assert "Skipped 1 corrupted records" in capsys.readouterr().out
+    assert parse_scalar_event(b"\x2a\x05\x0a") is None
+    assert parse_scalar_event(b"\x2a\x06\x0a\x04\x0a\x02\xff\xfe") is None  # invalid UTF-8 tag
+
+
+def test_non_event_file(tmp_path):
+    event_file = tmp_path / "events.out.tfevents.12345"
+    event_file.write_text("dummy content")
+    assert read_last_scalars(str(event_file)) == ({}, None)
+
+
+def test_resume_last_scalars(tmp_path):
+    event_file = write_event_file(tmp_path / "full", steps=5)
+    with open(event_file, "rb") as file:
+        data = file.read()
+        offsets = [offset for offset, _ in iter_records(file)]
+
+    # Simulate a file that is still being written: only the file version event and two steps so far
+    growing_file = tmp_path / "events.out.tfevents.growing"
+    growing_file.write_bytes(data[:offsets[2]])
+    partial_state = resume_last_scalars(str(growing_file))
+    assert partial_state.last_step == 1
+    assert partial_state.offset == offsets[2]
+
+    growing_file.write_bytes(data)
+    with patch.object(event_reader, "parse_scalar_event", wraps=event_reader.parse_scalar_event) as mock_parse:
+        state = resume_last_scalars(str(growing_file), partial_state)
+    assert mock_parse.call_count == 3
+    assert state == resume_last_scalars(event_file)
+
+    # A file that shrank is read from the start
+    growing_file.write_bytes(data[:offsets[2]])
+    assert resume_last_scalars(str(growing_file), state) == partial_state
+
+
+def test_extract_metrics_tag_filter(tmp_path):
+    event_file = write_event_file(tmp_path)
+    for reader in ["native", "accumulator"]:
+        metrics, _ = extract_metrics(event_file, reader, tag_filter=lambda tag: tag == "test/Loss")
+        assert list(metrics) == ["test/Loss"]
+
+
+def test_bounded_memory_matches_default(tmp_path, capsys):
+    event_file = write_event_file(tmp_path, steps=5)
+    assert extract_metrics(event_file, "accumulator", bounded_memory=True) == extract_metrics(event_file, "accumulator")
+    assert get_training_duration(event_file, bounded_memory=True) == get_training_duration(event_file) == 4.0
+
+    extract_metrics_incremental(event_file, "accumulator", bounded_memory=True, report_memory=True)
+    output = capsys.readouterr().out
+    assert "Peak memory while reading" in output and "Python heap" in output
+    assert "peak RSS" in output or resource is None
+
+
+def test_timing_fields(tmp_path):
+    event_file = write_event_file(tmp_path, steps=5)
+    metrics, last_step = read_last_scalars(event_file, timing=True)
+    timing = {key: value for key, value in metrics.items() if key.startswith(TIMING_PREFIX)}
+    assert timing == {
+        TIMING_PREFIX + "first_wall_time": 100.0,
+        TIMING_PREFIX + "last_wall_time": 104.0,
+        TIMING_PREFIX + "first_step": 0,
+        TIMING_PREFIX + "last_step": 4,
+    }
+    assert timing[TIMING_PREFIX + "last_wall_time"] - timing[TIMING_PREFIX + "first_wall_time"] == get_training_duration(event_file)
+    assert (metrics.keys() - timing.keys(), last_step) == (read_last_scalars(event_file)[0].keys(), 4)
+
+    # Timing survives resuming from a partial read and is kept when no tag matches the filter
+    with open(event_file, "rb") as file:
+        data = file.read()
+        offsets = [offset for offset, _ in iter_records(file)]
+    growing_file = tmp_path / "events.out.tfevents.growing"
+    growing_file.write_bytes(data[:offsets[2]])
+    partial_state = resume_last_scalars(str(growing_file), timing=True)
+    growing_file.write_bytes(data)
+    assert resume_last_scalars(str(growing_file), partial_state, timing=True).metrics == metrics
+    assert read_last_scalars(event_file, lambda tag: False, timing=True)[0] == timing
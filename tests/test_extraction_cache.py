@@ -0,0 +1,78 @@
+from unittest.mock import patch
+from tb_to_csv.core.aggregation import aggregate_metrics_by_model
+from tb_to_csv.core.extraction_cache import ExtractionCache, file_identity
+from tb_to_csv.core.metric_processing import build_tag_filter
+from dummy_event_files import write_event_file
+
+
+def test_cache_roundtrip(tmp_path):
+    event_file = write_event_file(tmp_path / "model" / "seed_0")
+    cache_path = str(tmp_path / "cache.json")
+    identity = file_identity(event_file)
+
+    cache = ExtractionCache(cache_path)
+    assert cache.get(event_file, "native", identity) is None
+    cache.put(event_file, "native", identity, {"test/Acc": 0.5}, 2)
+    cache.save()
+
+    cache = ExtractionCache(cache_path)
+    assert cache.get(event_file, "native", identity) == ({"test/Acc": 0.5}, 2)
+    assert cache.get(event_file, "accumulator", identity) is None
+    assert cache.get(event_file, "native", (identity[0] + 1,) + identity[1:]) is None
+
+
+def test_cache_eviction(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.json"), max_entries=2)
+    for index in range(3):
+        cache.put(f"events.{index}", "native", (index, 0, 0), {}, None)
+    cache.get("events.0", "native", (0, 0, 0))
+    cache.save()
+
+    cache = ExtractionCache(str(tmp_path / "cache.json"), max_entries=2)
+    assert cache.get("events.0", "native", (0, 0, 0)) is not None
+    assert cache.get("events.1", "native", (1, 0, 0)) is None
+    assert cache.get("events.2", "native", (2, 0, 0)) is not None
+
+
+def test_cached_files_are_not_reread(tmp_path):
+    event_files = [write_event_file(tmp_path / "model" / f"seed_{seed}") for seed in range(2)]
+    cache = ExtractionCache(str(tmp_path / "cache.json"))
+    expected = aggregate_metrics_by_model(event_files, ["test"], cache=cache)
+
+    with patch("tb_to_csv.core.aggregation.extract_metrics_incremental") as mock_extract:
+        assert aggregate_metrics_by_model(event_files, ["test"], cache=cache) == expected
+        mock_extract.assert_not_called()
+    assert cache.hits == 2
+
+
+def test_appended_files_are_resumed(tmp_path):
+    event_file = write_event_file(tmp_path / "model" / "seed_0", steps=5)
+    with open(event_file, "rb") as file:
+        data = file.read()
+    with open(event_file, "wb") as file:
+        file.write(data[:len(data) // 2])
+
+    cache = ExtractionCache(str(tmp_path / "cache.json"))
+    aggregate_metrics_by_model([event_file], ["test"], cache=cache)
+    with open(event_file, "wb") as file:
+        file.write(data)
+
+    resume_state = cache.get_resume_state(event_file, "native", file_identity(event_file), build_tag_filter(["test"]))
+    assert resume_state is not None and 0 < resume_state.offset < len(data)
+    expected = aggregate_metrics_by_model([event_file], ["test"])
+    assert aggregate_metrics_by_model([event_file], ["test"], cache=cache) == expected
+
+
+def test_concurrent_saves_merge_entries(tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    ExtractionCache(cache_path).save()
+    shard_0, shard_1 = ExtractionCache(cache_path), ExtractionCache(cache_path)
+    shard_0.put("events.0", "native", (0, 0, 0), {"test/Acc": 0.1}, 1)
+    shard_1.put("events.1", "native", (1, 0, 0), {"test/Acc": 0.2}, 1)
+    shard_0.save()
+    shard_1.save()
+
+    cache = ExtractionCache(cache_path)
+    assert cache.get("events.0", "native", (0, 0, 0)) == ({"test/Acc": 0.1}, 1)
+    assert cache.get("events.1", "native", (1, 0, 0)) == ({"test/Acc": 0.2}, 1)
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
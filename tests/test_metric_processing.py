@@ -1,4 +1,6 @@
-from tb_to_csv.core.metric_processing import categorize_metrics
+import pickle
+from tb_to_csv.core.event_reader import TIMING_PREFIX
+from tb_to_csv.core.metric_processing import build_tag_filter, categorize_metrics, categorize_run
 
 def test_categorize_metrics():
     metrics = {
@@ -12,4 +14,44 @@ def test_categorize_metrics():
     assert "test" in categorized
     assert "shift" in categorized
     assert "ood" in categorized
-    assert categorized["test"]["Acc"] == 0.95
\ No newline at end of file
+    assert categorized["test"]["Acc"] == 0.95
+
+def test_build_tag_filter():
+    tag_filter = build_tag_filter({"test": "test.csv", "ood": "ood.csv"})
+    assert tag_filter("test/Acc")
+    assert tag_filter("ood/AUROC")
+    assert not tag_filter("testing/Acc")
+    assert not tag_filter("layer_3/grad_norm")
+    assert pickle.loads(pickle.dumps(tag_filter)) == tag_filter
+    assert build_tag_filter(None) is None
+
+def test_categorize_nested_and_glob_prefixes():
+    metrics = {
+        "ood/AUROC": 0.9,
+        "ood/svhn/AUROC": 0.8,
+        "ood/cifar100/AUROC": 0.7,
+        "ood/cifar100/test/FPR95": 0.3,
+        "test/Acc": 0.95,
+        "val/Acc": 0.94,
+    }
+    categorized = categorize_metrics(metrics, {"ood": "ood", "ood/*/": "ood_datasets", "ood/cifar100": "cifar100", "test": "test"})
+    assert categorized == {
+        "ood": {"AUROC": 0.9},
+        "ood_datasets": {"svhn/AUROC": 0.8},
+        "cifar100": {"AUROC": 0.7, "test/FPR95": 0.3},
+        "test": {"Acc": 0.95},
+    }
+    tag_filter = build_tag_filter(["ood/*_shift"])
+    assert tag_filter("ood/blur_shift/ECE") and not tag_filter("ood/svhn/ECE")
+    assert categorize_metrics({"test/x/test/y": 1.0}, ["test"]) == {"test": {"x/test/y": 1.0}}
+
+
+def test_categorize_run_keeps_logged_metrics_named_like_timing_columns(capsys):
+    fields = {"first_wall_time": 100.0, "last_wall_time": 104.0, "first_step": 0, "last_step": 8}
+    metrics = {"train/steps": 1000.0, "test/Acc": 0.9, **{TIMING_PREFIX + field: value for field, value in fields.items()}}
+    cached = dict(metrics)
+    categorized = categorize_run(metrics, ["train", "test"])
+    assert categorized["train"] == {"steps": 1000.0, "duration": 4.0, "steps_per_second": 2.0}
+    assert categorized["test"] == {"Acc": 0.9, "duration": 4.0, "steps": 8, "steps_per_second": 2.0}
+    assert "'train' has a logged metric 'steps'" in capsys.readouterr().out
+    assert metrics == cached
@@ -0,0 +1,47 @@
+import numpy as np
+from tb_to_csv.core.aggregation import compute_ci_by_model
+from tb_to_csv.core.confidence_intervals import compute_confidence_interval
+from tb_to_csv.core.metric_store import MetricStore
+
+
+def test_metric_store_columns():
+    store = MetricStore()
+    store.add_run("model_a", "seed_0", {"test": {"Acc": 0.9, "Loss": 0.1}})
+    store.add_run("model_a", "seed_1", {"test": {"Acc": 0.8}, "ood": {"AUROC": 0.7}})
+    store.add_run("model_b", "seed_0", {"test": {"Acc": 0.5}})
+    store.add_run("model_a", "seed_0", {"test": {"Acc": 0.95}})
+
+    assert store.models == ["model_a", "model_b"]
+    assert store.columns == [("test", "Acc"), ("test", "Loss"), ("ood", "AUROC")]
+    assert list(store.row_models) == [0, 0, 1]
+    np.testing.assert_array_equal(store.values, [[0.95, 0.1, np.nan], [0.8, np.nan, 0.7], [0.5, np.nan, np.nan]])
+    assert [list(rows) for rows in store.model_rows()] == [[0, 1], [2]]
+
+
+def test_metric_store_roundtrip():
+    model_metrics = {
+        "model_a": {"test": {"Acc": {"seed_0": 0.9, "seed_1": 0.8}}, "ood": {"AUROC": {"seed_1": 0.7}}},
+        "model_b": {"test": {"Acc": {"seed_0": 0.5}}},
+    }
+    assert MetricStore.from_model_metrics(model_metrics).to_model_metrics() == model_metrics
+
+
+def test_run_table():
+    store = MetricStore()
+    store.add_run("model_a", "seed_0", {"test": {"Acc": 0.9}})
+    store.add_run("model_a", "seed_1", {"ood": {"AUROC": 0.7}})
+    assert store.run_table().to_model_metrics() == {
+        "model_a/seed_0": {"test": {"Acc": 0.9}},
+        "model_a/seed_1": {"ood": {"AUROC": 0.7}},
+    }
+
+
+def test_compute_ci_by_model():
+    runs = {"seed_0": 0.9, "seed_1": 0.8, "seed_2": 0.85}
+    model_metrics = {"model_a": {"test": {"Acc": runs, "Loss": {"seed_0": 0.1, "seed_1": 0.2}}}}
+    mean, margin = compute_confidence_interval(list(runs.values()))
+
+    ci_metrics = compute_ci_by_model(model_metrics, combine_columns=False)
+    assert ci_metrics["model_a"]["test"]["Acc Mean"] == f"{mean:.3f}"
+    assert ci_metrics["model_a"]["test"]["Acc ± CI"] == f"{margin:.3f}"
+    assert "Loss Mean" in ci_metrics["model_a"]["test"]
@@ -0,0 +1,33 @@
+import os
+import sys
+import pytest
+from tb_to_csv import metrics_to_csv
+from tb_to_csv.metrics_to_csv import check_mode_options
+from dummy_event_files import write_event_file
+
+EXAMPLE_CONFIG = os.path.join(os.path.dirname(metrics_to_csv.__file__), "example_config.yaml")
+
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["tb-to-csv", "--config", EXAMPLE_CONFIG, *args])
+    metrics_to_csv.main()
+
+
+def test_example_config_supports_time_series_and_merge(tmp_path, monkeypatch):
+    logs_dir = tmp_path / "logs"
+    for seed in range(2):
+        write_event_file(logs_dir / "standard" / f"seed_{seed}")
+    state_path = str(tmp_path / "state.json")
+
+    run_cli(monkeypatch, "--logs-dir", str(logs_dir), "--time-series")
+    assert (logs_dir / "time_series.csv").exists()
+
+    run_cli(monkeypatch, "--logs-dir", str(logs_dir), "--partial-state", state_path)
+    run_cli(monkeypatch, "--logs-dir", str(logs_dir), "--merge", state_path)
+    assert (logs_dir / "test_metrics.csv").exists()
+
+
+def test_only_options_that_change_behaviour_conflict():
+    check_mode_options({"time_series": True, "reductions": ["last"], "output_format": "csv", "cache": False})
+    with pytest.raises(ValueError, match="'time_series' cannot be combined with 'reductions', 'output_format'"):
+        check_mode_options({"time_series": True, "reductions": ["max"], "output_format": "parquet"})
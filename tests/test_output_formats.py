@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from tb_to_csv.core.metric_store import ReportTable
+from tb_to_csv.core.output_formats import output_file_name, report_to_arrow, save_report, split_report_columns
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+
+def make_table():
+    columns = [("test", "Acc"), ("test", "NLL"), ("shift", "Acc")]
+    values = np.array([[0.9, 0.3, np.nan], [0.8, 0.4, 0.5]])
+    margins = np.array([[0.01, 0.02, np.nan], [0.03, 0.04, 0.05]])
+    return ReportTable(["model_a", "model_b"], columns, values, margins)
+
+
+def test_split_report_columns():
+    table = make_table()
+    assert split_report_columns(table, ["test", "shift", "ood"]) == {"test_metrics.csv": [0, 1], "shift_metrics.csv": [2], "ood_metrics.csv": []}
+    assert output_file_name("test_metrics.csv", "parquet") == "test_metrics.parquet"
+
+
+def test_save_parquet_report(tmp_path):
+    paths = save_report(make_table(), str(tmp_path), ["test", "shift"], "parquet", "zstd", {"model_b": "Model B"}, ["model_b", "model_a"], {"Acc": "Acc↑"}, ["NLL"])
+    assert paths == [str(tmp_path / "test_metrics.parquet"), str(tmp_path / "shift_metrics.parquet")]
+
+    table = pq.read_table(paths[0])
+    assert table.column_names == ["model", "NLL", "NLL ± CI", "Acc↑", "Acc↑ ± CI"]
+    assert pa.types.is_dictionary(table.schema.field("model").type)
+    assert pa.types.is_float64(table.schema.field("Acc↑").type)
+    assert table.column("model").to_pylist() == ["Model B", "model_a"]
+    assert table.column("Acc↑").to_pylist() == [0.8, 0.9]
+    assert pq.read_table(paths[1]).column("Acc↑").to_pylist() == [0.5, None]
+
+
+def test_save_feather_run_report(tmp_path):
+    table = ReportTable(["model_a/seed_0", "model_a/seed_1"], [("test", "Acc")], np.array([[0.9], [0.8]]))
+    (path,) = save_report(table, str(tmp_path), ["test"], "feather")
+    result = feather.read_table(path)
+    assert result.column_names == ["model", "run", "Acc"]
+    assert result.column("run").to_pylist() == ["seed_0", "seed_1"]
+
+
+def test_duplicate_column_names_are_rejected():
+    table = make_table()
+    with pytest.raises(ValueError, match="'test' and 'shift' both have a metric 'Acc'"):
+        report_to_arrow(table, [0, 1, 2])
+    with pytest.raises(ValueError, match="'NLL' is mapped to 'Acc'"):
+        report_to_arrow(table, [0, 1], metric_name_mapping={"NLL": "Acc"})
+
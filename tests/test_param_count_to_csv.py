@@ -0,0 +1,75 @@
+import json
+import subprocess
+import sys
+import pytest
+from tb_to_csv import param_count_to_csv
+from tb_to_csv.param_count_to_csv import config_hash, count_all_parameters, count_model_parameters, resolve_model_class
+
+DUMMY_ARGS = {"input_size": 10, "hidden_size": 20, "output_size": 5}
+
+
+class FakeParameter:
+    def __init__(self, size):
+        self.size = size
+
+    def numel(self):
+        return self.size
+
+
+class FakeModel:
+    """Stand-in for a torch module that only exposes ``parameters()``."""
+
+    def __init__(self, width):
+        self.width = width
+
+    def parameters(self):
+        return [FakeParameter(self.width), FakeParameter(2 * self.width)]
+
+
+def test_import_does_not_load_torch_uncertainty():
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, sys, tb_to_csv.param_count_to_csv; print(json.dumps('torch_uncertainty' in sys.modules))"],
+        capture_output=True, text=True, check=True,
+    )
+    assert json.loads(result.stdout) is False
+
+
+def test_model_classes_are_resolved_once():
+    resolve_model_class.cache_clear()
+    assert resolve_model_class("test_param_count_to_csv.FakeModel") is FakeModel
+    resolve_model_class("test_param_count_to_csv.FakeModel")
+    assert resolve_model_class.cache_info().hits == 1
+
+
+def test_config_hash_ignores_argument_order():
+    assert config_hash("a.B", {"x": 1, "y": 2}) == config_hash("a.B", {"y": 2, "x": 1})
+    assert config_hash("a.B", {"x": 1}) != config_hash("a.B", {"x": 2})
+
+
+def test_counts_are_cached(tmp_path, monkeypatch, capsys):
+    configs = {f"Fake{width}": {"class_path": "test_param_count_to_csv.FakeModel", "init_args": {"width": width}} for width in (10, 20)}
+    cache_path = str(tmp_path / "cache.json")
+    counts = count_all_parameters(configs, jobs=2, cache_path=cache_path)
+    assert counts == {"Fake10": 30, "Fake20": 60}
+    assert "Fake10: import" in capsys.readouterr().out
+
+    def fail(*args):
+        raise AssertionError("cached models must not be built")
+
+    monkeypatch.setattr(param_count_to_csv, "time_model_parameters", fail)
+    assert count_all_parameters(configs, cache_path=cache_path) == counts
+    assert [path.name for path in tmp_path.iterdir()] == ["cache.json"]
+
+    monkeypatch.setattr(param_count_to_csv, "load_cache", fail)
+    with pytest.raises(ValueError, match="number of jobs"):
+        count_all_parameters(configs, jobs=-1, cache_path=cache_path)
+
+
+def test_meta_device_count_matches_real_weights():
+    pytest.importorskip("torch")
+    from dummy_models import DummyModel
+
+    model = param_count_to_csv.instantiate_model("dummy_models.DummyModel", DUMMY_ARGS, meta=True)
+    assert next(model.parameters()).is_meta
+    expected = sum(p.numel() for p in DummyModel(**DUMMY_ARGS).parameters())
+    assert count_model_parameters("dummy_models.DummyModel", DUMMY_ARGS, meta=True) == expected
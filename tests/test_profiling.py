@@ -0,0 +1,58 @@
+import json
+import os
+import pstats
+from tb_to_csv.core.aggregation import process_and_save_metrics
+from tb_to_csv.core.event_reader import READ_COUNTERS, iter_records
+from dummy_event_files import write_event_file
+
+
+def write_logs(logs_dir):
+    for model in ["model_a", "model_b"]:
+        for seed in range(2):
+            write_event_file(logs_dir / model / f"seed_{seed}", steps=3, offset=seed / 10)
+
+
+def test_read_counters_count_records_and_bytes(tmp_path):
+    event_file = write_event_file(tmp_path / "model" / "seed_0", steps=3)
+    records, read_bytes = READ_COUNTERS.records, READ_COUNTERS.bytes
+    with open(event_file, "rb") as file:
+        count = sum(1 for _ in iter_records(file))
+    assert READ_COUNTERS.records - records == count == 4  # file version event + 3 steps
+    assert READ_COUNTERS.bytes - read_bytes == os.path.getsize(event_file)
+
+
+def test_profile_report(tmp_path):
+    logs_dir = tmp_path / "logs"
+    write_logs(logs_dir)
+    profile_path = tmp_path / "profile.json"
+    cprofile_path = tmp_path / "run.prof"
+    process_and_save_metrics(
+        str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False,
+        profile_path=str(profile_path), cprofile_path=str(cprofile_path),
+    )
+
+    report = json.loads(profile_path.read_text())
+    assert list(report["stages"]) == ["discovery", "extraction", "aggregation", "writing"]
+    extraction = report["stages"]["extraction"]
+    assert extraction["files"] == 4 and extraction["files_skipped"] == 0
+    assert extraction["records"] == 16
+    assert extraction["bytes_read"] == sum(os.path.getsize(file["path"]) for file in report["files"])
+    assert all(file["wall_time"] >= 0 and file["records"] == 4 for file in report["files"])
+    assert pstats.Stats(str(cprofile_path)).total_calls > 0
+
+
+def test_profile_reports_cached_and_parallel_files(tmp_path):
+    logs_dir = tmp_path / "logs"
+    write_logs(logs_dir)
+    cache_path = str(tmp_path / "cache.json")
+    profile_path = tmp_path / "profile.json"
+    for _ in range(2):
+        process_and_save_metrics(
+            str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False,
+            jobs=2, cache_path=cache_path, profile_path=str(profile_path),
+        )
+
+    report = json.loads(profile_path.read_text())
+    assert report["stages"]["extraction"]["files_skipped"] == 4
+    assert report["stages"]["extraction"]["records"] == 0
+    assert {file["skipped"] for file in report["files"]} == {"cached"}
@@ -0,0 +1,50 @@
+import pytest
+from tb_to_csv.core.event_file_utils import extract_metrics
+from tb_to_csv.core.metric_processing import build_tag_filter
+from tb_to_csv.core.reductions import ReductionEngine, parse_reduction
+from dummy_event_files import write_event_file
+
+
+def test_parse_reduction():
+    assert parse_reduction("mean_last:5").argument == 5
+    assert parse_reduction("at_best:val/loss:min")[3:] == ("val/loss", "min")
+    for spec in ["median", "step:x", "mean_last:0", "at_best:val/loss"]:
+        with pytest.raises(ValueError):
+            parse_reduction(spec)
+
+
+def test_reductions_in_one_pass():
+    engine = ReductionEngine(["last", "min", "max", "step:2", "mean_last:2", "at_best:val/loss:min"], build_tag_filter(["test"]))
+    series = [(0, 0.5, 1.0), (1, 0.7, 0.4), (2, 0.6, 0.6), (3, 0.4, 0.5)]
+    for step, acc, loss in series:
+        # The selector is logged after the target at some steps and before it at others
+        if step % 2:
+            engine.update("val/loss", step, loss)
+            engine.update("test/Acc", step, acc)
+        else:
+            engine.update("test/Acc", step, acc)
+            engine.update("val/loss", step, loss)
+
+    assert engine.results() == {
+        "test/Acc": 0.4,
+        "test/Acc@min": 0.4,
+        "test/Acc@max": 0.7,
+        "test/Acc@step:2": 0.6,
+        "test/Acc@mean_last:2": 0.5,
+        "test/Acc@at_best:val/loss:min": 0.7,
+    }
+    assert engine.last_step == 3
+
+
+def test_native_and_accumulator_reductions_match(tmp_path):
+    event_file = write_event_file(tmp_path / "model" / "seed_0", steps=5)
+    reductions = ["last", "max", "step:3", "at_best:test/Loss:min"]
+    tag_filter = build_tag_filter(["test"])
+    native, native_step = extract_metrics(event_file, "native", tag_filter, reductions=reductions)
+    accumulator, accumulator_step = extract_metrics(event_file, "accumulator", tag_filter, reductions=reductions)
+
+    assert native_step == accumulator_step == 4
+    assert native["test/Acc@max"] == native["test/Acc@at_best:test/Loss:min"] == native["test/Acc"]
+    assert native["test/NLL@step:3"] == 5.0
+    # The accumulator does not decode tensor-scalar summaries
+    assert accumulator == {key: value for key, value in native.items() if not key.startswith("test/NLL")}
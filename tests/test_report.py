@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from tb_to_csv import collect_metrics
+from tb_to_csv.core import report as report_module
+from tb_to_csv.core.aggregation import iter_runs, process_and_save_metrics
+from tb_to_csv.core.report import save_reports
+from dummy_event_files import write_event_file
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for model in ["model_a", "model_b"]:
+        for seed in range(3):
+            write_event_file(logs_dir / model / f"seed_{seed}", offset=seed / 10)
+    return logs_dir
+
+
+def test_collect_metrics_tables(logs_dir):
+    report = collect_metrics(str(logs_dir), ["test"])
+    assert report.models == ["model_a", "model_b"]
+    assert ("test", "Acc") in report.columns
+
+    runs = report.table()
+    assert runs.row_names[0] == "model_a/seed_0" and runs.values.shape == (6, len(report.columns))
+
+    table = report.table(compute_ci=True)
+    column = report.columns.index(("test", "Acc"))
+    assert table.values[:, column] == pytest.approx([0.8, 0.8])
+    assert np.all(table.margins[:, column] > 0)
+
+
+def test_save_matches_process_and_save_metrics(logs_dir, tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    collect_metrics(str(logs_dir), ["test"]).save(str(output_dir), compute_ci=True)
+    process_and_save_metrics(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False)
+    assert (output_dir / "test_metrics.csv").read_bytes() == (logs_dir / "test_metrics.csv").read_bytes()
+
+
+def test_to_pandas(logs_dir):
+    pd = pytest.importorskip("pandas")
+    report = collect_metrics(str(logs_dir), ["test"])
+    runs = report.to_pandas()
+    assert list(runs.columns) == ["model", "run", "category", "metric", "value"]
+    assert len(runs) == 6 * len(report.columns)
+
+    aggregated = report.to_pandas(compute_ci=True)
+    assert list(aggregated.columns) == ["model", "category", "metric", "value", "margin"]
+    assert isinstance(aggregated, pd.DataFrame)
+
+
+def test_reports_match_separate_runs(logs_dir, tmp_path, monkeypatch):
+    calls = []
+
+    def counting_iter_runs(*args):
+        calls.append(args)
+        return iter_runs(*args)
+
+    monkeypatch.setattr(report_module, "iter_runs", counting_iter_runs)
+
+    reports = [
+        {"name": "ci", "output_dir": str(tmp_path / "ci"), "prefix_file_mapping": ["test"], "compute_ci": True},
+        {"name": "runs", "output_dir": str(tmp_path / "runs"), "prefix_file_mapping": {"test": "runs.csv"}, "compute_ci": False},
+    ]
+    save_reports(str(logs_dir), reports)
+    assert len(calls) == 1
+
+    process_and_save_metrics(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False)
+    assert (tmp_path / "ci" / "test_metrics.csv").read_bytes() == (logs_dir / "test_metrics.csv").read_bytes()
+    process_and_save_metrics(str(logs_dir), {"test": "runs.csv"}, {}, None, {}, None, False, 0.95, True, False)
+    assert (tmp_path / "runs" / "runs.csv").read_bytes() == (logs_dir / "runs.csv").read_bytes()
+
+
+def test_reports_writing_the_same_file_are_rejected(logs_dir):
+    with pytest.raises(ValueError, match="both write"):
+        save_reports(str(logs_dir), [{"prefix_file_mapping": ["test"]}, {"prefix_file_mapping": ["test"], "compute_ci": True}])
+
+
+def test_unknown_report_keys_are_rejected(logs_dir):
+    with pytest.raises(ValueError, match="Unknown keys"):
+        save_reports(str(logs_dir), [{"prefix_file_mapping": ["test"], "jobs": 2}])
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ["scipy", "tensorboard", "pyarrow"]
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_import_skips_heavy_modules():
+    loaded = run_python(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import tb_to_csv.metrics_to_csv\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    assert loaded["loaded"] == []
+    # Importing the heavy modules alone takes about a second
+    assert loaded["elapsed"] < 0.5
+
+
+def test_scipy_is_only_loaded_for_intervals(tmp_path):
+    from dummy_event_files import write_event_file
+
+    for seed in range(2):
+        write_event_file(tmp_path / "logs" / "model" / f"seed_{seed}")
+    loaded = run_python(
+        "import json, sys\n"
+        "from tb_to_csv.core.aggregation import process_and_save_metrics\n"
+        f"process_and_save_metrics({str(tmp_path / 'logs')!r}, ['test'], {{}}, None, {{}}, None, False, 0.95, True, False)\n"
+        "before = [m for m in ('scipy', 'tensorboard') if m in sys.modules]\n"
+        f"process_and_save_metrics({str(tmp_path / 'logs')!r}, ['test'], {{}}, None, {{}}, None, True, 0.95, True, False)\n"
+        "print(json.dumps({'before': before, 'after': [m for m in ('scipy', 'tensorboard') if m in sys.modules]}))"
+    )
+    assert loaded == {"before": [], "after": ["scipy"]}
@@ -0,0 +1,33 @@
+import csv
+import pytest
+from tb_to_csv.core.time_series import export_time_series, iter_time_series_chunks
+from dummy_event_files import write_event_file
+
+
+def test_chunks_are_bounded(tmp_path):
+    event_file = write_event_file(tmp_path / "model" / "seed_0", steps=5)
+    chunks = list(iter_time_series_chunks(event_file, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 3]
+    assert [event.step for event in chunks[0]] == [0, 0, 0, 1]
+
+
+def test_parallel_export_matches_serial(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for model in ["model_a", "model_b"]:
+        for seed in range(2):
+            write_event_file(logs_dir / model / f"seed_{seed}", steps=4, offset=seed / 10)
+
+    serial = tmp_path / "serial.csv"
+    parallel = tmp_path / "parallel.csv"
+    assert export_time_series(str(logs_dir), str(serial), ["test"], chunk_size=5) == 4 * 4 * 3
+    assert export_time_series(str(logs_dir), str(parallel), ["test"], jobs=2, chunk_size=5) == 4 * 4 * 3
+    assert serial.read_bytes() == parallel.read_bytes()
+
+    with open(serial, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["model", "run", "tag", "step", "wall_time", "value"]
+    assert rows[1][:4] == ["model_a", "seed_0", "test/Acc", "0"]
+    assert not any(path.name.startswith(".time_series_") for path in tmp_path.iterdir())
+
+    with pytest.raises(ValueError, match="number of jobs"):
+        export_time_series(str(logs_dir), str(parallel), ["test"], jobs=-2)
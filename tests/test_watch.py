@@ -0,0 +1,94 @@
+import errno
+import shutil
+import pytest
+from tb_to_csv.core import watch
+from tb_to_csv.core.extraction_cache import file_identity
+from tb_to_csv.core.watch import MetricsWatcher
+from dummy_event_files import write_event_file
+
+
+def make_watcher(logs_dir):
+    return MetricsWatcher(str(logs_dir), ["test", "shift"], {}, None, {}, None, True, 0.95, True, False)
+
+
+def test_watcher_rewrites_only_changed_csvs(tmp_path):
+    logs_dir = tmp_path / "logs"
+    for seed in range(2):
+        write_event_file(logs_dir / "model_a" / f"seed_{seed}", offset=seed / 100)
+
+    watcher = make_watcher(logs_dir)
+    test_csv = str(logs_dir / "test_metrics.csv")
+    shift_csv = str(logs_dir / "shift_metrics.csv")
+    assert sorted(watcher.update()) == [shift_csv, test_csv]
+    assert watcher.update() == []
+
+    # A new run changes the test metrics of model_a but not the (empty) shift metrics
+    write_event_file(logs_dir / "model_a" / "seed_2", offset=0.5)
+    assert watcher.update() == [test_csv]
+
+    # A new model adds a row to both files
+    for seed in range(2):
+        write_event_file(logs_dir / "model_b" / f"seed_{seed}", offset=seed / 100)
+    assert sorted(watcher.update()) == [shift_csv, test_csv]
+    with open(test_csv) as file:
+        assert sorted(line.split(",")[0] for line in file.read().splitlines()) == ["Name", "model_a", "model_b"]
+
+    # A fresh watcher finds the CSVs on disk up to date
+    assert make_watcher(logs_dir).update() == []
+
+
+def append_steps(event_file, tmp_dir, offset):
+    # Append the records of another event file, as a training job flushing new steps would
+    source = write_event_file(tmp_dir, steps=2, offset=offset)
+    with open(event_file, "ab") as file, open(source, "rb") as new_records:
+        file.write(new_records.read())
+
+
+def test_watcher_only_restats_written_files(tmp_path, monkeypatch):
+    pytest.importorskip("inotify_simple")
+    logs_dir = tmp_path / "logs"
+    event_files = [write_event_file(logs_dir / "model_a" / f"seed_{seed}") for seed in range(3)]
+    (logs_dir / "model_a" / "seed_0" / "checkpoints").mkdir()
+
+    watcher = MetricsWatcher(str(logs_dir), ["test"], {}, None, {}, None, True, 0.95, True, False, max_depth=2, exclude=["checkpoints"])
+    watcher.update()
+    assert set(watcher._watched_dirs) == {str(logs_dir), str(logs_dir / "model_a")} | {str(logs_dir / "model_a" / f"seed_{seed}") for seed in range(3)}
+
+    stat_calls = []
+    monkeypatch.setattr(watch, "file_identity", lambda path: stat_calls.append(path) or file_identity(path))
+    monkeypatch.setattr(watch, "find_event_files", lambda *args: pytest.fail("no file was created"))
+    append_steps(event_files[1], tmp_path / "new", offset=0.5)
+    watcher.wait_for_changes(5.0)
+    assert watcher.update() == [str(logs_dir / "test_metrics.csv")]
+    assert stat_calls == [event_files[1]]
+
+
+def test_watcher_drops_deleted_dirs_and_falls_back_to_polling(tmp_path, monkeypatch):
+    pytest.importorskip("inotify_simple")
+    logs_dir = tmp_path / "logs"
+    for seed in range(2):
+        write_event_file(logs_dir / "model_a" / f"seed_{seed}")
+    watcher = MetricsWatcher(str(logs_dir), ["test"], {}, None, {}, None, False, 0.95, True, False)
+    watcher.update()
+
+    shutil.rmtree(logs_dir / "model_a" / "seed_1")
+    watcher.update()
+    assert str(logs_dir / "model_a" / "seed_1") not in watcher._watched_dirs
+    assert list(watcher.runs) == [("model_a", "seed_0")]
+
+    def exhausted(*args):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    write_event_file(logs_dir / "model_b" / "seed_0")
+    monkeypatch.setattr(watcher._inotify, "add_watch", exhausted)
+    watcher.update()
+    assert not watcher.uses_inotify
+    assert ("model_b", "seed_0") in watcher.runs
+
+
+def test_watcher_adds_timing_columns(tmp_path):
+    logs_dir = tmp_path / "logs"
+    write_event_file(logs_dir / "model_a" / "seed_0", steps=3)
+    watcher = MetricsWatcher(str(logs_dir), ["test"], {}, None, {}, None, False, 0.95, True, False, timing=True)
+    watcher.update()
+    assert "duration" in (logs_dir / "test_metrics.csv").read_text().splitlines()[0]